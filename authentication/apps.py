@@ -23,3 +23,5 @@ class AuthenticationConfig(AppConfig):
         # Import models untuk memastikan signals yang didefinisikan di models.py ter-register
         # Signal post_save untuk auto-create UserProfile akan aktif setelah import ini
         from . import models  # This will register the signals defined in models.py
+        # Signal invalidasi cache ringkasan profil
+        from . import signals
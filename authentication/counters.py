@@ -0,0 +1,135 @@
+"""
+Helper untuk counter denormalisasi di UserProfile
+(friends_count, reviews_given_count, reviews_received_count, organized_completed_count,
+events_completed_count, five_star_received_count).
+
+Update rutin memakai adjust_profile_counter (UPDATE ... SET x = x + n, atomic di level
+database). compute_profile_counters / reconcile_profile_counters menghitung ulang
+semuanya dari tabel sumber dengan query grouped, dipakai oleh command
+reconcile_profile_counters dan generator data sintetis.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, F
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from .models import UserProfile
+
+
+# activity_type PointTransaction -> counter UserProfile yang menghitung jumlah transaksinya
+POINT_ACTIVITY_COUNTERS = {
+    'event_complete': 'events_completed_count',
+    'five_star_received': 'five_star_received_count',
+}
+
+
+def adjust_profile_counter(field, deltas):
+    """
+    Tambah/kurangi counter untuk banyak user.
+
+    Args:
+        field: Nama field counter di UserProfile
+        deltas: Dict {user_id: delta}; user dengan delta sama di-update dalam satu query
+    """
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(user_id)
+
+    for delta, user_ids in by_delta.items():
+        UserProfile.objects.filter(user_id__in=user_ids).update(**{field: F(field) + delta}, updated_at=Now())
+
+
+def adjust_point_activity_counters(transactions, sign=1):
+    """
+    Update counter dari PointTransaction yang dibuat (sign=1) atau dihapus (sign=-1).
+    Dipakai jalur bulk_create yang tidak memicu signal.
+
+    Args:
+        transactions: Iterable PointTransaction
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    for transaction in transactions:
+        field = POINT_ACTIVITY_COUNTERS.get(transaction.activity_type)
+        if field:
+            deltas[field][transaction.user_id] += sign
+
+    for field, user_deltas in deltas.items():
+        adjust_profile_counter(field, user_deltas)
+
+
+def compute_profile_counters(user_ids=None):
+    """
+    Hitung nilai counter yang benar dari tabel sumber (6 query grouped).
+
+    Returns:
+        Dict {user_id: {field: value}} hanya untuk user yang punya nilai > 0
+    """
+    # Import di dalam fungsi untuk menghindari circular import
+    from event_discovery.models import Event
+    from leaderboard.models import PointTransaction
+    from partner_matching.models import Connection
+    from reviews.models import Review
+
+    counters = defaultdict(dict)
+
+    def collect(queryset, group_field, counter_field):
+        if user_ids is not None:
+            queryset = queryset.filter(**{f'{group_field}__in': user_ids})
+        rows = queryset.values(group_field).annotate(total=Count('id')).order_by()
+        for row in rows:
+            user_id = row[group_field]
+            counters[user_id][counter_field] = counters[user_id].get(counter_field, 0) + row['total']
+
+    accepted = Connection.objects.filter(status='accepted')
+    collect(accepted, 'from_user_id', 'friends_count')
+    collect(accepted, 'to_user_id', 'friends_count')
+    collect(Review.objects.all(), 'from_user_id', 'reviews_given_count')
+    collect(Review.objects.all(), 'to_user_id', 'reviews_received_count')
+    collect(Event.objects.filter(status='completed'), 'organizer_id', 'organized_completed_count')
+
+    point_counts = PointTransaction.objects.filter(activity_type__in=list(POINT_ACTIVITY_COUNTERS))
+    if user_ids is not None:
+        point_counts = point_counts.filter(user_id__in=user_ids)
+    rows = point_counts.values('user_id', 'activity_type').annotate(total=Count('id')).order_by()
+    for row in rows:
+        counters[row['user_id']][POINT_ACTIVITY_COUNTERS[row['activity_type']]] = row['total']
+
+    return counters
+
+
+def reconcile_profile_counters(user_ids=None, batch_size=1000, dry_run=False):
+    """
+    Samakan counter di UserProfile dengan hasil compute_profile_counters.
+
+    Returns:
+        List tuple (profile, {field: (nilai_lama, nilai_baru)}) untuk profile yang berubah
+    """
+    counters = compute_profile_counters(user_ids)
+
+    profiles = UserProfile.objects.only('id', 'user', 'updated_at', *UserProfile.COUNTER_FIELDS)
+    if user_ids is not None:
+        profiles = profiles.filter(user_id__in=user_ids)
+
+    changed = []
+    for profile in profiles.iterator(chunk_size=batch_size):
+        expected = counters.get(profile.user_id, {})
+        changes = {}
+        for field in UserProfile.COUNTER_FIELDS:
+            value = expected.get(field, 0)
+            if getattr(profile, field) != value:
+                changes[field] = (getattr(profile, field), value)
+                setattr(profile, field, value)
+        if changes:
+            changed.append((profile, changes))
+
+    if not dry_run:
+        now = timezone.now()
+        for profile, _ in changed:
+            profile.updated_at = now
+        UserProfile.objects.bulk_update(
+            [profile for profile, _ in changed], [*UserProfile.COUNTER_FIELDS, 'updated_at'], batch_size=batch_size
+        )
+    return changed
@@ -0,0 +1,53 @@
+# authentication/management/commands/reconcile_profile_counters.py
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from authentication.counters import reconcile_profile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute denormalized UserProfile counters (friends, reviews given/received, "
+        "organized completed events) from source tables. Dipakai untuk memperbaiki drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            dest='username',
+            help="Hanya reconcile counter milik username ini",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Jumlah profile per bulk_update (default: 1000)",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Tampilkan perbedaan tanpa menyimpan perubahan",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS("Starting to reconcile profile counters..."))
+
+        user_ids = None
+        if options['username']:
+            user_ids = list(User.objects.filter(username=options['username']).values_list('id', flat=True))
+            if not user_ids:
+                raise CommandError(f"User not found: {options['username']}")
+
+        with transaction.atomic():
+            changed = reconcile_profile_counters(
+                user_ids, batch_size=options['batch_size'], dry_run=options['dry_run']
+            )
+
+        for profile, changes in changed:
+            details = ', '.join(f"{field}: {old} -> {new}" for field, (old, new) in changes.items())
+            self.stdout.write(f"Updated user {profile.user_id}: {details}")
+
+        verb = "Would update" if options['dry_run'] else "Updated"
+        self.stdout.write(self.style.SUCCESS(f"\nDone! {verb} {len(changed)} user profiles."))
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:54
+
+import unicodedata
+
+from django.db import DatabaseError, migrations, models, transaction
+
+
+def normalize_search_text(text):
+    # Salinan authentication.models.normalize_search_text (migration tidak boleh import model asli)
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.lower().split())
+
+
+def backfill_search_key(apps, schema_editor):
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    profiles = UserProfile.objects.select_related('user').only('id', 'full_name', 'user__username')
+
+    batch = []
+    for profile in profiles.iterator(chunk_size=2000):
+        profile.search_key = normalize_search_text(f"{profile.user.username} {profile.full_name}")[:255]
+        batch.append(profile)
+        if len(batch) >= 2000:
+            UserProfile.objects.bulk_update(batch, ['search_key'])
+            batch = []
+    if batch:
+        UserProfile.objects.bulk_update(batch, ['search_key'])
+
+
+def create_trigram_index(apps, schema_editor):
+    # Trigram index hanya tersedia di PostgreSQL (pg_trgm), dipakai untuk LIKE '%term%'.
+    # Jika extension tidak bisa dibuat (misal tidak punya privilege), tetap pakai btree index saja.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            schema_editor.execute(
+                'CREATE INDEX IF NOT EXISTS authentication_userprofile_search_key_trgm '
+                'ON authentication_userprofile USING gin (search_key gin_trgm_ops)'
+            )
+    except DatabaseError:
+        pass
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS authentication_userprofile_search_key_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='search_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_search_key, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:20
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+COUNTER_FIELDS = ('friends_count', 'reviews_given_count', 'reviews_received_count', 'organized_completed_count')
+
+
+def backfill_counters(apps, schema_editor):
+    # Salinan sederhana authentication.counters.compute_profile_counters (migration tidak boleh import helper asli)
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    Connection = apps.get_model('partner_matching', 'Connection')
+    Review = apps.get_model('reviews', 'Review')
+    Event = apps.get_model('event_discovery', 'Event')
+
+    counters = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    sources = [
+        (Connection.objects.filter(status='accepted'), 'from_user_id', 'friends_count'),
+        (Connection.objects.filter(status='accepted'), 'to_user_id', 'friends_count'),
+        (Review.objects.all(), 'from_user_id', 'reviews_given_count'),
+        (Review.objects.all(), 'to_user_id', 'reviews_received_count'),
+        (Event.objects.filter(status='completed'), 'organizer_id', 'organized_completed_count'),
+    ]
+    for queryset, group_field, counter_field in sources:
+        for row in queryset.values(group_field).annotate(total=Count('id')).order_by():
+            counters[row[group_field]][counter_field] += row['total']
+
+    batch = []
+    for profile in UserProfile.objects.filter(user_id__in=list(counters)).only('id', 'user_id').iterator(chunk_size=2000):
+        for field, value in counters[profile.user_id].items():
+            setattr(profile, field, value)
+        batch.append(profile)
+        if len(batch) >= 2000:
+            UserProfile.objects.bulk_update(batch, COUNTER_FIELDS)
+            batch = []
+    if batch:
+        UserProfile.objects.bulk_update(batch, COUNTER_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_userprofile_search_key'),
+        ('event_discovery', '0001_initial'),
+        ('partner_matching', '0001_initial'),
+        ('reviews', '0002_userrating_rating_sum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='friends_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='reviews_given_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='reviews_received_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='organized_completed_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
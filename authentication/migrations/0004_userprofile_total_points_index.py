@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_userprofile_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['-total_points'], name='profile_total_points_idx'),
+        ),
+    ]
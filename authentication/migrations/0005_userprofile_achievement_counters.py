@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:41
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# Salinan authentication.counters.POINT_ACTIVITY_COUNTERS (migration tidak boleh import helper asli)
+POINT_ACTIVITY_COUNTERS = {
+    'event_complete': 'events_completed_count',
+    'five_star_received': 'five_star_received_count',
+}
+
+
+def backfill_counters(apps, schema_editor):
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    PointTransaction = apps.get_model('leaderboard', 'PointTransaction')
+
+    counters = defaultdict(lambda: dict.fromkeys(POINT_ACTIVITY_COUNTERS.values(), 0))
+    rows = PointTransaction.objects.filter(activity_type__in=list(POINT_ACTIVITY_COUNTERS)).values(
+        'user_id', 'activity_type'
+    ).annotate(total=Count('id')).order_by()
+    for row in rows:
+        counters[row['user_id']][POINT_ACTIVITY_COUNTERS[row['activity_type']]] = row['total']
+
+    fields = list(POINT_ACTIVITY_COUNTERS.values())
+    batch = []
+    for profile in UserProfile.objects.filter(user_id__in=list(counters)).only('id', 'user_id').iterator(chunk_size=2000):
+        for field, value in counters[profile.user_id].items():
+            setattr(profile, field, value)
+        batch.append(profile)
+        if len(batch) >= 2000:
+            UserProfile.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        UserProfile.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_userprofile_total_points_index'),
+        ('leaderboard', '0002_pointtransaction_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='events_completed_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='five_star_received_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
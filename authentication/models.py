@@ -1,3 +1,5 @@
+import unicodedata
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
@@ -5,6 +7,17 @@ from django.dispatch import receiver
 from sigma_app.constants import CITY_CHOICES, SPORT_CHOICES, SKILL_CHOICES
 
 
+def normalize_search_text(text):
+    """
+    Normalisasi teks untuk pencarian: lowercase, hilangkan aksen, rapikan spasi.
+    Dipakai untuk mengisi UserProfile.search_key dan untuk query pencarian,
+    sehingga lookup bisa memakai index tanpa UPPER()/LOWER() di sisi database.
+    """
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.lower().split())
+
+
 # Model tambahan untuk menyimpan profil user (melengkapi User bawaan Django)
 class UserProfile(models.Model):
     # Hubungan one-to-one dengan model User bawaan Django
@@ -32,9 +45,59 @@ class UserProfile(models.Model):
     # Tanggal pembuatan profile
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Waktu perubahan terakhir (termasuk poin dan counter), dipakai sebagai versi ETag/Last-Modified
+    # Update lewat queryset.update() harus mengisi updated_at=Now() sendiri
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    # Kunci pencarian ternormalisasi ("username full name"), diisi otomatis saat save()
+    # Di-index supaya pencarian user tidak perlu full table scan dengan icontains
+    search_key = models.CharField(max_length=255, blank=True, default='', db_index=True, editable=False)
+
+    # Counter denormalisasi, di-maintain dengan UPDATE ... F() + n oleh signal (authentication/signals.py)
+    # dan bisa diperbaiki dengan command reconcile_profile_counters
+    friends_count = models.IntegerField(default=0, editable=False)
+    reviews_given_count = models.IntegerField(default=0, editable=False)
+    reviews_received_count = models.IntegerField(default=0, editable=False)
+    organized_completed_count = models.IntegerField(default=0, editable=False)
+    # Jumlah transaksi poin event_complete / five_star_received (untuk progress achievement)
+    events_completed_count = models.IntegerField(default=0, editable=False)
+    five_star_received_count = models.IntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = (
+        'friends_count', 'reviews_given_count', 'reviews_received_count', 'organized_completed_count',
+        'events_completed_count', 'five_star_received_count',
+    )
+
+    class Meta:
+        # Index untuk ranking leaderboard (ORDER BY total_points DESC)
+        indexes = [
+            models.Index(fields=['-total_points'], name='profile_total_points_idx'),
+        ]
+
     def __str__(self):
         return self.full_name
 
+    def build_search_key(self):
+        return normalize_search_text(f"{self.user.username} {self.full_name}")[:255]
+
+    def save(self, *args, **kwargs):
+        self.search_key = self.build_search_key()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            # Counter tidak ikut ditulis oleh save() biasa, supaya instance lama (misalnya
+            # request.user.profile) tidak menimpa nilai yang sudah di-increment di database
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+            kwargs['update_fields'] = update_fields
+        elif update_fields is not None and 'search_key' not in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_key'}
+        super().save(*args, **kwargs)
+
 
 # Model untuk menyimpan preferensi olahraga tiap user
 class SportPreference(models.Model):
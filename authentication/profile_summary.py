@@ -0,0 +1,137 @@
+"""
+Ringkasan profil user yang di-cache (rating, jumlah review, jumlah teman,
+beberapa review/teman terbaru) untuk halaman profil.
+
+Cache di-invalidate oleh signal di authentication/signals.py setiap ada penulisan
+Review, Connection, UserProfile, atau SportPreference yang menyangkut user tersebut.
+Jalur bulk yang melewati signal (bulk_create) harus memanggil
+invalidate_profile_summary sendiri.
+
+Invalidasi hanya sampai ke semua worker jika backend cache dipakai bersama (redis,
+memcached, file). Dengan locmem setiap proses punya cache sendiri, sehingga worker
+lain bisa menampilkan ringkasan basi; TTL-nya dipersingkat menjadi
+PROFILE_SUMMARY_LOCAL_TIMEOUT untuk membatasi lamanya.
+"""
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Q
+
+# Jumlah review / teman terbaru yang ditampilkan di halaman profil
+PROFILE_RECENT_LIMIT = 3
+
+# Batas umur cache (detik), untuk data milik user lain yang ikut tampil (nama/foto teman)
+PROFILE_SUMMARY_TIMEOUT = 60 * 10
+# Batas umur cache untuk backend locmem (per proses, invalidasi tidak sampai ke worker lain)
+PROFILE_SUMMARY_LOCAL_TIMEOUT = 30
+
+PROFILE_SUMMARY_KEY = 'profile_summary:v2:{user_id}'
+
+
+def profile_summary_key(user_id):
+    return PROFILE_SUMMARY_KEY.format(user_id=user_id)
+
+
+def profile_summary_timeout():
+    """TTL ringkasan profil sesuai backend cache default."""
+    if isinstance(caches['default'], LocMemCache):
+        return PROFILE_SUMMARY_LOCAL_TIMEOUT
+    return PROFILE_SUMMARY_TIMEOUT
+
+
+def _review_item(review, other_user):
+    return {
+        'id': review.id,
+        'username': other_user.username,
+        'event_title': review.event.title,
+        'rating': review.rating,
+        'comment': review.comment,
+        'created_at': review.created_at,
+        'updated_at': review.updated_at,
+    }
+
+
+def build_profile_summary(user):
+    """Hitung ringkasan profil dari database (dipanggil saat cache miss)."""
+    # Import di dalam fungsi untuk menghindari circular import
+    from authentication.models import UserProfile
+    from partner_matching.models import Connection
+    from reviews.models import Review, UserRating
+
+    sport_preferences = [
+        {
+            'sport_type': preference.sport_type,
+            'sport_display': preference.get_sport_type_display(),
+            'skill_level': preference.skill_level,
+            'skill_display': preference.get_skill_level_display(),
+        }
+        for preference in user.sport_preferences.all()
+    ]
+
+    # Rating & jumlah review diterima diambil dari UserRating (di-maintain incremental)
+    rating = UserRating.objects.filter(user=user).values('average_rating', 'total_reviews').first()
+
+    # Jumlah review ditulis & jumlah teman dari counter denormalisasi (lihat counters.py)
+    counters = UserProfile.objects.filter(user=user).values('reviews_given_count', 'friends_count').first() or {}
+
+    reviews_written = Review.objects.filter(from_user=user).select_related('to_user', 'event').order_by('-created_at')
+    reviews_received = Review.objects.filter(to_user=user).select_related('from_user', 'event').order_by('-created_at')
+
+    friend_connections = Connection.objects.filter(
+        Q(from_user=user) | Q(to_user=user),
+        status='accepted'
+    )
+    recent_friends = friend_connections.select_related(
+        'from_user__profile', 'to_user__profile'
+    ).order_by('-updated_at')[:PROFILE_RECENT_LIMIT]
+
+    friends = []
+    for connection in recent_friends:
+        friend = connection.to_user if connection.from_user_id == user.id else connection.from_user
+        friend_profile = getattr(friend, 'profile', None)
+        friends.append({
+            'id': friend.id,
+            'username': friend.username,
+            'full_name': friend_profile.full_name if friend_profile else friend.username,
+            'profile_image_url': friend_profile.profile_image_url if friend_profile else None,
+        })
+
+    return {
+        'average_rating': float(rating['average_rating']) if rating else 0.0,
+        'reviews_received_count': rating['total_reviews'] if rating else 0,
+        'reviews_written_count': counters.get('reviews_given_count', 0),
+        'friends_count': counters.get('friends_count', 0),
+        'sport_preferences': sport_preferences,
+        'recent_reviews_written': [
+            _review_item(review, review.to_user) for review in reviews_written[:PROFILE_RECENT_LIMIT]
+        ],
+        'recent_reviews_received': [
+            _review_item(review, review.from_user) for review in reviews_received[:PROFILE_RECENT_LIMIT]
+        ],
+        'recent_friends': friends,
+    }
+
+
+def get_profile_summary(user):
+    """Ringkasan profil dari cache, dihitung ulang jika belum ada."""
+    key = profile_summary_key(user.id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_profile_summary(user)
+        cache.set(key, summary, profile_summary_timeout())
+    return summary
+
+
+def invalidate_profile_summary(*user_ids):
+    """
+    Hapus cache ringkasan profil untuk user_ids.
+
+    Dihapus langsung dan sekali lagi setelah transaksi commit, supaya request lain
+    yang sempat mengisi cache dengan data sebelum commit tidak meninggalkan data basi.
+    """
+    keys = [profile_summary_key(user_id) for user_id in set(user_ids) if user_id]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,164 @@
+"""
+Signals untuk Authentication Module
+Berisi signal handlers untuk:
+1. Invalidasi cache ringkasan profil (lihat profile_summary.py). Setiap penulisan Review,
+   Connection, UserProfile, atau SportPreference akan menghapus cache profil user terkait.
+2. Maintain counter denormalisasi di UserProfile (lihat counters.py) secara atomic
+   dengan UPDATE ... F() + n.
+3. Memperbarui UserProfile.search_key (berisi username) saat username berubah.
+
+Catatan: 'authentication' ada sebelum 'leaderboard' di INSTALLED_APPS, sehingga counter
+di sini sudah ter-update sebelum signal poin/achievement di leaderboard/signals.py berjalan.
+"""
+
+# Import signal types dan receiver decorator
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.db.models.functions import Now
+from django.dispatch import receiver
+
+# Import model-model yang akan di-listen
+from django.contrib.auth.models import User
+from authentication.models import UserProfile, SportPreference
+from event_discovery.models import Event
+from leaderboard.models import PointTransaction
+from partner_matching.models import Connection
+from reviews.models import Review
+
+from authentication.counters import POINT_ACTIVITY_COUNTERS, adjust_profile_counter
+from authentication.profile_summary import invalidate_profile_summary
+
+
+def _previous_value(instance, field):
+    """Nilai field yang tersimpan di database sebelum save (None jika record baru)."""
+    if instance._state.adding or instance.pk is None:
+        return None
+    return type(instance).objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+
+
+# ===== COUNTER SIGNALS =====
+
+@receiver(post_save, sender=Review)
+def increment_review_counters(sender, instance, created, **kwargs):
+    if created:
+        adjust_profile_counter('reviews_given_count', {instance.from_user_id: 1})
+        adjust_profile_counter('reviews_received_count', {instance.to_user_id: 1})
+
+
+@receiver(post_delete, sender=Review)
+def decrement_review_counters(sender, instance, **kwargs):
+    adjust_profile_counter('reviews_given_count', {instance.from_user_id: -1})
+    adjust_profile_counter('reviews_received_count', {instance.to_user_id: -1})
+
+
+@receiver(pre_save, sender=Connection)
+def remember_connection_status(sender, instance, **kwargs):
+    instance._previous_status = _previous_value(instance, 'status')
+
+
+@receiver(post_save, sender=Connection)
+def update_friends_count_on_save(sender, instance, **kwargs):
+    """friends_count berubah hanya saat status masuk ke / keluar dari 'accepted'."""
+    was_accepted = getattr(instance, '_previous_status', None) == 'accepted'
+    is_accepted = instance.status == 'accepted'
+    if was_accepted != is_accepted:
+        delta = 1 if is_accepted else -1
+        adjust_profile_counter('friends_count', {instance.from_user_id: delta, instance.to_user_id: delta})
+
+
+@receiver(post_delete, sender=Connection)
+def update_friends_count_on_delete(sender, instance, **kwargs):
+    if instance.status == 'accepted':
+        adjust_profile_counter('friends_count', {instance.from_user_id: -1, instance.to_user_id: -1})
+
+
+@receiver(pre_save, sender=Event)
+def remember_event_status(sender, instance, **kwargs):
+    instance._previous_status = _previous_value(instance, 'status')
+
+
+@receiver(post_save, sender=Event)
+def update_organized_count_on_save(sender, instance, **kwargs):
+    """organized_completed_count berubah saat status event masuk ke / keluar dari 'completed'."""
+    was_completed = getattr(instance, '_previous_status', None) == 'completed'
+    is_completed = instance.status == 'completed'
+    if was_completed != is_completed:
+        adjust_profile_counter('organized_completed_count', {instance.organizer_id: 1 if is_completed else -1})
+        invalidate_profile_summary(instance.organizer_id)
+
+
+@receiver(post_delete, sender=Event)
+def update_organized_count_on_delete(sender, instance, **kwargs):
+    if instance.status == 'completed':
+        adjust_profile_counter('organized_completed_count', {instance.organizer_id: -1})
+        invalidate_profile_summary(instance.organizer_id)
+
+
+@receiver(post_save, sender=PointTransaction)
+def increment_point_activity_counter(sender, instance, created, **kwargs):
+    """Counter progress achievement (dibaca oleh check_achievements yang berjalan setelah ini)."""
+    field = POINT_ACTIVITY_COUNTERS.get(instance.activity_type)
+    if created and field:
+        adjust_profile_counter(field, {instance.user_id: 1})
+
+
+@receiver(post_delete, sender=PointTransaction)
+def decrement_point_activity_counter(sender, instance, **kwargs):
+    field = POINT_ACTIVITY_COUNTERS.get(instance.activity_type)
+    if field:
+        adjust_profile_counter(field, {instance.user_id: -1})
+
+
+# ===== SEARCH KEY SIGNALS =====
+
+
+def _saves_username(created, update_fields):
+    return not created and (update_fields is None or 'username' in update_fields)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, update_fields=None, **kwargs):
+    # Login hanya menyimpan last_login, jadi tidak perlu query username lama
+    if _saves_username(instance._state.adding, update_fields):
+        instance._previous_username = _previous_value(instance, 'username')
+
+
+@receiver(post_save, sender=User)
+def refresh_search_key_on_username_change(sender, instance, created, update_fields=None, **kwargs):
+    """search_key dibangun dari username + full_name, jadi ikut diperbarui saat rename."""
+    if not _saves_username(created, update_fields):
+        return
+    if getattr(instance, '_previous_username', instance.username) == instance.username:
+        return
+    profile = UserProfile.objects.filter(user=instance).only('id', 'full_name').first()
+    if profile is None:
+        return
+    profile.user = instance
+    UserProfile.objects.filter(pk=profile.pk).update(search_key=profile.build_search_key())
+    invalidate_profile_summary(instance.id)
+
+
+# ===== PROFILE CACHE SIGNALS =====
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_profile_on_review(sender, instance, **kwargs):
+    """Review baru/diubah/dihapus mempengaruhi profil penulis dan penerima."""
+    invalidate_profile_summary(instance.from_user_id, instance.to_user_id)
+
+
+@receiver([post_save, post_delete], sender=Connection)
+def invalidate_profile_on_connection(sender, instance, **kwargs):
+    """Perubahan koneksi mempengaruhi jumlah/daftar teman kedua user."""
+    invalidate_profile_summary(instance.from_user_id, instance.to_user_id)
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_profile_on_profile_update(sender, instance, **kwargs):
+    invalidate_profile_summary(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=SportPreference)
+def invalidate_profile_on_sport_preference(sender, instance, **kwargs):
+    invalidate_profile_summary(instance.user_id)
+    # Sport preference ikut tampil di profil & rekomendasi, jadi versi (ETag) profil ikut berubah
+    UserProfile.objects.filter(user_id=instance.user_id).update(updated_at=Now())
@@ -8,6 +8,8 @@ from django.urls import reverse
 from .models import UserProfile, SportPreference
 # Import form-form dari aplikasi authentication
 from .forms import CustomUserCreationForm, UserProfileForm, SportPreferenceForm
+# Import json untuk body request endpoint Flutter
+import json
 
 
 class AuthenticationModelsTest(TestCase):
@@ -252,3 +254,229 @@ class AuthenticationFormsTest(TestCase):
         form = SportPreferenceForm(data=form_data, user=user)
         # Cek bahwa form valid
         self.assertTrue(form.is_valid())
+
+
+class ProfileSummaryCacheTest(TestCase):
+    """Test cases untuk cache ringkasan profil di profile_view"""
+
+    def setUp(self):
+        """Set up user, event, dan beberapa review"""
+        from django.core.cache import cache
+        from django.utils import timezone
+        from event_discovery.models import Event
+
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.other = User.objects.create_user(username='friend', password='testpass123')
+        self.event = Event.objects.create(
+            organizer=self.other, title='Morning Run', description='Run', sport_type='running',
+            event_date=timezone.now().date(), start_time=timezone.now().time(),
+            end_time=timezone.now().time(), city='depok', location_name='UI', max_participants=10
+        )
+        self.client.force_login(self.user)
+
+    def _write_reviews(self, count):
+        """Buat `count` review yang ditulis self.user untuk user-user baru"""
+        from reviews.models import Review
+        for index in range(count):
+            target = User.objects.create_user(username=f'target{index}', password='x')
+            Review.objects.create(event=self.event, from_user=self.user, to_user=target, rating=4, comment='Nice')
+
+    def test_profile_renders_with_many_written_reviews(self):
+        """Lebih dari 3 review menampilkan link Show More ke daftar lengkap"""
+        self._write_reviews(4)
+        response = self.client.get(reverse('authentication:profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, reverse('reviews:user-written-reviews', args=[self.user.id]))
+        self.assertEqual(len(response.context['reviews_written']), 3)
+
+    def test_second_request_uses_cache(self):
+        """Request kedua tidak menghitung ulang ringkasan profil"""
+        self._write_reviews(2)
+        url = reverse('authentication:profile')
+        self.client.get(url)
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertFalse(any('reviews_review' in query['sql'] for query in ctx.captured_queries))
+
+    def test_review_write_invalidates_summary(self):
+        """Review baru langsung terlihat di profil penerima"""
+        from reviews.models import Review
+        url = reverse('authentication:profile_public', args=[self.other.id])
+        self.assertEqual(self.client.get(url).context['summary']['reviews_received_count'], 0)
+
+        Review.objects.create(event=self.event, from_user=self.user, to_user=self.other, rating=5, comment='Great')
+        from reviews.views import update_user_rating
+        update_user_rating(self.other)
+
+        summary = self.client.get(url).context['summary']
+        self.assertEqual(summary['reviews_received_count'], 1)
+        self.assertEqual(summary['recent_reviews_received'][0]['username'], 'owner')
+
+    def test_connection_write_invalidates_summary(self):
+        """Koneksi accepted menambah jumlah teman di kedua profil"""
+        from partner_matching.models import Connection
+        url = reverse('authentication:profile')
+        self.assertEqual(self.client.get(url).context['summary']['friends_count'], 0)
+
+        connection = Connection.objects.create(from_user=self.user, to_user=self.other, status='pending')
+        self.assertEqual(self.client.get(url).context['connection_status'], None)
+        connection.status = 'accepted'
+        connection.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.context['summary']['friends_count'], 1)
+        self.assertEqual(response.context['friends'][0]['username'], 'friend')
+
+        public = self.client.get(reverse('authentication:profile_public', args=[self.other.id]))
+        self.assertEqual(public.context['connection_status'], 'accepted')
+
+    def test_locmem_backend_uses_short_timeout(self):
+        """locmem per proses: invalidasi tidak sampai ke worker lain, jadi TTL dipersingkat"""
+        from django.test import override_settings
+        from authentication.profile_summary import (
+            PROFILE_SUMMARY_LOCAL_TIMEOUT, PROFILE_SUMMARY_TIMEOUT, profile_summary_timeout,
+        )
+
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=locmem):
+            self.assertEqual(profile_summary_timeout(), PROFILE_SUMMARY_LOCAL_TIMEOUT)
+
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/sigma-test'}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(profile_summary_timeout(), PROFILE_SUMMARY_TIMEOUT)
+
+
+class ProfileCounterTest(TestCase):
+    """Test cases untuk counter denormalisasi di UserProfile"""
+
+    def setUp(self):
+        """Set up dua user dan satu event"""
+        from django.utils import timezone
+        from event_discovery.models import Event
+
+        self.user = User.objects.create_user(username='owner', password='testpass123')
+        self.other = User.objects.create_user(username='friend', password='testpass123')
+        self.event = Event.objects.create(
+            organizer=self.user, title='Morning Run', description='Run', sport_type='running',
+            event_date=timezone.now().date(), start_time=timezone.now().time(),
+            end_time=timezone.now().time(), city='depok', location_name='UI', max_participants=10
+        )
+
+    def _counters(self, user):
+        return UserProfile.objects.filter(user=user).values(*UserProfile.COUNTER_FIELDS).get()
+
+    def test_review_create_and_delete(self):
+        """Review menambah counter given/received dan delete menguranginya"""
+        from reviews.models import Review
+        review = Review.objects.create(event=self.event, from_user=self.user, to_user=self.other, rating=5)
+        self.assertEqual(self._counters(self.user)['reviews_given_count'], 1)
+        self.assertEqual(self._counters(self.other)['reviews_received_count'], 1)
+
+        review.delete()
+        self.assertEqual(self._counters(self.user)['reviews_given_count'], 0)
+        self.assertEqual(self._counters(self.other)['reviews_received_count'], 0)
+
+    def test_connection_accept_and_delete(self):
+        """friends_count hanya berubah saat status masuk/keluar 'accepted'"""
+        from partner_matching.models import Connection
+        connection = Connection.objects.create(from_user=self.user, to_user=self.other, status='pending')
+        self.assertEqual(self._counters(self.user)['friends_count'], 0)
+
+        connection.status = 'accepted'
+        connection.save()
+        connection.save()
+        self.assertEqual(self._counters(self.user)['friends_count'], 1)
+        self.assertEqual(self._counters(self.other)['friends_count'], 1)
+
+        connection.delete()
+        self.assertEqual(self._counters(self.user)['friends_count'], 0)
+        self.assertEqual(self._counters(self.other)['friends_count'], 0)
+
+    def test_event_completion(self):
+        """Event yang completed menambah organized_completed_count organizer"""
+        self.event.status = 'completed'
+        self.event.save()
+        self.assertEqual(self._counters(self.user)['organized_completed_count'], 1)
+
+        self.event.status = 'cancelled'
+        self.event.save()
+        self.assertEqual(self._counters(self.user)['organized_completed_count'], 0)
+
+    def test_stale_profile_save_keeps_counters(self):
+        """save() dari instance lama tidak menimpa counter di database"""
+        from partner_matching.models import Connection
+        stale_profile = UserProfile.objects.get(user=self.user)
+        Connection.objects.create(from_user=self.user, to_user=self.other, status='accepted')
+
+        stale_profile.bio = 'Updated bio'
+        stale_profile.save()
+
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual(profile.bio, 'Updated bio')
+        self.assertEqual(profile.friends_count, 1)
+
+    def test_reconcile_command_repairs_drift(self):
+        """Command reconcile_profile_counters memperbaiki counter yang drift"""
+        from io import StringIO
+        from django.core.management import call_command
+        from partner_matching.models import Connection
+
+        Connection.objects.create(from_user=self.user, to_user=self.other, status='accepted')
+        UserProfile.objects.filter(user=self.user).update(friends_count=7, reviews_given_count=3)
+
+        out = StringIO()
+        call_command('reconcile_profile_counters', '--dry-run', stdout=out)
+        self.assertIn('Would update 1 user profiles', out.getvalue())
+        self.assertEqual(self._counters(self.user)['friends_count'], 7)
+
+        call_command('reconcile_profile_counters', stdout=StringIO())
+        counters = self._counters(self.user)
+        self.assertEqual(counters['friends_count'], 1)
+        self.assertEqual(counters['reviews_given_count'], 0)
+
+
+class FlutterApiTokenTest(TestCase):
+    """Token Bearer dari flutter_login menggantikan cookie session di endpoint Flutter"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='token_user', password='rahasia123')
+
+    def _login_token(self):
+        response = self.client.post(
+            reverse('authentication:flutter_login'),
+            data=json.dumps({'username': 'token_user', 'password': 'rahasia123'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()['token']
+
+    def test_token_authenticates_without_session_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        token = self._login_token()
+        api_client = Client()
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                reverse('authentication:flutter_profile'), HTTP_AUTHORIZATION=f'Bearer {token}'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('django_session' in query['sql'] for query in queries.captured_queries))
+
+    def test_invalid_or_stale_token_rejected(self):
+        token = self._login_token()
+        url = reverse('authentication:flutter_profile')
+
+        response = Client().get(url, HTTP_AUTHORIZATION=f'Bearer {token}x')
+        self.assertEqual(response.status_code, 401)
+
+        # Ganti password membuat token lama tidak berlaku
+        self.user.set_password('baru456789')
+        self.user.save()
+        response = Client().get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 401)
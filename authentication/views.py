@@ -9,7 +9,7 @@ from django.contrib.auth.models import User
 # Import messages framework untuk menampilkan notifikasi ke user
 from django.contrib import messages
 # Import JsonResponse untuk mengembalikan response dalam format JSON (untuk AJAX)
-from django.http import JsonResponse
+from sigma_app.json_response import JsonResponse
 # Import decorator untuk membatasi HTTP method yang diperbolehkan
 from django.views.decorators.http import require_http_methods
 # Import exception untuk validasi
@@ -18,6 +18,12 @@ from django.core.exceptions import ValidationError
 from .forms import CustomUserCreationForm, CustomAuthenticationForm, UserProfileForm, SportPreferenceForm
 # Import model-model custom dari aplikasi authentication
 from .models import UserProfile, SportPreference
+# Import helper ringkasan profil (cached)
+from .profile_summary import get_profile_summary
+from partner_matching.graph import get_connection_statuses
+from sigma_app.conditional import ResourceStamp, conditional_json
+from sigma_app.async_utils import run_queries
+from sigma_app.api_tokens import issue_token
 # Import decorator untuk menonaktifkan CSRF protection (untuk Flutter mobile app)
 from django.views.decorators.csrf import csrf_exempt
 # Import JSON parser
@@ -221,88 +227,33 @@ def profile_view(request, user_id=None):
             full_name=profile_user.get_full_name() or profile_user.username
         )
 
-    # Ambil semua preferensi olahraga user
-    sport_preferences = profile_user.sport_preferences.all()
+    # Ringkasan profil (rating, jumlah review/teman, review & teman terbaru) dari cache.
+    # Cache di-invalidate otomatis lewat signal di authentication/signals.py
+    summary = get_profile_summary(profile_user)
 
-    # Import model Review dan fungsi agregasi Avg
-    from reviews.models import Review
-    from django.db.models import Avg
-
-    # Ambil semua review yang ditulis oleh user ini
-    # select_related untuk optimasi query (menghindari N+1 query problem)
-    reviews_written = profile_user.reviews_given.all().select_related('to_user', 'event').order_by('-created_at')
-
-    # Ambil semua review yang diterima oleh user ini
-    reviews_received = profile_user.reviews_received.all().select_related('from_user', 'event').order_by('-created_at')
-
-    # Hitung rata-rata rating yang diterima user
-    # aggregate mengembalikan dict, ambil nilai 'rating__avg', jika None gunakan 0
-    average_rating = reviews_received.aggregate(Avg('rating'))['rating__avg'] or 0
-
-    # Import model Connection dan Q object untuk complex query
-    from partner_matching.models import Connection
-    from django.db.models import Q
-
-    # Fetch friends for the profile user (either own profile or public profile)
-    friends_who_sent_to_profile = User.objects.filter(
-        connections_sent__to_user=profile_user,
-        connections_sent__status='accepted'
-    )
-    friends_who_received_from_profile = User.objects.filter(
-        connections_received__from_user=profile_user,
-        connections_received__status='accepted'
-    )
-    friends = friends_who_sent_to_profile.union(friends_who_received_from_profile)
-
-    # Cek status koneksi jika melihat profil user lain
+    # Cek status koneksi jika melihat profil user lain (satu query)
     connection_status = None
-    if not is_own_profile:
-        # Cek apakah sudah berteman (connection dengan status 'accepted')
-        # Q object digunakan untuk OR condition (bisa from_user atau to_user)
-        is_friends = Connection.objects.filter(
-            Q(from_user=request.user, to_user=profile_user, status='accepted') |
-            Q(from_user=profile_user, to_user=request.user, status='accepted')
-        ).exists()
-
-        if is_friends:
+    if not is_own_profile and request.user.is_authenticated:
+        status = get_connection_statuses(request.user.id, [profile_user.id])[profile_user.id]
+        if status == 'accepted':
             # Sudah berteman
             connection_status = 'accepted'
-        else:
-            # Belum berteman, cek apakah ada pending request
-
-            # Cek apakah current user sudah mengirim request ke profile_user
-            sent_request = Connection.objects.filter(
-                from_user=request.user,
-                to_user=profile_user
-            ).first()
-
-            # Cek apakah profile_user sudah mengirim request ke current user
-            received_request = Connection.objects.filter(
-                from_user=profile_user,
-                to_user=request.user
-            ).first()
-
-            if sent_request:
-                # Ada request yang dikirim (pending)
-                connection_status = 'pending'
-            elif received_request:
-                # Ada request yang diterima (pending)
-                connection_status = 'pending'
-            else:
-                # Tidak ada koneksi sama sekali
-                connection_status = None
+        elif status in ('pending_sent', 'pending_received'):
+            # Ada request yang dikirim / diterima (pending)
+            connection_status = 'pending'
 
     # Siapkan context untuk template
     context = {
         'profile_user': profile_user,
         'profile': profile,
-        'sport_preferences': sport_preferences,
+        'summary': summary,
+        'sport_preferences': summary['sport_preferences'],
         'is_own_profile': is_own_profile,
-        'reviews_written': reviews_written,
-        'reviews_received': reviews_received,
-        'average_rating': average_rating,
+        'reviews_written': summary['recent_reviews_written'],
+        'reviews_received': summary['recent_reviews_received'],
+        'average_rating': summary['average_rating'],
         'connection_status': connection_status,
-        'friends': friends,
+        'friends': summary['recent_friends'],
     }
 
     # Render template profile dengan context
@@ -569,9 +520,13 @@ def flutter_login(request):
     {
         "status": true/false,
         "message": "Success or error message",
-        "username": "authenticated_username" (only on success)
+        "username": "authenticated_username" (only on success),
+        "token": "signed API token" (only on success)
     }
 
+    Token bisa dikirim sebagai header `Authorization: Bearer <token>` pada endpoint
+    flutter_* sebagai pengganti cookie session (lihat sigma_app/api_tokens.py).
+
     HTTP Status Codes:
     - 200: Login successful
     - 401: Authentication failed (invalid credentials)
@@ -601,7 +556,8 @@ def flutter_login(request):
             return JsonResponse({
                 'status': True,
                 'message': 'Login successful!',
-                'username': username
+                'username': username,
+                'token': issue_token(user),
             }, status=200)
         else:
             # Authentication failed
@@ -655,9 +611,26 @@ def flutter_logout(request):
         }, status=200)  # Still return 200 even on error for logout
 
 
+def flutter_profile_stamp(request, user_id=None):
+    """
+    Versi data flutter_profile dari UserProfile.updated_at (ikut berubah saat poin,
+    counter, atau sport preference berubah). None jika belum login / profil belum ada,
+    sehingga view yang menangani response 401 / 404.
+    """
+    if not request.user.is_authenticated:
+        return None
+    target_id = user_id or request.user.id
+    updated_at = UserProfile.objects.filter(user_id=target_id).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None
+    # is_own_profile bergantung pada user yang login
+    return ResourceStamp(parts=(target_id, request.user.id, updated_at), last_modified=updated_at)
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
-def flutter_profile(request, user_id=None):
+@conditional_json(flutter_profile_stamp)
+async def flutter_profile(request, user_id=None):
     """
     Flutter-specific profile endpoint.
 
@@ -684,6 +657,10 @@ def flutter_profile(request, user_id=None):
                 "profile_image_url": "string",
                 "total_points": int,
                 "total_events": int,
+                "friends_count": int,
+                "reviews_given_count": int,
+                "reviews_received_count": int,
+                "organized_completed_count": int,
                 "created_at": "ISO datetime string"
             },
             "sport_preferences": [
@@ -707,7 +684,8 @@ def flutter_profile(request, user_id=None):
     """
     try:
         # Check if user is authenticated
-        if not request.user.is_authenticated:
+        user = await request.auser()
+        if not user.is_authenticated:
             return JsonResponse({
                 'status': False,
                 'message': 'Authentication required.'
@@ -717,8 +695,8 @@ def flutter_profile(request, user_id=None):
         if user_id:
             # Fetch another user's profile
             try:
-                profile_user = User.objects.get(id=user_id)
-                is_own_profile = request.user == profile_user
+                profile_user = await User.objects.aget(id=user_id)
+                is_own_profile = user == profile_user
             except User.DoesNotExist:
                 return JsonResponse({
                     'status': False,
@@ -726,21 +704,25 @@ def flutter_profile(request, user_id=None):
                 }, status=404)
         else:
             # Fetch authenticated user's own profile
-            profile_user = request.user
+            profile_user = user
             is_own_profile = True
 
         # Get or create user profile
-        try:
-            profile = profile_user.profile
-        except UserProfile.DoesNotExist:
-            # Create profile if it doesn't exist (fallback)
-            profile = UserProfile.objects.create(
-                user=profile_user,
-                full_name=profile_user.get_full_name() or profile_user.username
-            )
-
-        # Get sport preferences
-        sport_preferences = profile_user.sport_preferences.all()
+        def load_profile():
+            try:
+                return UserProfile.objects.get(user=profile_user)
+            except UserProfile.DoesNotExist:
+                # Create profile if it doesn't exist (fallback)
+                return UserProfile.objects.create(
+                    user=profile_user,
+                    full_name=profile_user.get_full_name() or profile_user.username
+                )
+
+        # Profile dan sport preferences saling independen
+        profile, sport_preferences = await run_queries(
+            load_profile,
+            lambda: list(SportPreference.objects.filter(user=profile_user)),
+        )
 
         # Serialize sport preferences
         sport_prefs_data = [
@@ -772,6 +754,10 @@ def flutter_profile(request, user_id=None):
                 'profile_image_url': profile.profile_image_url or '',
                 'total_points': profile.total_points,
                 'total_events': profile.total_events,
+                'friends_count': profile.friends_count,
+                'reviews_given_count': profile.reviews_given_count,
+                'reviews_received_count': profile.reviews_received_count,
+                'organized_completed_count': profile.organized_completed_count,
                 'created_at': profile.created_at.isoformat()
             },
             'sport_preferences': sport_prefs_data,
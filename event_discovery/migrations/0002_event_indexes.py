@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_discovery', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_date', 'start_time'], name='event_date_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'event_date'], name='event_organizer_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventparticipant',
+            index=models.Index(fields=['user', 'status'], name='participant_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventparticipant',
+            index=models.Index(fields=['event', 'status'], name='participant_event_status_idx'),
+        ),
+    ]
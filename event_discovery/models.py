@@ -42,6 +42,13 @@ class Event(models.Model):
     # Tanggal pembuatan dan update terakhir event secara otomatis
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Index untuk listing event per jadwal dan event milik organizer
+        indexes = [
+            models.Index(fields=['event_date', 'start_time'], name='event_date_start_idx'),
+            models.Index(fields=['organizer', 'event_date'], name='event_organizer_date_idx'),
+        ]
     
     def __str__(self):
         # Representasi string menampilkan judul event
@@ -76,6 +83,12 @@ class EventParticipant(models.Model):
     class Meta:
         # Satu user hanya boleh ikut satu kali dalam satu event
         unique_together = ['event', 'user']
+
+        # Index untuk filter peserta berdasarkan status (per user dan per event)
+        indexes = [
+            models.Index(fields=['user', 'status'], name='participant_user_status_idx'),
+            models.Index(fields=['event', 'status'], name='participant_event_status_idx'),
+        ]
     
     def __str__(self):
         # Representasi string menampilkan username dan judul event
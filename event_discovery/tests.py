@@ -178,3 +178,33 @@ class EventDiscoveryViewsTest(TestCase):
         self.client.logout()
         response = self.client.post(reverse('event_discovery:join_event', args=[self.event.id]))
         self.assertEqual(response.status_code, 400)  # or 401 if you add an auth check
+
+
+class ProxyImageViewTest(TestCase):
+    """proxy_image async, HTTP keluar lewat sigma_app.async_utils.fetch_url"""
+
+    def test_missing_url(self):
+        response = self.client.get(reverse('event_discovery:proxy_image'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_returns_fetched_image(self):
+        from unittest.mock import AsyncMock, patch
+        from sigma_app.async_utils import FetchResult
+
+        fetch = AsyncMock(return_value=FetchResult(200, b'\x89PNG', 'image/png'))
+        with patch('event_discovery.views.fetch_url', fetch):
+            response = self.client.get(reverse('event_discovery:proxy_image'), {'url': 'https://img.test/a.png'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'\x89PNG')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        fetch.assert_awaited_once_with('https://img.test/a.png', timeout=10)
+
+    def test_fetch_error(self):
+        from unittest.mock import AsyncMock, patch
+        from sigma_app.async_utils import FetchError
+
+        with patch('event_discovery.views.fetch_url', AsyncMock(side_effect=FetchError('timeout'))):
+            response = self.client.get(reverse('event_discovery:proxy_image'), {'url': 'https://img.test/a.png'})
+
+        self.assertEqual(response.status_code, 500)
@@ -1,16 +1,22 @@
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse
+from sigma_app.json_response import JsonResponse
 from django.shortcuts import get_object_or_404, render
 from .models import Event, EventParticipant
 from sigma_app.constants import SPORT_CHOICES, CITY_CHOICES
 from reviews.models import Review
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
-import requests
+from sigma_app.conditional import ResourceStamp, conditional_json, queryset_stamp
+from sigma_app.response_cache import cache_response
+from sigma_app.async_utils import FetchError, fetch_url
 
 
 # Create your views here.
 # Test
 
+# Umur response cache show_json (detik)
+SHOW_JSON_CACHE_TIMEOUT = 30
+
 # Show All Event
 def show_event(request):
     context={
@@ -19,16 +25,32 @@ def show_event(request):
     }
     return render(request, 'event_page.html', context)
 
-# Show Event in JSON
-def show_json(request):
+# Event yang belum dimulai (dipakai show_json dan stamp ETag-nya)
+def upcoming_events():
     now = timezone.localtime()
-    event_list = Event.objects.all()
-    event_list = Event.objects.filter(
+    return Event.objects.filter(
         event_date__gt=now.date()
     ) | Event.objects.filter(
         event_date=now.date(),
         start_time__gte=now.time()
-    ).order_by('-event_date', '-start_time')
+    )
+
+
+# Versi data show_json: event yang sudah lewat keluar dari daftar sehingga COUNT ikut berubah
+def show_json_stamp(request):
+    last_modified, total = queryset_stamp(upcoming_events())
+    return ResourceStamp(parts=(last_modified, total), last_modified=last_modified, private=False)
+
+
+# Show Event in JSON
+# Response cache di dalam conditional_json: request yang masih fresh langsung 304 tanpa membaca cache.
+# Timeout pendek karena event yang sudah lewat keluar dari daftar tanpa ada penulisan model.
+@conditional_json(show_json_stamp)
+@cache_response(tags=['events'], timeout=SHOW_JSON_CACHE_TIMEOUT)
+def show_json(request):
+    event_list = upcoming_events().order_by('-event_date', '-start_time')
+    # organizer di-join sekalian supaya tidak ada query per event
+    event_list = event_list.select_related('organizer')
 
     data=[
         {
@@ -193,20 +215,20 @@ def event_user_has_reviewed(request, id):
     return JsonResponse({'has_reviewed': has_reviewed}, status=200)
 
 # Buat Show Gambar
-def proxy_image(request):
+# Async: menunggu server gambar eksternal tidak mem-block worker (connection pool di fetch_url)
+async def proxy_image(request):
     image_url = request.GET.get('url')
     if not image_url:
         return HttpResponse('No URL provided', status=400)
-    
+
     try:
         # Fetch image from external source
-        response = requests.get(image_url, timeout=10)
-        response.raise_for_status()
-        
+        result = await fetch_url(image_url, timeout=10)
+
         # Return the image with proper content type
         return HttpResponse(
-            response.content,
-            content_type=response.headers.get('Content-Type', 'image/jpeg')
+            result.content,
+            content_type=result.content_type or 'image/jpeg'
         )
-    except requests.RequestException as e:
+    except FetchError as e:
         return HttpResponse(f'Error fetching image: {str(e)}', status=500)
\ No newline at end of file
@@ -1,7 +1,8 @@
 # event_management/api.py
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpResponseBadRequest
+from django.http import HttpResponseBadRequest
+from sigma_app.json_response import JsonResponse
 from django.shortcuts import get_object_or_404
 from .forms import EventForm
 from event_discovery.models import Event, EventParticipant
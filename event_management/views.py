@@ -5,7 +5,7 @@ from event_discovery.models import Event, EventParticipant
 from .forms import EventForm
 from datetime import date
 
-from django.http import JsonResponse
+from sigma_app.json_response import JsonResponse
 from django.urls import reverse
 import json
 
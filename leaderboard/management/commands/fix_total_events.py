@@ -4,6 +4,7 @@ from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
 from authentication.models import UserProfile
 from event_discovery.models import EventParticipant
+from sigma_app.db_config import DB_ITERATOR_CHUNK_SIZE
 
 
 class Command(BaseCommand):
@@ -12,8 +13,8 @@ class Command(BaseCommand):
     def handle(self, *args, **kwargs):
         self.stdout.write(self.style.SUCCESS("Starting to fix total_events count..."))
         
-        # Get all users
-        users = User.objects.all()
+        # Get all users (iterator: dibaca per chunk lewat server-side cursor di PostgreSQL)
+        users = User.objects.all().iterator(chunk_size=DB_ITERATOR_CHUNK_SIZE)
         updated_count = 0
         
         for user in users:
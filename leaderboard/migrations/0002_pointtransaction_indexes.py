@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_discovery', '0001_initial'),
+        ('leaderboard', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pointtransaction',
+            index=models.Index(fields=['user', 'created_at'], name='pt_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pointtransaction',
+            index=models.Index(fields=['user', 'activity_type', 'related_event'], name='pt_user_activity_event_idx'),
+        ),
+    ]
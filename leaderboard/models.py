@@ -6,9 +6,12 @@ Berisi model untuk tracking poin user dan achievement/prestasi
 # Import model dan fungsi Django yang diperlukan
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.models.functions import Coalesce, Now
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from sigma_app.response_cache import invalidate_tags
+
 
 class PointTransaction(models.Model):
     """
@@ -63,6 +66,13 @@ class PointTransaction(models.Model):
         # '-created_at' berarti descending (terbaru dulu)
         ordering = ['-created_at']
 
+        # Index komposit sesuai pola query di dashboard, history, dan cek achievement
+        # (user, activity_type) sudah tercakup oleh prefix index ketiga
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='pt_user_created_idx'),
+            models.Index(fields=['user', 'activity_type', 'related_event'], name='pt_user_activity_event_idx'),
+        ]
+
     def __str__(self):
         """
         Representasi string untuk ditampilkan di admin atau debugging.
@@ -188,4 +198,31 @@ def update_user_points(sender, instance, created, **kwargs):
             # Jika UserProfile belum ada, skip (tidak perlu error)
             # Ini adalah edge case yang seharusnya tidak terjadi karena
             # UserProfile dibuat otomatis via signal saat User dibuat
-            pass
\ No newline at end of file
+            pass
+
+def refresh_total_points(user_ids):
+    """
+    Hitung ulang total_points untuk banyak user sekaligus dengan satu UPDATE.
+    Dipakai oleh jalur bulk (bulk_create tidak memicu signal update_user_points).
+
+    Args:
+        user_ids: Iterable id user yang total poinnya perlu dihitung ulang
+    """
+    # Import UserProfile di dalam fungsi untuk menghindari circular import
+    from authentication.models import UserProfile
+
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+
+    # Subquery SUM(points) per user, COALESCE ke 0 jika belum ada transaksi
+    totals = PointTransaction.objects.filter(
+        user_id=models.OuterRef('user_id')
+    ).order_by().values('user_id').annotate(total=models.Sum('points')).values('total')
+
+    UserProfile.objects.filter(user_id__in=user_ids).update(
+        total_points=Coalesce(models.Subquery(totals), 0),
+        updated_at=Now(),
+    )
+    # queryset.update() tidak memicu signal invalidasi response cache
+    invalidate_tags('points')
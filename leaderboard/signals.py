@@ -14,8 +14,10 @@ from datetime import timedelta
 # Import model-model yang akan di-listen
 from event_discovery.models import EventParticipant, Event
 from reviews.models import Review
+from authentication.models import UserProfile
+from authentication.counters import adjust_point_activity_counters
 # Import model-model leaderboard
-from leaderboard.models import PointTransaction, Achievement
+from leaderboard.models import PointTransaction, Achievement, refresh_total_points
 
 
 # ===== POINT TRANSACTION CONSTANTS =====
@@ -389,14 +391,16 @@ def check_achievements(sender, instance, created, **kwargs):
                 description='Achievement bonus: First Event'
             )
 
+    # Counter progress dari UserProfile (di-maintain oleh authentication/signals.py), satu query
+    counters = UserProfile.objects.filter(user=user).values(
+        'events_completed_count', 'organized_completed_count', 'five_star_received_count'
+    ).first() or {}
+
     # ===== 10 EVENTS ACHIEVEMENT =====
     # Syarat: User menyelesaikan 10 event
     # Bonus: 20 poin
-    # Hitung jumlah event yang sudah diselesaikan user
-    completed_events = PointTransaction.objects.filter(
-        user=user,
-        activity_type='event_complete'
-    ).count()
+    # Jumlah event yang sudah diselesaikan user
+    completed_events = counters.get('events_completed_count', 0)
 
     # Jika sudah 10 event atau lebih
     if completed_events >= 10:
@@ -421,11 +425,8 @@ def check_achievements(sender, instance, created, **kwargs):
     # ===== ORGANIZER ACHIEVEMENT =====
     # Syarat: User menyelenggarakan 5 event yang sudah completed
     # Bonus: 30 poin
-    # Hitung jumlah event yang diselenggarakan user dengan status 'completed'
-    organized_events = Event.objects.filter(
-        organizer=user,
-        status='completed'
-    ).count()
+    # Jumlah event completed yang diselenggarakan user
+    organized_events = counters.get('organized_completed_count', 0)
 
     # Jika sudah 5 event atau lebih
     if organized_events >= 5:
@@ -450,11 +451,8 @@ def check_achievements(sender, instance, created, **kwargs):
     # ===== HIGHLY RATED ACHIEVEMENT =====
     # Syarat: User menerima 10 review bintang 5
     # Bonus: 25 poin
-    # Hitung jumlah review bintang 5 yang diterima user
-    five_star_count = PointTransaction.objects.filter(
-        user=user,
-        activity_type='five_star_received'
-    ).count()
+    # Jumlah review bintang 5 yang diterima user
+    five_star_count = counters.get('five_star_received_count', 0)
 
     # Jika sudah 10 review bintang 5 atau lebih
     if five_star_count >= 10:
@@ -476,3 +474,158 @@ def check_achievements(sender, instance, created, **kwargs):
                 description='Achievement bonus: Highly Rated'
             )
 
+
+# ===== BULK HELPERS =====
+# Dipakai jalur bulk (misalnya submit review sekaligus via bulk_create) yang tidak memicu
+# post_save per baris. Efek samping yang sama dengan signal di atas diterapkan secara
+# grouped sehingga jumlah query tetap, berapapun jumlah baris yang diproses.
+
+# Achievement berbasis jumlah aktivitas, sama dengan syarat di check_achievements
+# 'counter' adalah nama field counter di UserProfile
+COUNT_ACHIEVEMENTS = [
+    {
+        'code': 'ten_events',
+        'name': '10 Events',
+        'title': '🎯 10 Events',
+        'description': 'Completed 10 events',
+        'bonus_points': 20,
+        'counter': 'events_completed_count',
+        'threshold': 10,
+    },
+    {
+        'code': 'organizer',
+        'name': 'Organizer',
+        'title': '👑 Organizer',
+        'description': 'Organized 5 events',
+        'bonus_points': 30,
+        'counter': 'organized_completed_count',
+        'threshold': 5,
+    },
+    {
+        'code': 'highly_rated',
+        'name': 'Highly Rated',
+        'title': '⭐ Highly Rated',
+        'description': 'Received 10 five-star reviews',
+        'bonus_points': 25,
+        'counter': 'five_star_received_count',
+        'threshold': 10,
+    },
+]
+
+
+def check_achievements_bulk(user_ids):
+    """
+    Versi grouped dari check_achievements untuk banyak user sekaligus.
+
+    Args:
+        user_ids: Iterable id user yang baru mendapat transaksi poin
+
+    Returns:
+        List PointTransaction bonus yang dibuat (sudah tersimpan)
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return []
+
+    # Semua counter dari UserProfile dengan satu query
+    counters = {user_id: {} for user_id in user_ids}
+    rows = UserProfile.objects.filter(user_id__in=user_ids).values(
+        'user_id', *{rule['counter'] for rule in COUNT_ACHIEVEMENTS}
+    )
+    for row in rows:
+        counters[row['user_id']] = row
+
+    # first_event ikut dibaca untuk putaran kedua di bawah
+    owned = set(Achievement.objects.filter(
+        user_id__in=user_ids,
+        achievement_code__in=['first_event', *(rule['code'] for rule in COUNT_ACHIEVEMENTS)]
+    ).values_list('user_id', 'achievement_code'))
+
+    achievements = []
+    bonus_transactions = []
+    for user_id in sorted(user_ids):
+        for rule in COUNT_ACHIEVEMENTS:
+            if (user_id, rule['code']) in owned:
+                continue
+            if counters[user_id].get(rule['counter'], 0) < rule['threshold']:
+                continue
+            achievements.append(Achievement(
+                user_id=user_id,
+                achievement_code=rule['code'],
+                title=rule['title'],
+                description=rule['description'],
+                bonus_points=rule['bonus_points']
+            ))
+            # Bonus poin, activity_type sama seperti check_achievements
+            bonus_transactions.append(PointTransaction(
+                user_id=user_id,
+                activity_type='event_join',
+                points=rule['bonus_points'],
+                description=f"Achievement bonus: {rule['name']}"
+            ))
+
+    # Di jalur per-row, menyimpan bonus (activity_type 'event_join') menjalankan
+    # check_achievements lagi dan memberi first_event ke user yang belum punya.
+    # Putaran kedua ini meniru efek tersebut untuk bonus yang dibuat via bulk_create.
+    for user_id in sorted({transaction.user_id for transaction in bonus_transactions}):
+        if (user_id, 'first_event') in owned:
+            continue
+        achievements.append(Achievement(
+            user_id=user_id,
+            achievement_code='first_event',
+            title='🏃 First Event',
+            description='Joined your first event',
+            bonus_points=5
+        ))
+        bonus_transactions.append(PointTransaction(
+            user_id=user_id,
+            activity_type='event_join',
+            points=5,
+            description='Achievement bonus: First Event'
+        ))
+
+    if achievements:
+        Achievement.objects.bulk_create(achievements)
+        PointTransaction.objects.bulk_create(bonus_transactions)
+    return bonus_transactions
+
+
+def award_review_points_bulk(reviews):
+    """
+    Berikan poin review_given dan five_star_received untuk banyak Review sekaligus.
+    Pengganti award_points_on_review_given / award_points_on_five_star_review
+    untuk review yang dibuat via bulk_create.
+
+    Args:
+        reviews: List Review yang baru dibuat (from_user/to_user sudah ter-load)
+    """
+    transactions = []
+    for review in reviews:
+        transactions.append(PointTransaction(
+            user=review.from_user,
+            activity_type='review_given',
+            points=POINTS_CONFIG['review_given'],
+            description=f"Gave review to {review.to_user.username}",
+            related_event=review.event
+        ))
+        if review.rating == 5:
+            transactions.append(PointTransaction(
+                user=review.to_user,
+                activity_type='five_star_received',
+                points=POINTS_CONFIG['five_star_received'],
+                description=f"Received 5-star review from {review.from_user.username}",
+                related_event=review.event
+            ))
+
+    if not transactions:
+        return
+
+    PointTransaction.objects.bulk_create(transactions)
+
+    # bulk_create tidak memicu signal counter (five_star_received_count)
+    adjust_point_activity_counters(transactions)
+
+    # Cek achievement lalu hitung ulang total_points semua user yang terdampak
+    user_ids = {transaction.user_id for transaction in transactions}
+    check_achievements_bulk(user_ids)
+    refresh_total_points(user_ids)
@@ -1,11 +1,12 @@
 from django.test import TestCase, Client, override_settings
+from django.db.models import Sum
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
 from authentication.models import UserProfile
 from leaderboard.models import PointTransaction, Achievement
-from leaderboard.views import get_tier, get_badge, get_achievement_description
+from leaderboard.views import get_tier, get_badge, get_achievement_description, get_points_breakdown
 
 
 class PointTransactionModelTest(TestCase):
@@ -329,6 +330,37 @@ class PointsDashboardViewTest(TestCase):
         self.assertIn('tier', response.context)
         self.assertIn('badge', response.context)
 
+    def test_points_breakdown_single_query(self):
+        """Breakdown semua activity_type dihitung dengan satu query grouped"""
+        PointTransaction.objects.create(user=self.user, activity_type='event_join', points=10, description='Test 3')
+
+        with self.assertNumQueries(1):
+            breakdown = get_points_breakdown(self.user)
+
+        # Hasil harus sama dengan aggregate per activity_type (termasuk bonus achievement)
+        self.assertEqual(list(breakdown), [code for code, _ in PointTransaction.ACTIVITY_CHOICES])
+        for activity_type, label in PointTransaction.ACTIVITY_CHOICES:
+            transactions = PointTransaction.objects.filter(user=self.user, activity_type=activity_type)
+            self.assertEqual(breakdown[activity_type], {
+                'label': label,
+                'total': transactions.aggregate(total=Sum('points'))['total'] or 0,
+                'count': transactions.count(),
+            })
+        self.assertEqual(breakdown['review_given']['count'], 0)
+
+    def test_dashboards_share_breakdown_and_rank(self):
+        """Dashboard web dan Flutter mengembalikan breakdown dan ranking yang sama"""
+        other = User.objects.create_user(username='leader', password='pass123')
+        PointTransaction.objects.create(user=other, activity_type='event_complete', points=100, description='Lead')
+
+        self.client.login(username='testuser', password='pass123')
+        web = self.client.get(reverse('leaderboard:points_dashboard'))
+        flutter = self.client.get(reverse('leaderboard:flutter_points_dashboard')).json()['data']
+
+        self.assertEqual(web.context['breakdown'], flutter['breakdown'])
+        self.assertEqual(web.context['user_rank'], 2)
+        self.assertEqual(flutter['current_rank'], 2)
+
 
 class PointsHistoryViewTest(TestCase):
     """Test cases for points_history view"""
@@ -378,7 +410,7 @@ class PointsHistoryViewTest(TestCase):
 
         transactions = response.context['transactions']
         # Should have at least the 2 transactions we created
-        self.assertGreaterEqual(transactions.count(), 2)
+        self.assertGreaterEqual(len(transactions), 2)
 
     def test_points_history_activity_filter(self):
         """Test filtering by activity type"""
@@ -387,11 +419,69 @@ class PointsHistoryViewTest(TestCase):
 
         transactions = response.context['transactions']
         # Should have at least 1 event_join transaction
-        self.assertGreaterEqual(transactions.count(), 1)
+        self.assertGreaterEqual(len(transactions), 1)
         # All transactions should be event_join type
         for transaction in transactions:
             self.assertEqual(transaction.activity_type, 'event_join')
 
+    def _create_many(self, count, created_at=None):
+        """Buat `count` transaksi review_given, semuanya dengan created_at yang sama jika diberikan"""
+        transactions = PointTransaction.objects.bulk_create([
+            PointTransaction(user=self.user, activity_type='review_given', points=5, description=f'Bulk {index}')
+            for index in range(count)
+        ])
+        if created_at is not None:
+            PointTransaction.objects.filter(id__in=[t.id for t in transactions]).update(created_at=created_at)
+
+    def test_points_history_cursor_walks_all_pages(self):
+        """Cursor pagination mengembalikan semua transaksi tanpa duplikat, termasuk created_at yang sama"""
+        from leaderboard.views import HISTORY_PAGE_SIZE
+        self._create_many(HISTORY_PAGE_SIZE + 5, created_at=timezone.now())
+        self.client.login(username='testuser', password='pass123')
+
+        seen = []
+        url = reverse('leaderboard:points_history')
+        cursor = None
+        while True:
+            response = self.client.get(url, {'cursor': cursor} if cursor else {})
+            seen.extend(transaction.id for transaction in response.context['transactions'])
+            cursor = response.context['next_cursor']
+            if cursor is None:
+                break
+
+        expected = list(PointTransaction.objects.filter(user=self.user).order_by('-created_at', '-id')
+                        .values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_points_history_invalid_cursor_shows_first_page(self):
+        """Cursor rusak dianggap halaman pertama"""
+        self.client.login(username='testuser', password='pass123')
+        response = self.client.get(reverse('leaderboard:points_history'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['is_first_page'])
+
+    def test_flutter_points_history_cursor_and_optional_total(self):
+        """Flutter history memakai cursor, total hanya dihitung jika diminta"""
+        self._create_many(5)
+        self.client.login(username='testuser', password='pass123')
+        url = reverse('leaderboard:flutter_points_history')
+
+        first = self.client.get(url, {'limit': 3, 'activity_type': 'review_given'}).json()['data']
+        self.assertEqual(len(first['transactions']), 3)
+        self.assertTrue(first['has_more'])
+        self.assertIsNone(first['total_transactions'])
+
+        second = self.client.get(url, {
+            'limit': 3, 'activity_type': 'review_given', 'cursor': first['next_cursor'], 'include_total': 'true',
+        }).json()['data']
+        self.assertEqual(len(second['transactions']), 2)
+        self.assertFalse(second['has_more'])
+        self.assertEqual(second['total_transactions'], 5)
+        first_ids = {item['id'] for item in first['transactions']}
+        self.assertFalse(first_ids & {item['id'] for item in second['transactions']})
+
+        self.assertEqual(self.client.get(url, {'cursor': 'broken'}).status_code, 400)
+
 
 class AchievementsPageViewTest(TestCase):
     """Test cases for achievements_page view"""
@@ -462,6 +552,43 @@ class AchievementsPageViewTest(TestCase):
         self.assertFalse(ten_events['is_earned'])
         self.assertIsNone(ten_events['earned_at'])
 
+    def test_achievements_progress_from_counters(self):
+        """Progress achievement dibaca dari counter UserProfile yang di-maintain signal"""
+        for index in range(7):
+            PointTransaction.objects.create(
+                user=self.user, activity_type='event_complete', points=30, description=f'Complete {index}'
+            )
+        self.assertEqual(UserProfile.objects.get(user=self.user).events_completed_count, 7)
+
+        self.client.login(username='testuser', password='pass123')
+        response = self.client.get(reverse('leaderboard:achievements'))
+        achievements = {a['code']: a for a in response.context['all_achievements']}
+
+        self.assertEqual(achievements['ten_events']['progress'], {'current': 7, 'target': 10, 'percent': 70})
+        self.assertEqual(achievements['highly_rated']['progress']['current'], 0)
+        self.assertIsNone(achievements['early_bird']['progress'])
+        self.assertIsNone(achievements['social_butterfly']['progress'])
+        self.assertContains(response, '7/10')
+
+    def test_achievements_page_constant_queries(self):
+        """Jumlah query tidak bertambah walaupun semua achievement sudah didapat"""
+        self.client.login(username='testuser', password='pass123')
+        url = reverse('leaderboard:achievements')
+        self.client.get(url)
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(url)
+
+        for code, title in Achievement.ACHIEVEMENT_CODES[1:]:
+            Achievement.objects.create(user=self.user, achievement_code=code, title=title, description=title)
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get(url)
+
+        self.assertEqual(response.context['earned_count'], 6)
+        self.assertEqual(len(after.captured_queries), len(before.captured_queries))
+
 
 class LeaderboardPeriodFilterTest(TestCase):
     """Test cases for period filtering in leaderboard"""
@@ -4,22 +4,51 @@ Berisi view functions untuk leaderboard, points dashboard, points history, dan a
 """
 
 # Import fungsi-fungsi Django untuk routing dan HTTP response
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import aget_object_or_404, render, get_object_or_404
 # Import decorator untuk membatasi akses hanya untuk user yang sudah login
 from django.contrib.auth.decorators import login_required
 # Import fungsi agregasi untuk menghitung sum/total
-from django.db.models import Sum
+from django.db.models import Count, Q, Sum
 # Import JsonResponse untuk mengembalikan response dalam format JSON (untuk AJAX)
-from django.http import JsonResponse
+# Versi cepat (orjson) dengan signature sama seperti django.http.JsonResponse
+from sigma_app.json_response import JsonResponse
 # Import decorator untuk CSRF exemption (untuk Flutter API)
 from django.views.decorators.csrf import csrf_exempt
 # Import JSON untuk parsing request body
 import json
+from datetime import datetime
+# Encoding cursor pagination yang aman untuk URL
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 # Import model-model yang diperlukan
 from authentication.models import UserProfile
 from leaderboard.models import PointTransaction, Achievement
+from leaderboard.signals import COUNT_ACHIEVEMENTS
+from sigma_app.conditional import ResourceStamp, conditional_json, queryset_stamp
+from sigma_app.response_cache import cache_response
+# Query independen di view async Flutter (paralel jika ASYNC_PARALLEL_QUERIES aktif)
+from sigma_app.async_utils import run_queries
 
 
+# Jumlah transaksi per halaman di points history (web dan Flutter)
+HISTORY_PAGE_SIZE = 20
+# Umur response cache leaderboard (detik). Poin/profil di-invalidate lewat tag 'points',
+# timeout hanya untuk filter weekly/monthly yang jendela waktunya bergeser
+LEADERBOARD_CACHE_TIMEOUT = 60
+
+# Batas maksimal parameter limit di Flutter points history
+HISTORY_MAX_PAGE_SIZE = 100
+
+# Progress achievement: kode -> (field counter di UserProfile, target)
+# social_butterfly dan early_bird belum pernah diberikan (belum diimplementasi),
+# jadi tidak menampilkan progress yang bisa penuh sementara kartunya tetap terkunci
+ACHIEVEMENT_PROGRESS = {
+    'first_event': ('total_events', 1),
+    **{rule['code']: (rule['counter'], rule['threshold']) for rule in COUNT_ACHIEVEMENTS},
+}
+
+
+# Hanya untuk user anonim: user yang login melihat ranking dirinya sendiri
+@cache_response(tags=['points'], timeout=LEADERBOARD_CACHE_TIMEOUT, query_params=['period'], anonymous_only=True)
 def leaderboard_page(request):
     """
     Leaderboard Page - menampilkan ranking user berdasarkan total points.
@@ -104,6 +133,8 @@ def leaderboard_page(request):
             'tier': get_tier(points),
             # Helper function untuk menentukan badge emoji berdasarkan poin
             'badge': get_badge(points),
+            # Versi data profil, dipakai sebagai key template fragment cache baris leaderboard
+            'updated_at': profile.updated_at,
         })
 
     # Sort user berdasarkan total_points (descending = tertinggi dulu)
@@ -136,6 +167,8 @@ def leaderboard_page(request):
     return render(request, 'leaderboard/leaderboard.html', context)
 
 
+@cache_response(tags=['points'], timeout=LEADERBOARD_CACHE_TIMEOUT, query_params=['period', 'page', 'per_page'],
+                anonymous_only=True)
 def leaderboard_api(request):
     """
     AJAX API endpoint untuk leaderboard data.
@@ -286,24 +319,13 @@ def points_dashboard(request):
     # order_by('-created_at'): Descending order (terbaru dulu)
     transactions = PointTransaction.objects.filter(user=user).order_by('-created_at')
 
-    # Hitung breakdown poin per jenis aktivitas
+    # Hitung breakdown poin per jenis aktivitas (satu query grouped)
     # breakdown = {
     #     'event_join': {'label': 'Event Join', 'total': 100, 'count': 10},
     #     'event_complete': {'label': 'Event Complete', 'total': 300, 'count': 10},
     #     ...
     # }
-    breakdown = {}
-    for activity_type, label in PointTransaction.ACTIVITY_CHOICES:
-        # Hitung total poin untuk activity_type ini
-        total = transactions.filter(activity_type=activity_type).aggregate(Sum('points'))['points__sum'] or 0
-        # Hitung jumlah transaksi untuk activity_type ini
-        count = transactions.filter(activity_type=activity_type).count()
-        # Simpan ke dictionary breakdown
-        breakdown[activity_type] = {
-            'label': label,
-            'total': total,
-            'count': count,
-        }
+    breakdown = get_points_breakdown(user)
 
     # Ambil 10 transaksi terbaru untuk ditampilkan di dashboard
     # [:10]: Slice array, ambil 10 item pertama
@@ -312,15 +334,8 @@ def points_dashboard(request):
     # Ambil semua achievement user, diurutkan dari terbaru
     achievements = Achievement.objects.filter(user=user).order_by('-earned_at')
 
-    # Hitung ranking user di leaderboard
-    # Query semua UserProfile, diurutkan berdasarkan total_points (descending)
-    ranked_users = UserProfile.objects.order_by('-total_points')
-    user_rank = None
-    # Loop untuk cari posisi user di ranking
-    for idx, p in enumerate(ranked_users, start=1):
-        if p.user.id == user.id:
-            user_rank = idx
-            break
+    # Hitung ranking user di leaderboard (jumlah user dengan poin lebih tinggi + 1)
+    user_rank = get_user_rank(profile)
 
     # Siapkan context untuk template
     context = {
@@ -349,20 +364,22 @@ def points_history(request):
 
     Query Parameters:
         activity (str): Filter berdasarkan activity_type (opsional)
+        cursor (str): Cursor halaman berikutnya dari response sebelumnya (opsional)
 
     Requires:
         User harus login (login_required decorator)
 
     Flow:
-    1. Query semua transaksi poin user
+    1. Query transaksi poin user
     2. Jika ada parameter 'activity', filter berdasarkan activity_type
-    3. Render template dengan data transaksi
+    3. Ambil HISTORY_PAGE_SIZE transaksi setelah cursor (urut created_at, id)
+    4. Render template dengan data transaksi dan cursor halaman berikutnya
     """
     # Ambil user yang sedang login
     user = request.user
 
-    # Query semua transaksi poin user, diurutkan dari terbaru
-    transactions = PointTransaction.objects.filter(user=user).order_by('-created_at')
+    # Query transaksi poin user, diurutkan dari terbaru (index user, created_at)
+    transactions = PointTransaction.objects.filter(user=user)
 
     # Ambil parameter filter activity dari query string
     activity_filter = request.GET.get('activity', '')
@@ -371,9 +388,20 @@ def points_history(request):
     if activity_filter:
         transactions = transactions.filter(activity_type=activity_filter)
 
+    # Cursor tidak valid dianggap halaman pertama
+    try:
+        cursor = decode_history_cursor(request.GET.get('cursor'))
+    except ValueError:
+        cursor = None
+
+    # Ambil satu halaman transaksi (tanpa COUNT seluruh history)
+    page, next_cursor = paginate_history(transactions, cursor, HISTORY_PAGE_SIZE)
+
     # Siapkan context untuk template
     context = {
-        'transactions': transactions,
+        'transactions': page,
+        'next_cursor': next_cursor,
+        'is_first_page': cursor is None,
         'activity_filter': activity_filter,
         # ACTIVITY_CHOICES untuk dropdown filter di template
         'activity_choices': PointTransaction.ACTIVITY_CHOICES,
@@ -393,16 +421,20 @@ def achievements_page(request):
         User harus login (login_required decorator)
 
     Flow:
-    1. Query achievement yang sudah didapat user
-    2. Build list semua achievement (earned + locked)
-    3. Hitung persentase achievement yang sudah didapat
-    4. Render template dengan data achievement
+    1. Query achievement yang sudah didapat user (satu query)
+    2. Query counter progress dari UserProfile (satu query)
+    3. Build list semua achievement (earned + locked) beserta progress-nya
+    4. Hitung persentase achievement yang sudah didapat
+    5. Render template dengan data achievement
     """
     # Ambil user yang sedang login
     user = request.user
 
-    # Query achievement yang sudah didapat user, diurutkan dari terbaru
-    earned_achievements = Achievement.objects.filter(user=user).order_by('-earned_at')
+    # Query achievement yang sudah didapat user, dijadikan dict {kode: Achievement}
+    earned_achievements = {
+        achievement.achievement_code: achievement
+        for achievement in Achievement.objects.filter(user=user)
+    }
 
     # Ambil semua kode achievement yang mungkin
     # List comprehension: [code for code, _ in Achievement.ACHIEVEMENT_CODES]
@@ -410,30 +442,27 @@ def achievements_page(request):
     all_achievement_codes = [code for code, _ in Achievement.ACHIEVEMENT_CODES]
 
     # Ambil set kode achievement yang sudah didapat user
-    # values_list('achievement_code', flat=True): Return list kode saja
-    # set(): Convert list ke set untuk lookup yang lebih cepat
-    earned_codes = set(earned_achievements.values_list('achievement_code', flat=True))
+    earned_codes = set(earned_achievements) & set(all_achievement_codes)
 
-    # Build list semua achievement dengan status earned/locked
+    # Build list semua achievement dengan status earned/locked dan progress
+    progress = get_achievement_progress(user)
     all_achievements = []
     for code, title in Achievement.ACHIEVEMENT_CODES:
-        # Cek apakah achievement ini sudah didapat
-        is_earned = code in earned_codes
-
-        # Jika sudah didapat, ambil data achievement dari database
-        # Jika belum, earned_ach = None
-        earned_ach = earned_achievements.filter(achievement_code=code).first() if is_earned else None
+        # Jika sudah didapat, earned_ach berisi data achievement, jika belum None
+        earned_ach = earned_achievements.get(code)
 
         # Append data achievement ke list
         all_achievements.append({
             'code': code,
             'title': title,
-            'is_earned': is_earned,
+            'is_earned': earned_ach is not None,
             'earned_at': earned_ach.earned_at if earned_ach else None,
             'bonus_points': earned_ach.bonus_points if earned_ach else 0,
             # Jika sudah earned, gunakan description dari database
             # Jika belum, gunakan description default dari helper function
             'description': earned_ach.description if earned_ach else get_achievement_description(code),
+            # {'current', 'target', 'percent'} atau None jika tidak ada counter
+            'progress': progress.get(code),
         })
 
     # Siapkan context untuk template
@@ -533,10 +562,187 @@ def get_achievement_description(code):
     return descriptions.get(code, 'Unknown achievement')
 
 
+def get_points_breakdown(user):
+    """
+    Helper function untuk breakdown poin per jenis aktivitas.
+    Semua activity_type dihitung dengan satu query grouped (values().annotate()),
+    dipakai oleh points_dashboard dan flutter_points_dashboard.
+
+    Args:
+        user (User): User yang dihitung breakdown-nya
+
+    Returns:
+        dict: {activity_type: {'label': str, 'total': int, 'count': int}}
+              dengan urutan sesuai ACTIVITY_CHOICES (activity tanpa transaksi bernilai 0)
+    """
+    # order_by(): hapus ordering default model supaya GROUP BY hanya per activity_type
+    rows = PointTransaction.objects.filter(user=user).values('activity_type').annotate(
+        total=Sum('points'),
+        count=Count('id'),
+    ).order_by()
+    totals = {row['activity_type']: row for row in rows}
+
+    breakdown = {}
+    for activity_type, label in PointTransaction.ACTIVITY_CHOICES:
+        row = totals.get(activity_type, {})
+        breakdown[activity_type] = {
+            'label': label,
+            'total': row.get('total') or 0,
+            'count': row.get('count', 0),
+        }
+    return breakdown
+
+
+def encode_history_cursor(transaction):
+    """
+    Helper function untuk membuat cursor dari transaksi terakhir di sebuah halaman.
+
+    Args:
+        transaction (PointTransaction): Transaksi terakhir yang ditampilkan
+
+    Returns:
+        str: Cursor (base64 urlsafe dari "created_at|id")
+    """
+    value = f"{transaction.created_at.isoformat()}|{transaction.id}"
+    return urlsafe_base64_encode(value.encode())
+
+
+def decode_history_cursor(cursor):
+    """
+    Helper function untuk membaca cursor dari query string.
+
+    Args:
+        cursor (str): Cursor dari encode_history_cursor (boleh kosong)
+
+    Returns:
+        tuple: (created_at, id), atau None jika cursor kosong
+
+    Raises:
+        ValueError: Jika format cursor tidak valid
+    """
+    if not cursor:
+        return None
+    try:
+        created_at, transaction_id = urlsafe_base64_decode(cursor).decode().split('|')
+        return datetime.fromisoformat(created_at), int(transaction_id)
+    except (TypeError, UnicodeDecodeError) as error:
+        raise ValueError('Invalid cursor') from error
+
+
+def paginate_history(transactions, cursor, page_size):
+    """
+    Helper function untuk cursor pagination transaksi poin, keyed on (created_at, id).
+    Query selalu berupa range scan pada index (user, created_at) dengan LIMIT,
+    sehingga cepat walaupun history user sangat panjang (tidak ada OFFSET / COUNT).
+
+    Args:
+        transactions (QuerySet): Transaksi yang sudah difilter (user, activity_type)
+        cursor (tuple): (created_at, id) dari decode_history_cursor, atau None
+        page_size (int): Jumlah transaksi per halaman
+
+    Returns:
+        tuple: (list transaksi, cursor halaman berikutnya atau None)
+    """
+    transactions = transactions.order_by('-created_at', '-id')
+    if cursor is not None:
+        created_at, transaction_id = cursor
+        # created_at__lte ditulis terpisah supaya database bisa memakai range scan pada index
+        transactions = transactions.filter(
+            Q(created_at__lt=created_at) | Q(id__lt=transaction_id),
+            created_at__lte=created_at,
+        )
+
+    # Ambil satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+    rows = list(transactions[:page_size + 1])
+    page = rows[:page_size]
+    next_cursor = encode_history_cursor(page[-1]) if len(rows) > page_size else None
+    return page, next_cursor
+
+
+def get_achievement_progress(user):
+    """
+    Helper function untuk progress achievement dari counter UserProfile (satu query).
+
+    Args:
+        user (User): User yang dihitung progress-nya
+
+    Returns:
+        dict: {kode: {'current': int, 'target': int, 'percent': int}} untuk achievement
+              yang ada di ACHIEVEMENT_PROGRESS (current dibatasi maksimal target)
+    """
+    fields = {field for field, _ in ACHIEVEMENT_PROGRESS.values()}
+    counters = UserProfile.objects.filter(user=user).values(*fields).first() or {}
+
+    progress = {}
+    for code, (field, target) in ACHIEVEMENT_PROGRESS.items():
+        current = min(counters.get(field, 0), target)
+        progress[code] = {
+            'current': current,
+            'target': target,
+            'percent': int(current * 100 / target),
+        }
+    return progress
+
+
+def get_recent_achievements(user, limit=5):
+    """
+    Helper function untuk daftar achievement terbaru user (format JSON Flutter).
+
+    Args:
+        user (User): User yang achievement-nya diambil
+        limit (int): Jumlah achievement maksimal
+
+    Returns:
+        list: [{'id', 'achievement_code', 'title', 'description', 'bonus_points', 'earned_at'}]
+    """
+    return [
+        {
+            'id': achievement.id,
+            'achievement_code': achievement.achievement_code,
+            'title': achievement.title,
+            'description': achievement.description,
+            'bonus_points': achievement.bonus_points,
+            'earned_at': achievement.earned_at.isoformat(),
+        }
+        for achievement in Achievement.objects.filter(user=user).order_by('-earned_at')[:limit]
+    ]
+
+
+def get_user_rank(profile):
+    """
+    Helper function untuk ranking user di leaderboard all-time.
+    Ranking = jumlah user dengan poin lebih tinggi + 1 (satu query COUNT,
+    memakai index total_points), user dengan poin sama mendapat ranking sama.
+
+    Args:
+        profile (UserProfile): Profile user
+
+    Returns:
+        int: Ranking user (mulai dari 1)
+    """
+    return UserProfile.objects.filter(total_points__gt=profile.total_points).count() + 1
+
+
 # ===== FLUTTER MOBILE APP API ENDPOINTS =====
 
+def leaderboard_stamp(request):
+    """
+    Versi data leaderboard: MAX(updated_at) dan COUNT semua UserProfile.
+    updated_at ikut berubah setiap total_points / total_events / nama berubah.
+    current_user_rank berbeda per user, jadi response private jika user login.
+    """
+    last_modified, total = queryset_stamp(UserProfile.objects.all())
+    user_id = request.user.id if request.user.is_authenticated else None
+    return ResourceStamp(
+        parts=(last_modified, total, user_id),
+        last_modified=last_modified,
+        private=user_id is not None,
+    )
+
+
 @csrf_exempt
-def flutter_leaderboard(request):
+@conditional_json(leaderboard_stamp)
+async def flutter_leaderboard(request):
     """
     Flutter API endpoint for leaderboard data with PAGINATION support.
     """
@@ -544,13 +750,14 @@ def flutter_leaderboard(request):
         # 1. Ambil parameter page dan limit (default limit disamakan dengan mobile: 10)
         page = int(request.GET.get('page', 1))
         limit = int(request.GET.get('limit', 10))
+        user = await request.auser()
 
         # Query all user profiles
         profiles_query = UserProfile.objects.select_related('user').all()
 
         # Build ranked users list
         ranked_users = []
-        for profile in profiles_query:
+        async for profile in profiles_query:
             ranked_users.append({
                 'user_id': profile.user.id,
                 'username': profile.user.username,
@@ -571,9 +778,9 @@ def flutter_leaderboard(request):
 
         # Find current user's rank
         current_user_rank = None
-        if request.user.is_authenticated:
+        if user.is_authenticated:
             for user_data in ranked_users:
-                if user_data['user_id'] == request.user.id:
+                if user_data['user_id'] == user.id:
                     current_user_rank = user_data['rank']
                     break
         
@@ -614,7 +821,7 @@ def flutter_leaderboard(request):
         }, status=500)
 
 @csrf_exempt
-def flutter_points_dashboard(request):
+async def flutter_points_dashboard(request):
     """
     Flutter API endpoint for user's points dashboard.
     Returns authenticated user's points summary and statistics.
@@ -657,50 +864,22 @@ def flutter_points_dashboard(request):
     }
     """
     # Check authentication
-    if not request.user.is_authenticated:
+    user = await request.auser()
+    if not user.is_authenticated:
         return JsonResponse({
             'status': False,
             'message': 'Authentication required',
         }, status=401)
 
     try:
-        user = request.user
-        profile = get_object_or_404(UserProfile, user=user)
-
-        # Get all point transactions
-        transactions = PointTransaction.objects.filter(user=user).order_by('-created_at')
-
-        # Calculate breakdown by activity type
-        breakdown = {}
-        for activity_type, label in PointTransaction.ACTIVITY_CHOICES:
-            total = transactions.filter(activity_type=activity_type).aggregate(Sum('points'))['points__sum'] or 0
-            count = transactions.filter(activity_type=activity_type).count()
-            breakdown[activity_type] = {
-                'label': label,
-                'total': total,
-                'count': count,
-            }
-
-        # Get recent achievements (last 5)
-        recent_achievements = Achievement.objects.filter(user=user).order_by('-earned_at')[:5]
-        achievements_data = []
-        for achievement in recent_achievements:
-            achievements_data.append({
-                'id': achievement.id,
-                'achievement_code': achievement.achievement_code,
-                'title': achievement.title,
-                'description': achievement.description,
-                'bonus_points': achievement.bonus_points,
-                'earned_at': achievement.earned_at.isoformat(),
-            })
+        profile = await aget_object_or_404(UserProfile, user=user)
 
-        # Calculate user's rank
-        ranked_users = UserProfile.objects.order_by('-total_points')
-        user_rank = None
-        for idx, p in enumerate(ranked_users, start=1):
-            if p.user.id == user.id:
-                user_rank = idx
-                break
+        # Breakdown (single grouped query), recent achievements, dan rank saling independen
+        breakdown, achievements_data, user_rank = await run_queries(
+            lambda: get_points_breakdown(user),
+            lambda: get_recent_achievements(user),
+            lambda: get_user_rank(profile),
+        )
 
         return JsonResponse({
             'status': True,
@@ -724,7 +903,7 @@ def flutter_points_dashboard(request):
 
 
 @csrf_exempt
-def flutter_points_history(request):
+async def flutter_points_history(request):
     """
     Flutter API endpoint for user's points transaction history.
     Returns authenticated user's complete points transaction history.
@@ -732,8 +911,10 @@ def flutter_points_history(request):
     Endpoint: GET /leaderboard/api/flutter/points/history/
 
     Query Parameters:
-        limit (int): Maximum number of transactions to return (default: 100)
+        limit (int): Page size (default: 20, max: 100)
         activity_type (str): Filter by activity type (optional)
+        cursor (str): next_cursor from the previous page (optional)
+        include_total (bool): Also return the exact total count (optional, default: false)
 
     Response (200):
     {
@@ -751,10 +932,18 @@ def flutter_points_history(request):
                 },
                 ...
             ],
-            "total_transactions": 50
+            "next_cursor": "string or null",
+            "has_more": true,
+            "total_transactions": 50  // null unless include_total=true
         }
     }
 
+    Response (400):
+    {
+        "status": false,
+        "message": "Invalid cursor"
+    }
+
     Response (401):
     {
         "status": false,
@@ -762,35 +951,44 @@ def flutter_points_history(request):
     }
     """
     # Check authentication
-    if not request.user.is_authenticated:
+    user = await request.auser()
+    if not user.is_authenticated:
         return JsonResponse({
             'status': False,
             'message': 'Authentication required',
         }, status=401)
 
     try:
-        user = request.user
-
         # Get query parameters
-        limit = int(request.GET.get('limit', 100))
+        limit = min(max(int(request.GET.get('limit', HISTORY_PAGE_SIZE)), 1), HISTORY_MAX_PAGE_SIZE)
         activity_type = request.GET.get('activity_type', '')
+        include_total = request.GET.get('include_total', '').lower() in ('1', 'true', 'yes')
+
+        try:
+            cursor = decode_history_cursor(request.GET.get('cursor'))
+        except ValueError:
+            return JsonResponse({
+                'status': False,
+                'message': 'Invalid cursor',
+            }, status=400)
 
         # Query transactions
-        transactions = PointTransaction.objects.filter(user=user).order_by('-created_at')
+        transactions = PointTransaction.objects.filter(user=user)
 
         # Apply activity type filter if provided
         if activity_type:
             transactions = transactions.filter(activity_type=activity_type)
 
-        # Get total count before limiting
-        total_count = transactions.count()
-
-        # Apply limit
-        transactions = transactions[:limit]
+        # Exact total count is optional (expensive for long histories),
+        # dijalankan bersamaan dengan query satu halaman setelah cursor
+        total_count, (page, next_cursor) = await run_queries(
+            lambda: transactions.count() if include_total else None,
+            lambda: paginate_history(transactions, cursor, limit),
+        )
 
         # Build transactions data
         transactions_data = []
-        for transaction in transactions:
+        for transaction in page:
             transactions_data.append({
                 'id': transaction.id,
                 'activity_type': transaction.activity_type,
@@ -805,6 +1003,8 @@ def flutter_points_history(request):
             'message': 'Points history retrieved successfully',
             'data': {
                 'transactions': transactions_data,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None,
                 'total_transactions': total_count,
             }
         })
@@ -0,0 +1,135 @@
+from collections import Counter, defaultdict
+
+from django.db.models import Q
+
+from .models import Connection
+
+
+# Helper untuk membaca graf pertemanan (Connection berstatus 'accepted') secara batch.
+# Semua fungsi di sini bekerja dengan id user dan set, sehingga jumlah query tetap
+# konstan berapapun jumlah user / pasangan yang dihitung.
+
+def get_friend_ids(user_id):
+    """Set id teman (accepted) milik satu user, diambil dengan satu query."""
+    rows = Connection.objects.filter(
+        Q(from_user_id=user_id) | Q(to_user_id=user_id),
+        status='accepted'
+    ).values_list('from_user_id', 'to_user_id')
+
+    return {to_id if from_id == user_id else from_id for from_id, to_id in rows}
+
+
+def load_friend_graph(user_ids=None, chunk_size=2000):
+    """
+    Bangun adjacency list {user_id: set(friend_ids)} dari koneksi accepted.
+
+    Jika user_ids diberikan, hanya edge yang menyentuh user tersebut yang dibaca
+    (cukup untuk menghitung friend-of-friend dari user_ids). Tanpa user_ids,
+    seluruh graf dibaca secara streaming untuk batch job.
+    """
+    connections = Connection.objects.filter(status='accepted')
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return defaultdict(set)
+        connections = connections.filter(
+            Q(from_user_id__in=user_ids) | Q(to_user_id__in=user_ids)
+        )
+
+    graph = defaultdict(set)
+    edges = connections.values_list('from_user_id', 'to_user_id').iterator(chunk_size=chunk_size)
+    for from_id, to_id in edges:
+        graph[from_id].add(to_id)
+        graph[to_id].add(from_id)
+    return graph
+
+
+def mutual_friend_counts(user_id, graph, exclude=()):
+    """
+    Hitung jumlah mutual friend untuk setiap friend-of-friend dari user_id.
+
+    Returns:
+        Counter {candidate_id: jumlah_mutual}. User sendiri, teman langsung,
+        dan id di `exclude` tidak ikut dihitung.
+    """
+    friends = graph.get(user_id, set())
+    counts = Counter()
+    for friend_id in friends:
+        counts.update(graph.get(friend_id, ()))
+
+    for skip_id in (user_id, *friends, *exclude):
+        counts.pop(skip_id, None)
+    return counts
+
+
+# Urutan prioritas status jika ada koneksi dua arah (A->B dan B->A)
+CONNECTION_STATUS_PRIORITY = {'accepted': 3, 'pending_sent': 2, 'pending_received': 1, 'none': 0}
+
+
+def get_connection_statuses(user_id, other_ids):
+    """
+    Status koneksi user_id terhadap banyak user sekaligus dengan satu query.
+
+    Returns:
+        Dict {other_id: status} dengan status salah satu dari
+        'accepted', 'pending_sent', 'pending_received', atau 'none'
+        (sama seperti user_profile_detail_api; koneksi rejected dianggap 'none').
+    """
+    other_ids = set(other_ids)
+    statuses = {other_id: 'none' for other_id in other_ids}
+    if not other_ids:
+        return statuses
+
+    rows = Connection.objects.filter(
+        Q(from_user_id=user_id, to_user_id__in=other_ids) |
+        Q(to_user_id=user_id, from_user_id__in=other_ids)
+    ).values_list('from_user_id', 'to_user_id', 'status')
+
+    for from_id, to_id, status in rows:
+        if status == 'accepted':
+            new_status = 'accepted'
+        elif status == 'pending':
+            new_status = 'pending_sent' if from_id == user_id else 'pending_received'
+        else:
+            continue
+
+        other_id = to_id if from_id == user_id else from_id
+        if CONNECTION_STATUS_PRIORITY[new_status] > CONNECTION_STATUS_PRIORITY[statuses[other_id]]:
+            statuses[other_id] = new_status
+
+    return statuses
+
+
+def people_you_may_know(user_id, limit=20):
+    """
+    Rekomendasi "people you may know" berdasarkan mutual connections.
+
+    Hanya butuh 2 query: semua koneksi milik user (teman + pending/rejected yang
+    harus di-exclude), lalu edge accepted milik teman-teman user tersebut.
+
+    Returns:
+        List tuple (candidate_id, mutual_count) terurut dari mutual terbanyak.
+    """
+    rows = Connection.objects.filter(
+        Q(from_user_id=user_id) | Q(to_user_id=user_id)
+    ).values_list('from_user_id', 'to_user_id', 'status')
+
+    friend_ids = set()
+    connected_ids = set()
+    for from_id, to_id, status in rows:
+        other_id = to_id if from_id == user_id else from_id
+        connected_ids.add(other_id)
+        if status == 'accepted':
+            friend_ids.add(other_id)
+
+    if not friend_ids:
+        return []
+
+    graph = load_friend_graph(friend_ids)
+    graph[user_id] = friend_ids
+
+    counts = mutual_friend_counts(user_id, graph, exclude=connected_ids)
+
+    # urutkan berdasarkan mutual terbanyak, id sebagai tie-breaker supaya hasil stabil
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return ranked[:limit]
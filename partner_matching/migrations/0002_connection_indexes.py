@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partner_matching', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connection',
+            index=models.Index(fields=['to_user', 'status'], name='connection_to_status_idx'),
+        ),
+    ]
@@ -31,6 +31,12 @@ class Connection(models.Model):
     class Meta:
         # Kombinasi from_user dan to_user harus unik supaya tidak ada duplikat permintaan
         unique_together = ['from_user', 'to_user']
+
+        # Index untuk permintaan masuk / teman dari sisi penerima
+        # (sisi pengirim sudah tercakup unique_together from_user, to_user)
+        indexes = [
+            models.Index(fields=['to_user', 'status'], name='connection_to_status_idx'),
+        ]
     
     def __str__(self):
         # Representasi string menampilkan pengirim, penerima, dan status koneksi
@@ -216,3 +216,147 @@ class ExtraPartnerMatchingTests(TestCase):
         response = self.client.get(reverse('partner_matching:public_connections', args=[self.user2.id]))
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'partner_matching/connections.html')
+
+
+class PeopleYouMayKnowTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.alice = User.objects.create_user(username='alice', password='pass123')
+        self.bob = User.objects.create_user(username='bob', password='pass123')
+        self.carol = User.objects.create_user(username='carol', password='pass123')
+        self.dave = User.objects.create_user(username='dave', password='pass123')
+        self.erin = User.objects.create_user(username='erin', password='pass123')
+
+        # alice berteman dengan bob & dave, keduanya berteman dengan carol
+        Connection.objects.create(from_user=self.alice, to_user=self.bob, status='accepted')
+        Connection.objects.create(from_user=self.dave, to_user=self.alice, status='accepted')
+        Connection.objects.create(from_user=self.bob, to_user=self.carol, status='accepted')
+        Connection.objects.create(from_user=self.carol, to_user=self.dave, status='accepted')
+        # erin teman bob, tapi alice sudah mengirim request ke erin
+        Connection.objects.create(from_user=self.bob, to_user=self.erin, status='accepted')
+        Connection.objects.create(from_user=self.alice, to_user=self.erin, status='pending')
+
+    def test_mutual_counts_exclude_friends_and_pending(self):
+        """Friend-of-friend dihitung mutual-nya, teman & request pending tidak direkomendasikan"""
+        from partner_matching.graph import people_you_may_know
+        self.assertEqual(people_you_may_know(self.alice.id), [(self.carol.id, 2)])
+
+    def test_people_you_may_know_api(self):
+        self.client.login(username='alice', password='pass123')
+        url = reverse('partner_matching:people_you_may_know_api')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['people_you_may_know']
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['username'], 'carol')
+        self.assertEqual(data[0]['mutual_friends'], 2)
+
+    def test_query_count_does_not_grow_with_graph(self):
+        """Jumlah query tetap konstan walaupun jumlah teman bertambah"""
+        from partner_matching.graph import people_you_may_know
+        for i in range(10):
+            friend = User.objects.create_user(username=f'friend{i}', password='pass123')
+            Connection.objects.create(from_user=self.alice, to_user=friend, status='accepted')
+            Connection.objects.create(from_user=friend, to_user=self.carol, status='accepted')
+
+        with self.assertNumQueries(2):
+            suggestions = people_you_may_know(self.alice.id)
+        self.assertEqual(suggestions[0], (self.carol.id, 12))
+
+
+class BrowseUserSearchTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.viewer = User.objects.create_user(username='viewer', password='pass123')
+        for i in range(7):
+            user = User.objects.create_user(username=f'runner{i}', password='pass123')
+            profile = user.profile
+            profile.full_name = f'José Runner {i}'
+            profile.city = 'depok'
+            profile.save()
+            SportPreference.objects.create(user=user, sport_type='running', skill_level='beginner')
+            SportPreference.objects.create(user=user, sport_type='tennis', skill_level='advanced')
+        self.client.login(username='viewer', password='pass123')
+        self.url = reverse('partner_matching:browse_user_api')
+
+    def test_search_key_is_normalized(self):
+        profile = User.objects.get(username='runner1').profile
+        self.assertEqual(profile.search_key, 'runner1 jose runner 1')
+
+    def test_search_key_follows_username_change(self):
+        user = User.objects.get(username='runner1')
+        user.username = 'sprinter1'
+        user.save(update_fields=['username'])
+        self.assertEqual(UserProfile.objects.get(user=user).search_key, 'sprinter1 jose runner 1')
+
+        response = self.client.get(self.url, {'search': 'sprinter1'})
+        self.assertEqual([u['username'] for u in response.json()['users']], ['sprinter1'])
+
+    def test_search_matches_normalized_full_name(self):
+        response = self.client.get(self.url, {'search': 'JOSE runner 3'})
+        usernames = [u['username'] for u in response.json()['users']]
+        self.assertEqual(usernames, ['runner3'])
+
+    def test_pagination_and_page_size_cap(self):
+        first = self.client.get(self.url, {'page_size': 5}).json()
+        self.assertEqual(len(first['users']), 5)
+        self.assertTrue(first['has_next'])
+
+        second = self.client.get(self.url, {'page_size': 5, 'page': 2}).json()
+        self.assertEqual(len(second['users']), 2)
+        self.assertFalse(second['has_next'])
+
+        capped = self.client.get(self.url, {'page_size': 1000}).json()
+        self.assertEqual(capped['page_size'], 50)
+
+    def test_sport_filter_without_duplicates(self):
+        response = self.client.get(self.url, {'sport': 'running', 'skill': 'advanced'})
+        users = response.json()['users']
+        self.assertEqual(len(users), 7)
+        self.assertEqual(len({u['id'] for u in users}), 7)
+        self.assertEqual(users[0]['sports'], 'running, tennis')
+
+    def test_query_count_is_constant(self):
+        # session + user auth + users page + prefetch sport preferences + connection statuses
+        with self.assertNumQueries(5):
+            self.client.get(self.url, {'sport': 'running'})
+
+
+class ConnectionStatusesApiTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.alice = User.objects.create_user(username='alice', password='pass123')
+        self.others = [User.objects.create_user(username=f'user{i}', password='pass123') for i in range(5)]
+        Connection.objects.create(from_user=self.alice, to_user=self.others[0], status='accepted')
+        Connection.objects.create(from_user=self.alice, to_user=self.others[1], status='pending')
+        Connection.objects.create(from_user=self.others[2], to_user=self.alice, status='pending')
+        Connection.objects.create(from_user=self.others[3], to_user=self.alice, status='rejected')
+        self.client.login(username='alice', password='pass123')
+        self.url = reverse('partner_matching:connection_statuses_api')
+
+    def test_statuses_for_many_users(self):
+        ids = ','.join(str(u.id) for u in self.others)
+        response = self.client.get(self.url, {'ids': ids})
+        self.assertEqual(response.status_code, 200)
+        statuses = response.json()['statuses']
+        self.assertEqual(statuses, {
+            str(self.others[0].id): 'accepted',
+            str(self.others[1].id): 'pending_sent',
+            str(self.others[2].id): 'pending_received',
+            str(self.others[3].id): 'none',
+            str(self.others[4].id): 'none',
+        })
+
+    def test_single_connection_query(self):
+        from partner_matching.graph import get_connection_statuses
+        with self.assertNumQueries(1):
+            get_connection_statuses(self.alice.id, [u.id for u in self.others])
+
+    def test_invalid_ids(self):
+        response = self.client.get(self.url, {'ids': '1,abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_profile_detail_api_uses_same_status(self):
+        url = reverse('partner_matching:user_profile_detail_api', args=[self.others[2].id])
+        response = self.client.get(url)
+        self.assertEqual(response.json()['data']['connection_status'], 'pending_received')
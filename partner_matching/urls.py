@@ -26,6 +26,8 @@ urlpatterns = [
     path('connection/<str:action>/user/<int:user_id>/', views.connection_action_by_user, name='connection_action_by_user'),
 
     path('connections/api/', views.connections_api, name='connections_api'),
+    path('connections/api/people-you-may-know/', views.people_you_may_know_api, name='people_you_may_know_api'),
+    path('connections/api/statuses/', views.connection_statuses_api, name='connection_statuses_api'),
     path('profile/<int:user_id>/connections/api/', views.public_connections_api, name='public_connections_api'),
 
     path('filter-options-api/', views.get_filter_options_api, name='filter_options_api'),
@@ -1,13 +1,16 @@
 from django.shortcuts import get_object_or_404, render
 from sigma_app.constants import CITY_CHOICES, SPORT_CHOICES, SKILL_CHOICES
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Prefetch, Q
 from django.contrib.auth.models import User
 
-from authentication.models import UserProfile, SportPreference
+from authentication.models import UserProfile, SportPreference, normalize_search_text
 from django.forms.models import model_to_dict
-from django.http import JsonResponse
+from sigma_app.json_response import JsonResponse
 from django.contrib.auth.decorators import login_required
 from .models import Connection
+from .graph import get_connection_statuses, people_you_may_know
+from sigma_app.conditional import ResourceStamp, conditional_json, latest, queryset_stamp
+from sigma_app.response_cache import cache_response
 
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
@@ -15,60 +18,87 @@ import json
 
 from django.template.loader import render_to_string
 
+# Batas ukuran halaman untuk browse_user_ajax (hard cap supaya response tetap kecil)
+BROWSE_DEFAULT_PAGE_SIZE = 24
+BROWSE_MAX_PAGE_SIZE = 50
+
+# Umur response cache (detik). Opsi filter hanya berubah saat deploy (konstanta)
+FILTER_OPTIONS_CACHE_TIMEOUT = 60 * 60 * 24
+PUBLIC_CONNECTIONS_CACHE_TIMEOUT = 60 * 10
+
+
+def _get_int_param(request, name, default, minimum=1, maximum=None):
+    try:
+        value = int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    value = max(value, minimum)
+    if maximum is not None:
+        value = min(value, maximum)
+    return value
+
+
 def browse_user_ajax(request):
+    page = _get_int_param(request, 'page', 1)
+    page_size = _get_int_param(request, 'page_size', BROWSE_DEFAULT_PAGE_SIZE, maximum=BROWSE_MAX_PAGE_SIZE)
 
-    users_query = User.objects.exclude(pk=request.user.pk).select_related('profile').prefetch_related('sport_preferences')
+    users_query = User.objects.exclude(pk=request.user.pk).filter(profile__isnull=False).select_related('profile')
 
-    search_query = request.GET.get('search', '')
+    # pencarian memakai kolom search_key yang sudah ternormalisasi (ter-index),
+    # bukan icontains pada username/full_name
+    search_query = normalize_search_text(request.GET.get('search', ''))
     if search_query:
-        users_query = users_query.filter(
-            Q(username__icontains=search_query) |
-            Q(profile__full_name__icontains=search_query)
-        )
+        users_query = users_query.filter(profile__search_key__contains=search_query)
 
     city_filter = request.GET.get('city')
     if city_filter:
         users_query = users_query.filter(profile__city=city_filter)
-    
+
+    # filter sport/skill pakai EXISTS supaya tidak perlu join + distinct()
     sport_filter = request.GET.get('sport')
     if sport_filter:
-        users_query = users_query.filter(sport_preferences__sport_type=sport_filter)
-    
+        users_query = users_query.filter(Exists(
+            SportPreference.objects.filter(user=OuterRef('pk'), sport_type=sport_filter)
+        ))
+
     skill_filter = request.GET.get('skill')
     if skill_filter:
-        users_query = users_query.filter(sport_preferences__skill_level=skill_filter)
-
-    users_query = users_query.distinct()
+        users_query = users_query.filter(Exists(
+            SportPreference.objects.filter(user=OuterRef('pk'), skill_level=skill_filter)
+        ))
+
+    # ambil satu baris ekstra untuk tahu apakah masih ada halaman berikutnya (tanpa COUNT)
+    offset = (page - 1) * page_size
+    page_users = list(
+        users_query.order_by('id').prefetch_related(
+            Prefetch('sport_preferences', queryset=SportPreference.objects.only('id', 'user_id', 'sport_type'))
+        )[offset:offset + page_size + 1]
+    )
+    has_next = len(page_users) > page_size
+    page_users = page_users[:page_size]
+
+    # status koneksi untuk semua kartu di halaman ini, cukup satu query
+    connection_statuses = {}
+    if request.user.is_authenticated:
+        connection_statuses = get_connection_statuses(request.user.id, [user.id for user in page_users])
 
     users_list = []
 
     DEFAULT_AVATAR = 'https://ui-avatars.com/api/?background=F26419&color=fff&size=96&name='
 
-    for user in users_query:
-        profile = getattr(user, 'profile', None)
-        if not profile:
-            continue
-        
+    for user in page_users:
+        profile = user.profile
+
         sport_preferences = user.sport_preferences.all()
         sport_display = ", ".join([sp.sport_type for sp in sport_preferences]) if sport_preferences else "No Sports"
-        
-        profile_picture_url = ''
-        
-        # cek field yang ada di UserProfile 
-        if hasattr(profile, 'profile_image_url') and profile.profile_image_url:
-            # jika menggunakan URL field
+
+        if profile.profile_image_url:
             profile_picture_url = profile.profile_image_url
-        elif hasattr(profile, 'photo') and profile.photo:
-            # jika menggunakan ImageField
-            try:
-                profile_picture_url = profile.photo.url
-            except:
-                profile_picture_url = ''
         else:
             # fallback ke default avatar
             user_name = profile.full_name or user.username
             profile_picture_url = f"{DEFAULT_AVATAR}{user_name.replace(' ', '+')}"
-        
+
         users_list.append({
             'id': user.id,
             'username': user.username,
@@ -76,9 +106,15 @@ def browse_user_ajax(request):
             'city': profile.city,
             'profile_picture_url': profile_picture_url,
             'sports': sport_display,
+            'connection_status': connection_statuses.get(user.id, 'none'),
         })
 
-    return JsonResponse({'users': users_list})
+    return JsonResponse({
+        'users': users_list,
+        'page': page,
+        'page_size': page_size,
+        'has_next': has_next,
+    })
 
 @login_required
 def browse_user(request):
@@ -436,7 +472,23 @@ def connection_action_by_user(request, action, user_id):
         print(f"Error in connection_action_by_user: {e}")
         return JsonResponse({'success': False, 'error': str(e)})
 
+def connections_stamp(request):
+    """
+    Versi data connections_api: koneksi milik user (teman & request) ditambah semua
+    UserProfile, karena rekomendasi bergantung pada profil & sport preference user lain.
+    """
+    connections_modified, connections_total = queryset_stamp(
+        Connection.objects.filter(Q(from_user=request.user) | Q(to_user=request.user))
+    )
+    profiles_modified, profiles_total = queryset_stamp(UserProfile.objects.all())
+    return ResourceStamp(
+        parts=(request.user.id, connections_modified, connections_total, profiles_modified, profiles_total),
+        last_modified=latest(connections_modified, profiles_modified),
+    )
+
+
 @login_required
+@conditional_json(connections_stamp)
 def connections_api(request):
     try:
         friends_who_sent_to_me = User.objects.filter(
@@ -523,6 +575,70 @@ def connections_api(request):
         print(f"Error in connections_api: {e}")
         return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
     
+@login_required
+def people_you_may_know_api(request):
+    """Rekomendasi user berdasarkan mutual connections (friend-of-friend)."""
+    limit = _get_int_param(request, 'limit', 20, maximum=50)
+
+    suggestions = people_you_may_know(request.user.id, limit=limit)
+    mutual_counts = dict(suggestions)
+
+    # ambil semua user kandidat sekaligus (profile + sport preferences di-prefetch)
+    users = User.objects.filter(id__in=mutual_counts.keys()).select_related('profile').prefetch_related('sport_preferences')
+    users_by_id = {user.id: user for user in users}
+
+    suggestions_data = []
+    for user_id, mutual_count in suggestions:
+        user = users_by_id.get(user_id)
+        if not user:
+            continue
+        profile = getattr(user, 'profile', None)
+        suggestions_data.append({
+            'id': user.id,
+            'username': user.username,
+            'full_name': profile.full_name if profile else user.username,
+            'city': profile.city if profile else 'Unknown',
+            'profile_picture_url': (profile.profile_image_url if profile and profile.profile_image_url else '/static/images/default-avatar.png'),
+            'sports': [sp.sport_type for sp in user.sport_preferences.all()],
+            'mutual_friends': mutual_count,
+        })
+
+    return JsonResponse({
+        'status': 'success',
+        'people_you_may_know': suggestions_data,
+    })
+
+# Batas jumlah user per request untuk connection_statuses_api
+MAX_STATUS_IDS = 200
+
+
+@login_required
+def connection_statuses_api(request):
+    """
+    Status koneksi (accepted / pending_sent / pending_received / none) untuk banyak user
+    sekaligus. Dipakai halaman browse & profile supaya tidak perlu satu request per kartu.
+
+    Query Parameters:
+        ids (str): daftar user id dipisah koma, contoh ?ids=1,2,3 (maksimal 200)
+    """
+    raw_ids = request.GET.get('ids', '')
+    try:
+        user_ids = {int(value) for value in raw_ids.split(',') if value.strip()}
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'ids must be a comma separated list of integers'}, status=400)
+
+    if len(user_ids) > MAX_STATUS_IDS:
+        return JsonResponse({'status': 'error', 'message': f'Maximum {MAX_STATUS_IDS} ids per request'}, status=400)
+
+    user_ids.discard(request.user.id)
+    statuses = get_connection_statuses(request.user.id, user_ids)
+
+    return JsonResponse({
+        'status': 'success',
+        'statuses': {str(user_id): status for user_id, status in statuses.items()},
+    })
+
+@cache_response(timeout=FILTER_OPTIONS_CACHE_TIMEOUT)
 def get_filter_options_api(request):
     def map_choices(choices):
         return [{'value': key, 'label': label} for key, label in choices]
@@ -557,32 +673,7 @@ def user_profile_detail_api(request, user_id):
             'skill_level': sp.skill_level,
         })
 
-    connection_status = 'none'
-
-    is_friends = Connection.objects.filter(
-        Q(from_user=request.user, to_user=target_user, status='accepted') |
-        Q(from_user=target_user, to_user=request.user, status='accepted')
-    ).exists()
-
-    if is_friends:
-        connection_status = 'accepted'
-    else:
-        sent_request = Connection.objects.filter(
-            from_user=request.user,
-            to_user=target_user,
-            status='pending'
-        ).exists()
-
-        received_request = Connection.objects.filter(
-            from_user=target_user,
-            to_user=request.user,
-            status='pending'
-        ).exists()
-
-        if sent_request:
-            connection_status = 'pending_sent'
-        elif received_request:
-            connection_status = 'pending_received'
+    connection_status = get_connection_statuses(request.user.id, [target_user.id])[target_user.id]
 
     pic_url = '/static/images/default-avatar.png'
     if hasattr(target_profile, 'profile_image') and target_profile.profile_image:
@@ -608,7 +699,9 @@ def user_profile_detail_api(request, user_id):
 
     return JsonResponse(data)
 
+# Isi response sama untuk semua user yang login (key memakai path yang berisi user_id)
 @login_required
+@cache_response(tags=['connections'], timeout=PUBLIC_CONNECTIONS_CACHE_TIMEOUT)
 def public_connections_api(request, user_id):
     """API endpoint to fetch public connections for a specific user"""
     target_user = get_object_or_404(User, id=user_id)
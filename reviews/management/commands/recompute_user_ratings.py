@@ -0,0 +1,69 @@
+# reviews/management/commands/recompute_user_ratings.py
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.models import Review, UserRating
+from reviews.views import USER_RATING_FIELDS, fill_user_rating, rating_stats_by_user
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute UserRating (average, total, star distribution) for all users from Review records. "
+        "Dipakai untuk memperbaiki drift dari update incremental."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            dest='username',
+            help="Hanya recompute rating milik username ini",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Jumlah baris per bulk_update / bulk_create (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS("Starting to recompute user ratings..."))
+        batch_size = options['batch_size']
+
+        users = User.objects.all()
+        reviews = Review.objects.all()
+        if options['username']:
+            users = users.filter(username=options['username'])
+            reviews = reviews.filter(to_user__username=options['username'])
+
+        # Satu query agregat untuk semua user: total, jumlah nilai, dan jumlah per bintang
+        stats = rating_stats_by_user(reviews)
+
+        existing = UserRating.objects.filter(user__in=users).in_bulk(field_name='user_id')
+        compare_fields = USER_RATING_FIELDS[:-1]  # tanpa last_updated
+        now = timezone.now()
+
+        to_update = []
+        to_create = []
+        for user_id in users.values_list('id', flat=True).iterator():
+            user_rating = existing.get(user_id) or UserRating(user_id=user_id)
+            old_values = [getattr(user_rating, field) for field in compare_fields]
+            fill_user_rating(user_rating, stats.get(user_id, {}))
+            user_rating.last_updated = now
+
+            if user_rating.pk is None:
+                to_create.append(user_rating)
+            elif [getattr(user_rating, field) for field in compare_fields] != old_values:
+                to_update.append(user_rating)
+
+        with transaction.atomic():
+            UserRating.objects.bulk_create(to_create, batch_size=batch_size)
+            UserRating.objects.bulk_update(to_update, USER_RATING_FIELDS, batch_size=batch_size)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nDone! Created {len(to_create)} and updated {len(to_update)} user ratings."
+            )
+        )
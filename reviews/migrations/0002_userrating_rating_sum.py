@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:57
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_rating_sum(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    UserRating = apps.get_model('reviews', 'UserRating')
+
+    sums = dict(Review.objects.values('to_user_id').annotate(total=Sum('rating')).values_list('to_user_id', 'total'))
+    ratings = list(UserRating.objects.all())
+    for user_rating in ratings:
+        user_rating.rating_sum = sums.get(user_rating.user_id) or 0
+    UserRating.objects.bulk_update(ratings, ['rating_sum'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userrating',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sum, migrations.RunPython.noop),
+    ]
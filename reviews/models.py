@@ -44,6 +44,9 @@ class UserRating(models.Model):
     # Total review yang diterima
     total_reviews = models.IntegerField(default=0)
 
+    # Jumlah semua nilai rating (running sum), dipakai untuk update rata-rata secara incremental
+    rating_sum = models.IntegerField(default=0)
+
     # Jumlah review per bintang
     five_star = models.IntegerField(default=0)
     four_star = models.IntegerField(default=0)
@@ -133,3 +133,174 @@ class RatingCalculationTest(BaseReviewTestCase):
         self.assertEqual(rating.total_reviews, 2)
         self.assertEqual(rating.four_star, 1)
         self.assertEqual(rating.two_star, 1)
+
+
+class IncrementalRatingTest(BaseReviewTestCase):
+    def test_create_edit_delete_keep_rating_consistent(self):
+        self.client.force_login(self.author)
+        url = reverse('reviews:ajax-create-event-reviews', args=[self.event.id])
+        self.client.post(url, {f"rating_{self.target.id}": 5})
+
+        rating = UserRating.objects.get(user=self.target)
+        self.assertEqual(rating.total_reviews, 1)
+        self.assertEqual(rating.rating_sum, 5)
+        self.assertEqual(float(rating.average_rating), 5.0)
+
+        review = Review.objects.get(to_user=self.target)
+        self.client.post(reverse('reviews:edit-review', args=[review.id]), {"rating": 2, "comment": "OK"})
+        rating.refresh_from_db()
+        self.assertEqual(rating.five_star, 0)
+        self.assertEqual(rating.two_star, 1)
+        self.assertEqual(float(rating.average_rating), 2.0)
+
+        self.client.post(reverse('reviews:ajax_delete_review', args=[review.id]))
+        rating.refresh_from_db()
+        self.assertEqual(rating.total_reviews, 0)
+        self.assertEqual(rating.rating_sum, 0)
+        self.assertEqual(float(rating.average_rating), 0.0)
+
+    def test_delta_matches_full_recompute(self):
+        from reviews.views import apply_rating_change, update_user_rating
+        Review.objects.create(event=self.event, from_user=self.author, to_user=self.target, rating=4, comment="Nice")
+        update_user_rating(self.target)
+
+        Review.objects.create(event=self.event, from_user=self.other, to_user=self.target, rating=1, comment="Bad")
+        apply_rating_change(self.target, added=1)
+        incremental = UserRating.objects.get(user=self.target)
+
+        update_user_rating(self.target)
+        full = UserRating.objects.get(user=self.target)
+        self.assertEqual(incremental.average_rating, full.average_rating)
+        self.assertEqual(float(full.average_rating), 2.5)
+        self.assertEqual(incremental.rating_sum, full.rating_sum)
+
+    def test_delta_does_not_scan_reviews(self):
+        from reviews.views import apply_rating_change, update_user_rating
+        for index, rating_value in enumerate((5, 4, 3)):
+            reviewer = User.objects.create_user(username=f"reviewer{index}", password="123")
+            Review.objects.create(event=self.event, from_user=reviewer, to_user=self.target, rating=rating_value, comment="x")
+        update_user_rating(self.target)
+
+        # select_for_update + save, tidak tergantung jumlah review
+        with self.assertNumQueries(2):
+            apply_rating_change(self.target, added=5)
+
+
+class RecomputeUserRatingsCommandTest(BaseReviewTestCase):
+    def test_command_repairs_drift(self):
+        from django.core.management import call_command
+        from io import StringIO
+        Review.objects.create(event=self.event, from_user=self.author, to_user=self.target, rating=4, comment="Nice")
+        Review.objects.create(event=self.event, from_user=self.other, to_user=self.target, rating=5, comment="Great")
+        UserRating.objects.create(user=self.target, total_reviews=7, rating_sum=1, average_rating=1)
+
+        call_command('recompute_user_ratings', stdout=StringIO())
+
+        rating = UserRating.objects.get(user=self.target)
+        self.assertEqual(rating.total_reviews, 2)
+        self.assertEqual(rating.rating_sum, 9)
+        self.assertEqual(float(rating.average_rating), 4.5)
+        self.assertEqual(rating.five_star, 1)
+        self.assertEqual(UserRating.objects.get(user=self.author).total_reviews, 0)
+
+
+class BulkReviewSubmissionTest(BaseReviewTestCase):
+    def _add_attendees(self, count, prefix):
+        attendees = []
+        for index in range(count):
+            user = User.objects.create_user(username=f"{prefix}{index}", password="123")
+            EventParticipant.objects.create(event=self.event, user=user, status="attended")
+            attendees.append(user)
+        return attendees
+
+    def _submit(self, attendees, rating=5):
+        url = reverse('reviews:ajax-create-event-reviews', args=[self.event.id])
+        return self.client.post(url, {f"rating_{user.id}": rating for user in attendees})
+
+    def test_bulk_submit_applies_ratings_and_points(self):
+        attendees = [self.target] + self._add_attendees(2, "bulk")
+        self.client.force_login(self.author)
+
+        res = self._submit(attendees)
+        data = res.json()
+        self.assertTrue(data['ok'])
+        self.assertEqual(len(data['created']), 3)
+        self.assertEqual(Review.objects.filter(from_user=self.author).count(), 3)
+
+        for user in attendees:
+            rating = UserRating.objects.get(user=user)
+            self.assertEqual(rating.total_reviews, 1)
+            self.assertEqual(rating.five_star, 1)
+            user.profile.refresh_from_db()
+            self.assertEqual(user.profile.total_points, 10)
+
+        # 5 poin per review yang diberikan
+        self.author.profile.refresh_from_db()
+        self.assertEqual(
+            self.author.point_transactions.filter(activity_type='review_given').count(), 3
+        )
+        self.assertEqual(self.author.profile.total_points, 15)
+
+    def test_invalid_rating_skips_without_partial_insert(self):
+        attendees = self._add_attendees(2, "bad")
+        self.client.force_login(self.author)
+        url = reverse('reviews:ajax-create-event-reviews', args=[self.event.id])
+        res = self.client.post(url, {
+            f"rating_{attendees[0].id}": 4,
+            f"rating_{attendees[1].id}": 9,
+        })
+        data = res.json()
+        self.assertEqual(len(data['created']), 1)
+        self.assertIn(attendees[1].id, data['skipped'])
+        self.assertIn(self.target.id, data['skipped'])
+
+    def test_query_count_is_bounded(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.force_login(self.author)
+        small = self._add_attendees(2, "small")
+        with CaptureQueriesContext(connection) as small_ctx:
+            self._submit(small)
+
+        # Event kedua dengan peserta lebih banyak, query tidak boleh bertambah
+        self.event.pk = None
+        self.event.save()
+        large = self._add_attendees(8, "large")
+        with CaptureQueriesContext(connection) as large_ctx:
+            self._submit(large)
+
+        self.assertEqual(Review.objects.filter(event=self.event).count(), 8)
+        self.assertEqual(len(small_ctx.captured_queries), len(large_ctx.captured_queries))
+
+    def test_highly_rated_achievement_awarded_in_bulk(self):
+        from leaderboard.models import Achievement
+        reviewers = self._add_attendees(10, "fan")
+        for reviewer in reviewers:
+            self.client.force_login(reviewer)
+            self._submit([self.target])
+
+        achievement = Achievement.objects.get(user=self.target, achievement_code='highly_rated')
+        self.assertEqual(achievement.bonus_points, 25)
+        # Bonus highly_rated ber-activity_type 'event_join', sehingga seperti jalur per-row
+        # target juga mendapat first_event (+5)
+        self.assertTrue(Achievement.objects.filter(user=self.target, achievement_code='first_event').exists())
+        self.target.profile.refresh_from_db()
+        self.assertEqual(self.target.profile.total_points, 10 * 10 + 25 + 5)
+
+
+class ReviewListPaginationTest(BaseReviewTestCase):
+    def test_user_reviews_paginated(self):
+        from reviews.views import REVIEWS_PAGE_SIZE
+        for index in range(REVIEWS_PAGE_SIZE + 2):
+            reviewer = User.objects.create_user(username=f"page{index}", password="123")
+            Review.objects.create(event=self.event, from_user=reviewer, to_user=self.target, rating=4, comment=f"c{index}")
+
+        self.client.force_login(self.other)
+        url = reverse('reviews:user-reviews', args=[self.target.id])
+        first = self.client.get(url)
+        self.assertEqual(len(first.context['reviews']), REVIEWS_PAGE_SIZE)
+        self.assertContains(first, "Page 1 of 2")
+
+        second = self.client.get(url, {'page': 2})
+        self.assertEqual(len(second.context['reviews']), 2)
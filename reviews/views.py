@@ -4,40 +4,250 @@ from django.contrib import messages
 from django.contrib.auth.models import User
 from .models import Review, UserRating
 from event_discovery.models import Event
-from django.db.models import Avg, Count
-from django.http import JsonResponse
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+from leaderboard.signals import award_review_points_bulk
+from authentication.counters import adjust_profile_counter
+from authentication.profile_summary import invalidate_profile_summary
+from django.core.paginator import Paginator
+from sigma_app.json_response import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
 # --- Helper Function ---
+
+# Jumlah review per halaman di daftar review lengkap (grid 3 kolom)
+REVIEWS_PAGE_SIZE = 12
+
+# Mapping nilai rating ke field distribusi bintang di UserRating
+STAR_FIELDS = {
+    1: 'one_star',
+    2: 'two_star',
+    3: 'three_star',
+    4: 'four_star',
+    5: 'five_star',
+}
+
+
+def _set_average(user_rating):
+    if user_rating.total_reviews > 0:
+        average = Decimal(user_rating.rating_sum) / user_rating.total_reviews
+        user_rating.average_rating = average.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    else:
+        user_rating.average_rating = Decimal('0.00')
+
+
 def update_user_rating(user):
     """
-    Menghitung ulang rating rata-rata dan distribusi bintang user.
+    Menghitung ulang rating rata-rata dan distribusi bintang user dari semua Review.
+    Dipakai untuk repair (lihat command recompute_user_ratings); alur normal memakai
+    apply_rating_change yang hanya meng-update delta.
     """
     reviews = Review.objects.filter(to_user=user)
-    
-    # Hitung rata-rata
-    avg_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0
-    
+
     # Hitung jumlah per bintang
     # Menghasilkan output seperti: [{'rating': 5, 'count': 2}, {'rating': 4, 'count': 1}]
     star_counts = reviews.values('rating').annotate(count=Count('rating'))
-    
+
     # Konversi ke dictionary untuk akses cepat: {5: 2, 4: 1}
     star_map = {item['rating']: item['count'] for item in star_counts}
 
     user_rating, created = UserRating.objects.get_or_create(user=user)
-    user_rating.average_rating = avg_rating
-    user_rating.total_reviews = reviews.count()
+    user_rating.total_reviews = sum(star_map.values())
+    user_rating.rating_sum = sum(rating * count for rating, count in star_map.items())
+    _set_average(user_rating)
 
     # Set jumlah bintang
-    user_rating.one_star = star_map.get(1, 0)
-    user_rating.two_star = star_map.get(2, 0)
-    user_rating.three_star = star_map.get(3, 0)
-    user_rating.four_star = star_map.get(4, 0)
-    user_rating.five_star = star_map.get(5, 0)
+    for rating, field in STAR_FIELDS.items():
+        setattr(user_rating, field, star_map.get(rating, 0))
+
+    user_rating.save()
+
+
+def apply_rating_change(user, added=None, removed=None):
+    """
+    Update UserRating secara incremental setelah review dibuat, diedit, atau dihapus.
+
+    Harus dipanggil di dalam transaksi yang sama dengan penulisan Review, sesudah
+    review tersebut disimpan/dihapus.
+
+    Args:
+        user: User penerima review (to_user)
+        added (int, optional): rating baru yang ditambahkan (create / nilai baru saat edit)
+        removed (int, optional): rating lama yang dihapus (delete / nilai lama saat edit)
+    """
+    user_rating, created = UserRating.objects.select_for_update().get_or_create(user=user)
+
+    if created:
+        # Belum ada ringkasan sebelumnya, hitung penuh sekali (review baru sudah ikut terhitung)
+        update_user_rating(user)
+        return
+
+    if removed is not None:
+        user_rating.total_reviews -= 1
+        user_rating.rating_sum -= removed
+        setattr(user_rating, STAR_FIELDS[removed], getattr(user_rating, STAR_FIELDS[removed]) - 1)
+
+    if added is not None:
+        user_rating.total_reviews += 1
+        user_rating.rating_sum += added
+        setattr(user_rating, STAR_FIELDS[added], getattr(user_rating, STAR_FIELDS[added]) + 1)
 
+    _set_average(user_rating)
     user_rating.save()
 
+# Field UserRating yang di-update oleh jalur bulk
+USER_RATING_FIELDS = ['total_reviews', 'rating_sum', 'average_rating', *STAR_FIELDS.values(), 'last_updated']
+
+
+def rating_stats_by_user(reviews):
+    """
+    Agregat rating per penerima review dalam satu query.
+
+    Returns:
+        Dict {to_user_id: {'total_reviews', 'rating_sum', 'one_star', ..., 'five_star'}}
+    """
+    aggregates = {
+        'total_reviews': Count('id'),
+        'rating_sum': Sum('rating'),
+    }
+    for rating, field in STAR_FIELDS.items():
+        aggregates[field] = Count('id', filter=Q(rating=rating))
+
+    return {
+        row.pop('to_user_id'): row
+        for row in reviews.values('to_user_id').annotate(**aggregates)
+    }
+
+
+def fill_user_rating(user_rating, stats):
+    """Isi UserRating dari satu baris hasil rating_stats_by_user (dict kosong = belum ada review)."""
+    user_rating.total_reviews = stats.get('total_reviews', 0)
+    user_rating.rating_sum = stats.get('rating_sum') or 0
+    for field in STAR_FIELDS.values():
+        setattr(user_rating, field, stats.get(field, 0))
+    _set_average(user_rating)
+
+
+def apply_rating_changes_bulk(added_ratings):
+    """
+    Versi grouped dari apply_rating_change untuk banyak review baru sekaligus.
+    Jumlah query tetap, tidak tergantung jumlah penerima review.
+
+    Args:
+        added_ratings: Dict {to_user_id: [rating, ...]} berisi review yang baru disimpan
+    """
+    if not added_ratings:
+        return
+
+    existing = UserRating.objects.select_for_update().filter(
+        user_id__in=added_ratings
+    ).in_bulk(field_name='user_id')
+    now = timezone.now()
+
+    to_update = []
+    for user_id, user_rating in existing.items():
+        for rating in added_ratings[user_id]:
+            user_rating.total_reviews += 1
+            user_rating.rating_sum += rating
+            setattr(user_rating, STAR_FIELDS[rating], getattr(user_rating, STAR_FIELDS[rating]) + 1)
+        _set_average(user_rating)
+        user_rating.last_updated = now
+        to_update.append(user_rating)
+
+    # User yang belum punya ringkasan: hitung penuh (review baru sudah ikut terhitung)
+    missing_ids = set(added_ratings) - set(existing)
+    to_create = []
+    if missing_ids:
+        stats = rating_stats_by_user(Review.objects.filter(to_user_id__in=missing_ids))
+        for user_id in missing_ids:
+            user_rating = UserRating(user_id=user_id)
+            fill_user_rating(user_rating, stats.get(user_id, {}))
+            to_create.append(user_rating)
+
+    UserRating.objects.bulk_update(to_update, USER_RATING_FIELDS)
+    UserRating.objects.bulk_create(to_create)
+
+
+def parse_review_submissions(data, participants, existing_targets):
+    """
+    Validasi semua rating dari form sebelum ada review yang disimpan.
+
+    Args:
+        data: request.POST (field rating_<user_id> dan comment_<user_id>)
+        participants: Iterable User yang boleh direview
+        existing_targets: Set id user yang sudah direview (di-skip)
+
+    Returns:
+        Tuple (submissions, skipped_ids) dengan submissions berupa list
+        (to_user, rating, comment) yang valid.
+    """
+    submissions = []
+    skipped_ids = []
+
+    for to_user in participants:
+        rating = data.get(f'rating_{to_user.id}')
+
+        # Skip jika rating kosong atau user ini sudah pernah direview
+        if not rating or to_user.id in existing_targets:
+            skipped_ids.append(to_user.id)
+            continue
+
+        try:
+            rating_int = int(rating)
+        except ValueError:
+            skipped_ids.append(to_user.id)
+            continue
+        if rating_int not in STAR_FIELDS:
+            skipped_ids.append(to_user.id)
+            continue
+
+        comment = data.get(f'comment_{to_user.id}') or 'No comment'
+        submissions.append((to_user, rating_int, comment))
+
+    return submissions, skipped_ids
+
+
+def bulk_submit_reviews(event, from_user, submissions):
+    """
+    Simpan banyak review dengan satu bulk_create, lalu terapkan efek sampingnya
+    (UserRating dan poin/achievement) secara grouped di transaksi yang sama.
+
+    bulk_create tidak memicu post_save, jadi poin review diberikan lewat
+    award_review_points_bulk, bukan signal per review.
+
+    Returns:
+        List Review yang baru dibuat
+    """
+    if not submissions:
+        return []
+
+    with transaction.atomic():
+        reviews = Review.objects.bulk_create([
+            Review(event=event, from_user=from_user, to_user=to_user, rating=rating, comment=comment)
+            for to_user, rating, comment in submissions
+        ])
+
+        added_ratings = defaultdict(list)
+        for review in reviews:
+            added_ratings[review.to_user_id].append(review.rating)
+        apply_rating_changes_bulk(added_ratings)
+
+        award_review_points_bulk(reviews)
+
+        # bulk_create tidak memicu signal counter profil
+        adjust_profile_counter('reviews_given_count', {from_user.id: len(reviews)})
+        adjust_profile_counter('reviews_received_count', {
+            to_user_id: len(ratings) for to_user_id, ratings in added_ratings.items()
+        })
+
+        # bulk_create tidak memicu signal invalidasi cache profil
+        invalidate_profile_summary(from_user.id, *added_ratings)
+
+    return reviews
+
 # --- Views ---
 
 @login_required
@@ -53,7 +263,6 @@ def event_reviews(request, event_id):
 
     if request.method == 'POST':
         from_user = request.user
-        created_any = False
 
         # OPTIMASI: Ambil semua ID user yang SUDAH direview oleh user ini di event ini
         # untuk menghindari query DB di dalam loop (N+1 Problem)
@@ -62,34 +271,9 @@ def event_reviews(request, event_id):
             .values_list('to_user_id', flat=True)
         )
 
-        for to_user in participants:
-            # Skip jika user ini sudah pernah direview
-            if to_user.id in existing_review_targets:
-                continue
-
-            rating = request.POST.get(f"rating_{to_user.id}")
-            comment = request.POST.get(f"comment_{to_user.id}")
-
-            # Skip jika form kosong
-            if not rating:
-                continue
-
-            # Validasi Rating
-            try:
-                rating_int = int(rating)
-                if not (1 <= rating_int <= 5): continue
-            except ValueError:
-                continue
-
-            Review.objects.create(
-                event=event,
-                from_user=from_user,
-                to_user=to_user,
-                rating=rating_int,
-                comment=comment or "No comment"
-            )
-            update_user_rating(to_user)
-            created_any = True
+        # Validasi semua rating dulu, lalu simpan sekaligus
+        submissions, _ = parse_review_submissions(request.POST, participants, existing_review_targets)
+        created_any = bool(bulk_submit_reviews(event, from_user, submissions))
 
         if created_any:
             messages.success(request, "All reviews submitted successfully!")
@@ -108,22 +292,26 @@ def event_reviews(request, event_id):
 @login_required
 def user_reviews(request, user_id):
     user = get_object_or_404(User, id=user_id)
-    reviews = Review.objects.filter(to_user=user).select_related('from_user').order_by('-created_at')
+    reviews = Review.objects.filter(to_user=user).select_related('from_user', 'event').order_by('-created_at', '-id')
+    page_obj = Paginator(reviews, REVIEWS_PAGE_SIZE).get_page(request.GET.get('page'))
 
     return render(request, 'reviews/user_reviews.html', {
         'reviewed_user': user,
-        'reviews': reviews
+        'reviews': page_obj,
+        'page_obj': page_obj
     })
 
 
 @login_required
 def user_written_reviews(request, user_id):
     user = get_object_or_404(User, id=user_id)
-    reviews = Review.objects.filter(from_user=user).select_related('to_user', 'event').order_by('-created_at')
-    
+    reviews = Review.objects.filter(from_user=user).select_related('from_user', 'to_user', 'event').order_by('-created_at', '-id')
+    page_obj = Paginator(reviews, REVIEWS_PAGE_SIZE).get_page(request.GET.get('page'))
+
     return render(request, 'reviews/user_written_reviews.html', {
         'writer': user,
-        'reviews': reviews
+        'reviews': page_obj,
+        'page_obj': page_obj
     })
 
 
@@ -142,10 +330,12 @@ def edit_review(request, review_id):
 
         # Validasi sederhana
         if rating and rating.isdigit() and 1 <= int(rating) <= 5:
+            old_rating = review.rating
             review.rating = int(rating)
             review.comment = comment
-            review.save()
-            update_user_rating(review.to_user)
+            with transaction.atomic():
+                review.save()
+                apply_rating_change(review.to_user, added=review.rating, removed=old_rating)
             messages.success(request, "Review updated successfully!")
         else:
             messages.error(request, "Invalid rating provided.")
@@ -173,10 +363,15 @@ def ajax_update_review(request, review_id):
         comment = request.POST.get('comment', 'No comment')
 
         if rating:
-            review.rating = int(rating)
+            rating_int = int(rating)
+            if rating_int not in STAR_FIELDS:
+                raise ValueError("Rating must be between 1 and 5")
+            old_rating = review.rating
+            review.rating = rating_int
             review.comment = comment
-            review.save()
-            update_user_rating(review.to_user)
+            with transaction.atomic():
+                review.save()
+                apply_rating_change(review.to_user, added=rating_int, removed=old_rating)
             return JsonResponse({'ok': True})
             
     except Exception as e:
@@ -204,58 +399,24 @@ def ajax_create_event_reviews(request, event_id):
         joined_events__status='attended'
     ).exclude(id=from_user.id)
 
-    created_data = []
-    skipped_ids = []
-
     # OPTIMASI: Pre-fetch existing reviews untuk event & user ini
     existing_reviews = set(
         Review.objects.filter(event=event, from_user=from_user)
         .values_list('to_user_id', flat=True)
     )
 
-    for to_user in participants:
-        # Check field form
-        rating = request.POST.get(f'rating_{to_user.id}')
-        comment = request.POST.get(f'comment_{to_user.id}', 'No comment')
-
-        # Skip jika rating kosong
-        if not rating:
-            skipped_ids.append(to_user.id)
-            continue
+    # Validasi semua rating dulu, lalu simpan sekaligus (bulk_create + efek samping grouped)
+    submissions, skipped_ids = parse_review_submissions(request.POST, participants, existing_reviews)
+    reviews = bulk_submit_reviews(event, from_user, submissions)
 
-        # Skip jika sudah ada review (cegah duplikat)
-        if to_user.id in existing_reviews:
-            skipped_ids.append(to_user.id)
-            continue
-
-        try:
-            rating_int = int(rating)
-            if not (1 <= rating_int <= 5):
-                raise ValueError()
-        except ValueError:
-            skipped_ids.append(to_user.id)
-            continue
-
-        # Create Review
-        review = Review.objects.create(
-            event=event,
-            from_user=from_user,
-            to_user=to_user,
-            rating=rating_int,
-            comment=comment
-        )
-        
-        # Update statistic
-        update_user_rating(to_user)
-
-        created_data.append({
-            'id': review.id,
-            'to_user': to_user.username,
-            'rating': review.rating,
-            'comment': review.comment,
-            'event_title': event.title,
-            'created_at': review.created_at.strftime('%Y-%m-%d %H:%M')
-        })
+    created_data = [{
+        'id': review.id,
+        'to_user': review.to_user.username,
+        'rating': review.rating,
+        'comment': review.comment,
+        'event_title': event.title,
+        'created_at': review.created_at.strftime('%Y-%m-%d %H:%M')
+    } for review in reviews]
 
     return JsonResponse({'ok': True, 'created': created_data, 'skipped': skipped_ids})
 
@@ -346,8 +507,10 @@ def ajax_delete_review(request, review_id):
             return JsonResponse({'ok': False, 'error': "Forbidden"}, status=403)
         
         to_user = review.to_user
-        review.delete()
-        update_user_rating(to_user)
+        with transaction.atomic():
+            removed_rating = review.rating
+            review.delete()
+            apply_rating_change(to_user, removed=removed_rating)
         return JsonResponse({'ok': True})
     except Review.DoesNotExist:
         return JsonResponse({'ok': False, 'error': "Review not found"}, status=404)
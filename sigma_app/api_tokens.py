@@ -0,0 +1,94 @@
+"""
+Token stateless (signed) untuk API Flutter.
+
+flutter_login mengembalikan token selain cookie session. Klien yang mengirim header
+`Authorization: Bearer <token>` diautentikasi oleh ApiTokenMiddleware tanpa membaca
+tabel django_session: token ditandatangani dengan SECRET_KEY (django.core.signing) dan
+berisi id user serta hash password-nya, jadi hanya butuh satu query (ambil user).
+
+Token berlaku selama settings.API_TOKEN_MAX_AGE detik. Token otomatis tidak valid jika
+password user berubah atau user dinonaktifkan; selain itu token tidak bisa dicabut satu
+per satu (logout di klien cukup membuang token).
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core import signing
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+API_TOKEN_SALT = 'sigma_app.api_token'
+BEARER_PREFIX = 'Bearer '
+
+
+def issue_token(user):
+    """Buat token API untuk user yang sudah terautentikasi."""
+    return signing.dumps({'u': user.pk, 'h': user.get_session_auth_hash()}, salt=API_TOKEN_SALT)
+
+
+def user_from_token(token):
+    """User pemilik token, atau AnonymousUser jika token tidak valid / kedaluwarsa."""
+    try:
+        payload = signing.loads(token, salt=API_TOKEN_SALT, max_age=settings.API_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return AnonymousUser()
+
+    user = get_user_model()._default_manager.filter(pk=payload.get('u'), is_active=True).first()
+    if user is None or not constant_time_compare(payload.get('h', ''), user.get_session_auth_hash()):
+        return AnonymousUser()
+    return user
+
+
+def get_bearer_token(request):
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith(BEARER_PREFIX):
+        return header[len(BEARER_PREFIX):].strip() or None
+    return None
+
+
+class ApiTokenMiddleware:
+    """
+    Ganti request.user / request.auser dengan user dari token Bearer (jika ada).
+    Harus dipasang setelah AuthenticationMiddleware; session tidak pernah dibaca
+    untuk request yang memakai token.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.process_request(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        return await self.get_response(request)
+
+    def process_request(self, request):
+        token = get_bearer_token(request)
+        if token is None:
+            return
+
+        resolved = []
+
+        def get_user():
+            if not resolved:
+                resolved.append(user_from_token(token))
+            return resolved[0]
+
+        async def auser():
+            if resolved:
+                return resolved[0]
+            return await sync_to_async(get_user)()
+
+        request.user = SimpleLazyObject(get_user)
+        request.auser = auser
@@ -0,0 +1,21 @@
+"""
+App Configuration untuk sigma_app (modul bersama: middleware, cache, benchmark)
+"""
+
+from django.apps import AppConfig
+
+
+class SigmaAppConfig(AppConfig):
+    """
+    Konfigurasi aplikasi sigma_app.
+    Mengaktifkan signal invalidasi response cache (lihat response_cache.py).
+    """
+
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    # Nama aplikasi (harus sama dengan nama folder)
+    name = 'sigma_app'
+
+    def ready(self):
+        # Import signals agar receiver invalidasi tag response cache teregistrasi
+        import sigma_app.signals
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sigma_app.settings')
 
 application = get_asgi_application()
+
+# Event loop ASGI hidup selama worker berjalan, jadi httpx.AsyncClient per loop aman dipakai ulang
+from sigma_app.async_utils import enable_async_http_client  # noqa: E402
+
+enable_async_http_client()
@@ -0,0 +1,151 @@
+"""
+Helper untuk view async (ASGI): query database yang saling independen dan HTTP keluar.
+
+run_queries menjalankan beberapa fungsi sync (berisi query ORM) sekaligus. Jika
+settings.ASYNC_PARALLEL_QUERIES aktif, setiap fungsi berjalan di thread sendiri dengan
+koneksi database sendiri sehingga query benar-benar paralel (koneksi ditutup setelah
+selesai). Jika tidak aktif (default, termasuk SQLite dan test yang memakai transaksi),
+semua fungsi berjalan berurutan di thread request seperti ORM async biasa.
+
+fetch_url memakai httpx.AsyncClient dengan connection pool (satu client per event loop)
+hanya di server ASGI, yang event loop-nya hidup selama worker berjalan (diaktifkan oleh
+sigma_app/asgi.py lewat enable_async_http_client). Di WSGI setiap view async mendapat
+event loop baru, sehingga client per loop tidak pernah dipakai ulang maupun ditutup dan
+socket-nya bocor. Karena itu di WSGI (dan jika httpx tidak terpasang) request dijalankan
+dengan requests.Session ber-pool di thread terpisah supaya event loop tidak ter-block.
+"""
+
+import asyncio
+import weakref
+from dataclasses import dataclass
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - tergantung environment
+    httpx = None
+
+# Batas connection pool HTTP keluar (per worker)
+HTTP_POOL_CONNECTIONS = 20
+HTTP_POOL_MAXSIZE = 100
+HTTP_DEFAULT_TIMEOUT = 10
+
+
+def parallel_queries_enabled():
+    return getattr(settings, 'ASYNC_PARALLEL_QUERIES', False)
+
+
+def _in_own_connection(func):
+    """Bungkus func supaya koneksi database thread-nya ditutup setelah selesai."""
+    def wrapper():
+        try:
+            return func()
+        finally:
+            connections.close_all()
+    return wrapper
+
+
+async def run_queries(*funcs):
+    """
+    Jalankan fungsi-fungsi sync (tanpa argumen) dan kembalikan hasilnya sesuai urutan.
+
+    Contoh:
+        breakdown, rank = await run_queries(
+            lambda: get_points_breakdown(user),
+            lambda: get_user_rank(profile),
+        )
+    """
+    if parallel_queries_enabled():
+        return await asyncio.gather(*(
+            sync_to_async(_in_own_connection(func), thread_sensitive=False)() for func in funcs
+        ))
+    return [await sync_to_async(func)() for func in funcs]
+
+
+# ===== HTTP keluar =====
+
+
+class FetchError(Exception):
+    """Request HTTP keluar gagal (koneksi, timeout, atau status error)."""
+
+
+@dataclass
+class FetchResult:
+    status: int
+    content: bytes
+    content_type: str
+
+
+# httpx.AsyncClient terikat ke event loop tempat ia dibuat
+_async_clients = weakref.WeakKeyDictionary()
+_async_client_enabled = False
+_sync_session = None
+
+
+def enable_async_http_client():
+    """Pakai httpx.AsyncClient per event loop; hanya untuk server ASGI (loop berumur panjang)."""
+    global _async_client_enabled
+    _async_client_enabled = True
+
+
+def async_http_client_enabled():
+    return httpx is not None and _async_client_enabled
+
+
+def get_async_http_client():
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=HTTP_DEFAULT_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=HTTP_POOL_CONNECTIONS,
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def get_sync_http_session():
+    global _sync_session
+    if _sync_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _sync_session = session
+    return _sync_session
+
+
+def _fetch_sync(url, timeout):
+    try:
+        response = get_sync_http_session().get(url, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as error:
+        raise FetchError(str(error)) from error
+    return FetchResult(response.status_code, response.content, response.headers.get('Content-Type', ''))
+
+
+async def fetch_url(url, timeout=HTTP_DEFAULT_TIMEOUT):
+    """
+    GET url tanpa mem-block event loop.
+
+    Raises:
+        FetchError: Jika request gagal atau status bukan 2xx
+    """
+    if not async_http_client_enabled():
+        return await sync_to_async(_fetch_sync, thread_sensitive=False)(url, timeout)
+
+    try:
+        response = await get_async_http_client().get(url, timeout=timeout)
+        response.raise_for_status()
+    except httpx.HTTPError as error:
+        raise FetchError(str(error)) from error
+    return FetchResult(response.status_code, response.content, response.headers.get('Content-Type', ''))
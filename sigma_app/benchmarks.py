@@ -0,0 +1,339 @@
+"""
+Benchmark suite untuk endpoint-endpoint utama.
+
+Setiap endpoint di-request beberapa kali memakai django.test.Client (tanpa network),
+lalu dicatat median / p95 latency dan jumlah query. Hasil disimpan sebagai JSON
+(lihat command run_benchmarks) supaya bisa dibandingkan antar run.
+"""
+
+import copy
+import json
+import platform
+import statistics
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import django
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, connections
+from django.db.utils import load_backend
+from django.urls import reverse
+from django.utils import timezone
+
+from sigma_app.json_response import dumps_json, orjson
+from sigma_app.middleware import QueryStats
+
+
+# (nama benchmark, nama URL)
+BENCHMARK_ENDPOINTS = [
+    ('leaderboard', 'leaderboard:leaderboard'),
+    ('leaderboard_api', 'leaderboard:leaderboard_api'),
+    ('show_json', 'event_discovery:show_json'),
+    ('connections_api', 'partner_matching:connections_api'),
+    ('points_dashboard', 'leaderboard:points_dashboard'),
+    ('profile_view', 'authentication:profile'),
+]
+
+# Jumlah user sintetis per skala
+DEFAULT_SCALES = [100, 1000, 5000]
+
+# Accept-Encoding yang dikirim untuk mengukur ukuran response terkompresi (bytes on wire)
+BENCHMARK_ACCEPT_ENCODING = 'br, gzip'
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _response_size(response):
+    if response.streaming:
+        return len(b''.join(response.streaming_content))
+    return len(response.content)
+
+
+def time_endpoint(client, url, repeat=5):
+    """
+    Request satu URL sebanyak `repeat` kali (ditambah satu warm-up yang juga
+    dipakai untuk menghitung query), lalu satu request dengan Accept-Encoding untuk
+    mengukur ukuran response setelah kompresi.
+
+    Returns:
+        Dict {status, queries, min_ms, median_ms, p95_ms, bytes, wire_bytes, encoding}
+    """
+    # Hitung query lewat execute wrapper (queries_log DEBUG bisa penuh setelah generate data)
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for db_connection in connections.all():
+            stack.enter_context(db_connection.execute_wrapper(stats))
+        response = client.get(url)
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(url)
+        durations.append((time.perf_counter() - start) * 1000)
+
+    compressed = client.get(url, HTTP_ACCEPT_ENCODING=BENCHMARK_ACCEPT_ENCODING)
+
+    return {
+        'status': response.status_code,
+        'queries': stats.count,
+        'min_ms': round(min(durations), 2),
+        'median_ms': round(statistics.median(durations), 2),
+        'p95_ms': round(_percentile(durations, 95), 2),
+        'bytes': _response_size(response),
+        'wire_bytes': _response_size(compressed),
+        'encoding': compressed.get('Content-Encoding'),
+    }
+
+
+def run_endpoint_benchmarks(client, endpoints=BENCHMARK_ENDPOINTS, repeat=5):
+    """Jalankan time_endpoint untuk semua endpoint, return dict {nama: hasil}."""
+    return {
+        name: time_endpoint(client, reverse(url_name), repeat=repeat)
+        for name, url_name in endpoints
+    }
+
+
+def build_report(label, scales, repeat):
+    return {
+        'label': label,
+        'created_at': timezone.now().isoformat(),
+        'repeat': repeat,
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+        },
+        'scales': scales,
+    }
+
+
+def save_report(report, output_dir):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+    path = output_dir / f"benchmark-{stamp}-{report['label']}.json"
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def latest_report(output_dir, exclude=None):
+    """Path hasil benchmark terbaru di output_dir (selain `exclude`), None jika belum ada."""
+    paths = sorted(Path(output_dir).glob('benchmark-*.json'))
+    paths = [path for path in paths if exclude is None or path.resolve() != Path(exclude).resolve()]
+    return paths[-1] if paths else None
+
+
+def compare_reports(previous, current):
+    """
+    Bandingkan dua report.
+
+    Returns:
+        List baris (scale, endpoint, old_median, new_median, change_percent, old_queries, new_queries)
+        untuk endpoint yang ada di kedua report.
+    """
+    rows = []
+    for scale, data in current['scales'].items():
+        old_data = previous['scales'].get(scale)
+        if not old_data:
+            continue
+        for name, result in data['endpoints'].items():
+            old = old_data['endpoints'].get(name)
+            if not old:
+                continue
+            change = ((result['median_ms'] - old['median_ms']) / old['median_ms'] * 100) if old['median_ms'] else 0.0
+            rows.append((scale, name, old['median_ms'], result['median_ms'], round(change, 1),
+                         old['queries'], result['queries']))
+    return rows
+
+
+# ===== Micro-benchmark serialisasi JSON =====
+
+# Jumlah baris payload untuk micro-benchmark JSON
+DEFAULT_JSON_ROWS = [100, 1000, 10000]
+
+
+def build_json_payloads(rows):
+    """
+    Payload sintetis dengan bentuk yang sama seperti response API asli:
+    leaderboard_api (angka & string), show_json (UUID, date, time, datetime)
+    dan connections (list bersarang, Decimal rating).
+    """
+    now = timezone.now()
+    leaderboard = {
+        'success': True,
+        'users': [
+            {
+                'rank': index + 1,
+                'user_id': index,
+                'full_name': f"Pengguna Sigma {index}",
+                'username': f"user_{index}",
+                'total_points': 10000 - index,
+                'total_events': index % 50,
+                'city': 'Jakarta',
+                'profile_image_url': '/static/img/default-avatar.png',
+                'tier': 'Gold',
+                'badge': '🥇',
+            }
+            for index in range(rows)
+        ],
+        'total_count': rows,
+    }
+    events = [
+        {
+            'id': uuid.UUID(int=index),
+            'organizer': f"user_{index % 100}",
+            'title': f"Fun Run Minggu Pagi #{index}",
+            'description': 'Lari santai 5K bersama komunitas, terbuka untuk semua level.',
+            'sport_type': 'running',
+            'event_date': (now + timedelta(days=index % 30)).date(),
+            'start_time': (now + timedelta(minutes=index)).time(),
+            'end_time': (now + timedelta(minutes=index + 90)).time(),
+            'city': 'jakarta',
+            'max_participants': 20,
+            'current_participants': index % 20,
+            'status': 'open',
+            'created_at': now - timedelta(seconds=index),
+            'updated_at': now,
+        }
+        for index in range(rows)
+    ]
+    connections = {
+        'status': 'success',
+        'my_friends': [
+            {
+                'id': index,
+                'username': f"user_{index}",
+                'full_name': f"Pengguna Sigma {index}",
+                'city': 'bandung',
+                'average_rating': Decimal('4.50'),
+                'sports': ['running', 'football', 'badminton'][: index % 3 + 1],
+            }
+            for index in range(rows)
+        ],
+    }
+    return {'leaderboard': leaderboard, 'events': events, 'connections': connections}
+
+
+def _time_serializer(serialize, payload, repeat):
+    durations = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(serialize(payload))
+        durations.append(time.perf_counter() - start)
+    median = statistics.median(durations)
+    return {
+        'median_ms': round(median * 1000, 3),
+        'ops_per_s': round(1 / median, 1) if median else None,
+        'mb_per_s': round(size / median / 1_000_000, 1) if median else None,
+        'bytes': size,
+    }
+
+
+def run_json_benchmarks(rows=DEFAULT_JSON_ROWS, repeat=20):
+    """
+    Bandingkan json.dumps + DjangoJSONEncoder (django.http.JsonResponse) dengan
+    dumps_json (sigma_app.json_response) untuk setiap payload dan ukuran.
+
+    Returns:
+        Dict {rows: {payload: {'django': hasil, 'fast': hasil, 'speedup': float}}}
+    """
+    def django_dumps(payload):
+        return json.dumps(payload, cls=DjangoJSONEncoder).encode()
+
+    results = {}
+    for count in rows:
+        results[str(count)] = {}
+        for name, payload in build_json_payloads(count).items():
+            baseline = _time_serializer(django_dumps, payload, repeat)
+            fast = _time_serializer(dumps_json, payload, repeat)
+            results[str(count)][name] = {
+                'django': baseline,
+                'fast': fast,
+                'speedup': round(baseline['median_ms'] / fast['median_ms'], 1) if fast['median_ms'] else None,
+            }
+    return results
+
+
+def json_backend_name():
+    return f"orjson {orjson.__version__}" if orjson is not None else 'json (fallback)'
+
+
+# ===== Benchmark koneksi database (persistent / pool) =====
+
+
+def _connection_for_mode(alias, mode):
+    """
+    DatabaseWrapper terpisah dengan settings alias yang diubah sesuai mode:
+    'new_connection' (CONN_MAX_AGE=0), 'persistent' (CONN_MAX_AGE=600), 'pool' (psycopg pool).
+    """
+    settings_dict = copy.deepcopy(connections[alias].settings_dict)
+    options = settings_dict.setdefault('OPTIONS', {})
+    pool = options.pop('pool', None)
+    settings_dict['CONN_MAX_AGE'] = 600 if mode == 'persistent' else 0
+    if mode == 'pool':
+        options['pool'] = pool or True
+    backend = load_backend(settings_dict['ENGINE'])
+    # Alias berbeda per mode supaya pool tidak tercampur dengan pool koneksi asli
+    return backend.DatabaseWrapper(settings_dict, alias=f"{alias}_benchmark_{mode}")
+
+
+def connection_modes(alias='default'):
+    """Mode yang bisa diukur untuk alias ini (pool hanya untuk PostgreSQL + psycopg 3)."""
+    from sigma_app.db_config import psycopg3_available
+
+    modes = ['new_connection', 'persistent']
+    if connections[alias].vendor == 'postgresql' and psycopg3_available():
+        modes.append('pool')
+    return modes
+
+
+def time_connection_mode(alias, mode, requests=200, queries=3):
+    """
+    Simulasikan `requests` request berurutan, masing-masing menjalankan `queries` query
+    ringan, dengan penutupan koneksi di akhir request seperti handler Django
+    (close_if_unusable_or_obsolete dari signal request_finished).
+
+    Returns:
+        Dict {median_ms, p95_ms, connects}
+    """
+    db = _connection_for_mode(alias, mode)
+    durations = []
+    connects = 0
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            db.close_if_unusable_or_obsolete()
+            if db.connection is None:
+                connects += 1
+            with db.cursor() as cursor:
+                for _ in range(queries):
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+            db.close_if_unusable_or_obsolete()
+            durations.append((time.perf_counter() - start) * 1000)
+    finally:
+        db.close()
+        if mode == 'pool':
+            db.close_pool()
+
+    return {
+        'median_ms': round(statistics.median(durations), 3),
+        'p95_ms': round(_percentile(durations, 95), 3),
+        'connects': connects,
+    }
+
+
+def run_connection_benchmarks(alias='default', requests=200, queries=3):
+    return {
+        mode: time_connection_mode(alias, mode, requests=requests, queries=queries)
+        for mode in connection_modes(alias)
+    }
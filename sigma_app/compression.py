@@ -0,0 +1,184 @@
+"""
+Kompresi response dinamis (HTML dan JSON) dengan negosiasi Accept-Encoding.
+
+CompressionMiddleware memilih brotli jika klien menerimanya dan package brotli terpasang,
+selain itu gzip. Response yang dikompres hanya yang:
+- lebih besar dari settings.COMPRESSION_MIN_SIZE (response kecil tidak sepadan overhead-nya),
+- content type-nya berbasis teks (gambar hasil proxy_image sudah terkompresi),
+- belum punya Content-Encoding.
+
+Streaming response dikompres per chunk (compressor yang sama di-flush setiap chunk), jadi
+klien menerima data sedikit demi sedikit tanpa menunggu seluruh response.
+
+Middleware dipasang setelah WhiteNoiseMiddleware: file static dijawab WhiteNoise lebih dulu
+dengan varian .gz / .br yang sudah dibuat saat collectstatic, sehingga tidak dikompres ulang.
+"""
+
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - tergantung environment
+    brotli = None
+
+# Prefix content type yang layak dikompres
+COMPRESSIBLE_CONTENT_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+
+# Padding acak di header gzip (mitigasi BREACH, sama seperti GZipMiddleware Django)
+GZIP_MAX_RANDOM_BYTES = 100
+
+
+def parse_accept_encoding(header):
+    """
+    Accept-Encoding -> dict {encoding: q}.
+
+    Contoh: "gzip;q=0.8, br" -> {'gzip': 0.8, 'br': 1.0}
+    """
+    encodings = {}
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+
+def choose_encoding(header):
+    """Encoding terbaik yang didukung server dan klien: 'br', 'gzip', atau None."""
+    accepted = parse_accept_encoding(header or '')
+    wildcard = accepted.get('*', 0.0)
+    candidates = (['br'] if brotli is not None else []) + ['gzip']
+    best = None
+    best_quality = 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+
+def _brotli_quality():
+    # Quality 11 (default brotli) terlalu lambat untuk response dinamis
+    return getattr(settings, 'BROTLI_QUALITY', 4)
+
+
+def compress_content(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=_brotli_quality())
+    return compress_string(content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+
+
+def _stream_compressor(encoding):
+    """(compress_chunk, finish) untuk kompresi incremental."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=_brotli_quality())
+        return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+    # wbits 31 = format gzip (header + trailer CRC)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+
+def compress_stream(chunks, encoding):
+    if encoding == 'gzip':
+        yield from compress_sequence(chunks, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+        return
+    compress_chunk, finish = _stream_compressor(encoding)
+    for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def compress_async_stream(chunks, encoding):
+    compress_chunk, finish = _stream_compressor(encoding)
+    async for chunk in chunks:
+        data = compress_chunk(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+class CompressionMiddleware:
+    """
+    Kompres response dengan brotli / gzip sesuai Accept-Encoding klien.
+    Header Vary: Accept-Encoding selalu ditambahkan pada response yang bisa dikompres.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not is_compressible(response):
+            return response
+
+        min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            # Ukuran hasil kompresi baru diketahui setelah semua chunk dikirim
+            del response.headers['Content-Length']
+        else:
+            compressed = compress_content(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # ETag strong menjadi weak karena representasinya berubah (RFC 9110 8.8.1),
+        # If-None-Match tetap cocok karena perbandingan weak
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
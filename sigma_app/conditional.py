@@ -0,0 +1,134 @@
+"""
+HTTP conditional response (ETag / Last-Modified) untuk endpoint JSON yang sering di-poll.
+
+Setiap endpoint punya fungsi "stamp" yang murah (satu atau dua query aggregate MAX/COUNT)
+untuk menghitung versi data. Jika klien mengirim If-None-Match yang masih cocok,
+response 304 dikembalikan sebelum view menjalankan query dan serialisasi yang mahal.
+
+COUNT ikut masuk ke ETag supaya penghapusan baris (yang tidak mengubah MAX(updated_at))
+tetap menghasilkan versi baru. Last-Modified hanya berisi MAX(updated_at), jadi header itu
+dikirim sebagai informasi saja: If-Modified-Since / If-Unmodified-Since tidak pernah
+menghasilkan 304/412 karena akan basi setelah penghapusan.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+@dataclass
+class ResourceStamp:
+    """
+    Versi data sebuah response.
+
+    Args:
+        parts: Nilai-nilai yang menentukan isi response (di-hash menjadi ETag)
+        last_modified: Waktu perubahan terakhir (datetime aware) atau None
+        private: True jika response bergantung pada user yang login
+    """
+    parts: tuple
+    last_modified: datetime = None
+    private: bool = True
+
+    @property
+    def etag(self):
+        digest = hashlib.md5(repr(self.parts).encode(), usedforsecurity=False).hexdigest()
+        return quote_etag(digest)
+
+    @property
+    def last_modified_timestamp(self):
+        # Header Last-Modified hanya punya presisi detik
+        return int(self.last_modified.timestamp()) if self.last_modified else None
+
+
+def queryset_stamp(queryset, field='updated_at'):
+    """
+    (MAX(field), COUNT(*)) dari queryset dengan satu query aggregate.
+
+    Returns:
+        Tuple (datetime atau None, int)
+    """
+    result = queryset.order_by().aggregate(last=Max(field), total=Count('pk'))
+    return result['last'], result['total']
+
+
+def latest(*values):
+    """Nilai datetime terbaru (None diabaikan)."""
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def conditional_json(stamp_func):
+    """
+    Decorator untuk view JSON (GET/HEAD).
+
+    stamp_func(request, *args, **kwargs) mengembalikan ResourceStamp, atau None jika
+    conditional response tidak berlaku untuk request ini (misalnya belum login atau
+    resource tidak ada) sehingga view berjalan seperti biasa.
+
+    Response 200 diberi header ETag, Last-Modified, dan Cache-Control
+    ("private" + Vary: Cookie untuk data per user, "public" untuk data bersama).
+    no-cache berarti klien boleh menyimpan response tapi harus revalidate setiap kali.
+
+    Bisa dipakai untuk view sync maupun async.
+    """
+    def decorator(view_func):
+        def precondition_response(request, stamp):
+            """Response 304/412 jika precondition terpenuhi, None berarti view harus dijalankan."""
+            # Hanya ETag yang dicocokkan (lihat docstring modul)
+            return get_conditional_response(request, etag=stamp.etag)
+
+        def finalize(response, stamp):
+            if response.status_code in (200, 304):
+                response.headers.setdefault('ETag', stamp.etag)
+                if stamp.last_modified_timestamp is not None:
+                    response.headers.setdefault('Last-Modified', http_date(stamp.last_modified_timestamp))
+                if stamp.private:
+                    patch_cache_control(response, private=True, no_cache=True)
+                    patch_vary_headers(response, ('Cookie',))
+                else:
+                    patch_cache_control(response, public=True, no_cache=True)
+            return response
+
+        # View async (ASGI): stamp_func tetap sync (query ORM), dijalankan lewat sync_to_async
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view_func(request, *args, **kwargs)
+
+                # User di-resolve sekali: stamp_func (sync) memakai request.user,
+                # view async memakai request.auser() yang sudah ter-cache
+                if hasattr(request, 'auser'):
+                    request.user = await request.auser()
+                stamp = await sync_to_async(stamp_func)(request, *args, **kwargs)
+                if stamp is None:
+                    return await view_func(request, *args, **kwargs)
+
+                response = precondition_response(request, stamp)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return finalize(response, stamp)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            stamp = stamp_func(request, *args, **kwargs)
+            if stamp is None:
+                return view_func(request, *args, **kwargs)
+
+            response = precondition_response(request, stamp)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return finalize(response, stamp)
+        return wrapper
+    return decorator
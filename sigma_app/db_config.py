@@ -0,0 +1,145 @@
+"""
+Konfigurasi DATABASES dari environment variable (dipakai oleh settings.py).
+
+Environment variable:
+    DB_ENGINE               'postgresql' atau 'sqlite3' (default: postgresql jika PRODUCTION)
+    DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, SCHEMA
+    SQLITE_PATH             File database SQLite (default: db.sqlite3 di BASE_DIR)
+    DB_CONN_MAX_AGE         Umur koneksi persisten (detik). 0 (default) = tutup setiap request.
+                            Hanya aktifkan untuk WSGI (gunicorn sync worker); di ASGI setiap
+                            request memakai thread sendiri sehingga koneksi persisten menumpuk,
+                            pakai DB_POOL sebagai gantinya.
+    DB_CONN_HEALTH_CHECKS   Cek koneksi persisten sebelum dipakai ulang (default: True)
+    DB_POOL                 Connection pool psycopg 3 (butuh package psycopg[binary,pool]);
+                            jika aktif, CONN_MAX_AGE dipaksa 0 karena pool yang menyimpan koneksi
+    DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT
+    DB_STATEMENT_TIMEOUT    Batas waktu satu query di PostgreSQL (ms, 0 = tanpa batas)
+    DB_DISABLE_SERVER_SIDE_CURSORS
+                            Matikan server-side cursor untuk QuerySet.iterator(). Wajib True
+                            jika koneksi lewat PgBouncer mode transaction pooling.
+    DB_REPLICA_HOST, DB_REPLICA_PORT, DB_REPLICA_NAME, DB_REPLICA_USER, DB_REPLICA_PASSWORD
+                            Read replica PostgreSQL (lihat sigma_app/db_router.py)
+    SQLITE_REPLICA_PATH     "Replica" SQLite untuk mencoba routing secara lokal
+
+Server-side cursor dipakai Django untuk QuerySet.iterator() di PostgreSQL, sehingga
+command yang memproses seluruh tabel (reconcile_profile_counters, recompute_user_ratings,
+fix_total_events) membaca baris per chunk tanpa memuat semuanya ke memori.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+# Chunk size default untuk QuerySet.iterator() di command yang memproses seluruh tabel
+DB_ITERATOR_CHUNK_SIZE = 2000
+
+
+def env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None or value == '':
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_int(name, default=None):
+    value = os.getenv(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} harus berupa angka, bukan {value!r}")
+
+
+def psycopg3_available():
+    """True jika driver psycopg 3 dan psycopg_pool terpasang (keduanya dibutuhkan OPTIONS['pool'])."""
+    try:
+        import psycopg  # noqa: F401
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def postgres_config():
+    pg_options = [f"-c search_path={os.getenv('SCHEMA', 'public')}"]
+    statement_timeout = env_int('DB_STATEMENT_TIMEOUT', 0)
+    if statement_timeout:
+        pg_options.append(f"-c statement_timeout={statement_timeout}")
+
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv('DB_NAME'),
+        'USER': os.getenv('DB_USER'),
+        'PASSWORD': os.getenv('DB_PASSWORD'),
+        'HOST': os.getenv('DB_HOST'),
+        'PORT': os.getenv('DB_PORT'),
+        'OPTIONS': {
+            'options': ' '.join(pg_options),
+        },
+        'CONN_MAX_AGE': env_int('DB_CONN_MAX_AGE', 0),
+        'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+        'DISABLE_SERVER_SIDE_CURSORS': env_bool('DB_DISABLE_SERVER_SIDE_CURSORS', False),
+    }
+
+    if env_bool('DB_POOL'):
+        if not psycopg3_available():
+            raise ImproperlyConfigured(
+                'DB_POOL butuh psycopg 3 dengan pool: pip install "psycopg[binary,pool]"'
+            )
+        config['OPTIONS']['pool'] = {
+            'min_size': env_int('DB_POOL_MIN_SIZE', 2),
+            'max_size': env_int('DB_POOL_MAX_SIZE', 10),
+            'timeout': env_int('DB_POOL_TIMEOUT', 10),
+        }
+        # Django menolak kombinasi pool + koneksi persisten
+        config['CONN_MAX_AGE'] = 0
+    return config
+
+
+def sqlite_config(base_dir):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('SQLITE_PATH') or base_dir / 'db.sqlite3',
+        'CONN_MAX_AGE': env_int('DB_CONN_MAX_AGE', 0),
+        'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+    }
+
+
+def replica_database_config(default_config):
+    """
+    Nilai DATABASES['replica'] jika read replica dikonfigurasi, None jika tidak.
+
+    PostgreSQL: DB_REPLICA_HOST (wajib), DB_REPLICA_PORT, DB_REPLICA_NAME, DB_REPLICA_USER,
+    DB_REPLICA_PASSWORD; yang kosong mengikuti koneksi primary.
+    SQLite (untuk mencoba routing secara lokal): SQLITE_REPLICA_PATH.
+    """
+    config = dict(default_config)
+    config['OPTIONS'] = dict(default_config.get('OPTIONS', {}))
+    if default_config['ENGINE'].endswith('postgresql'):
+        host = os.getenv('DB_REPLICA_HOST')
+        if not host:
+            return None
+        config['HOST'] = host
+        for key in ('PORT', 'NAME', 'USER', 'PASSWORD'):
+            value = os.getenv(f'DB_REPLICA_{key}')
+            if value:
+                config[key] = value
+    else:
+        path = os.getenv('SQLITE_REPLICA_PATH')
+        if not path:
+            return None
+        config['NAME'] = path
+    # Di test, replica memakai koneksi primary (tidak dibuat test database terpisah)
+    config['TEST'] = {'MIRROR': 'default'}
+    return config
+
+
+def database_config(base_dir, production=False):
+    """Nilai DATABASES['default'] sesuai environment."""
+    engine = (os.getenv('DB_ENGINE') or ('postgresql' if production else 'sqlite3')).lower()
+    if engine in ('postgresql', 'postgres'):
+        return postgres_config()
+    if engine in ('sqlite3', 'sqlite'):
+        return sqlite_config(base_dir)
+    raise ImproperlyConfigured(f"DB_ENGINE tidak dikenal: {engine!r} (pilih postgresql atau sqlite3)")
@@ -0,0 +1,141 @@
+"""
+Database router untuk read replica.
+
+Query baca di dalam request GET/HEAD dikirim ke alias replica (settings.READ_REPLICA_ALIAS),
+semua penulisan ke 'default' (primary). Request "di-pin" ke primary, artinya semua
+query baca ikut ke primary, jika:
+- method request bukan GET/HEAD/OPTIONS (form POST, AJAX, API Flutter yang menulis),
+- sudah ada penulisan di request tersebut (read-after-write dalam satu request),
+- klien baru saja menulis (cookie pin dari ReplicaPinningMiddleware, berlaku
+  settings.REPLICA_PIN_SECONDS), supaya redirect setelah POST tidak membaca replica
+  yang masih tertinggal,
+- kode berada di dalam `with use_primary():`.
+
+Di luar request (management command, shell, signal di test) semua query ke primary.
+Jika replica tidak dikonfigurasi (alias tidak ada di DATABASES), router selalu
+mengembalikan 'default'.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_PIN_COOKIE = 'db_primary_pin'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingState:
+    """State routing satu request (objek mutable supaya pin dari thread ORM ikut terlihat)."""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+def get_replica_alias():
+    """Alias replica jika dikonfigurasi, None jika tidak."""
+    alias = getattr(settings, 'READ_REPLICA_ALIAS', 'replica')
+    return alias if alias in connections.databases else None
+
+
+@contextmanager
+def routing_state(pinned=False):
+    """Aktifkan routing replica untuk blok kode (dipakai oleh middleware)."""
+    state = RoutingState(pinned=pinned)
+    token = _routing_state.set(state)
+    try:
+        yield state
+    finally:
+        _routing_state.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Paksa semua query baca di dalam blok ke primary."""
+    state = _routing_state.get()
+    if state is None:
+        yield
+        return
+    previous = state.pinned
+    state.pinned = True
+    try:
+        yield
+    finally:
+        state.pinned = previous or state.wrote
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        replica = get_replica_alias()
+        if state is None or state.pinned or replica is None:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            # Baca setelah tulis di request yang sama harus melihat data baru
+            state.wrote = True
+            state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary dan replica berisi data yang sama
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replica mendapat schema lewat replikasi, bukan migrate
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pasang state routing per request dan set cookie pin setelah request yang menulis.
+    Tidak melakukan apa-apa jika replica tidak dikonfigurasi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _start_pinned(self, request):
+        return request.method not in SAFE_METHODS or REPLICA_PIN_COOKIE in request.COOKIES
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if get_replica_alias() is None:
+            return self.get_response(request)
+
+        with routing_state(pinned=self._start_pinned(request)) as state:
+            response = self.get_response(request)
+        return self.process_response(response, state)
+
+    async def __acall__(self, request):
+        if get_replica_alias() is None:
+            return await self.get_response(request)
+
+        with routing_state(pinned=self._start_pinned(request)) as state:
+            response = await self.get_response(request)
+        return self.process_response(response, state)
+
+    def process_response(self, response, state):
+        if state.wrote:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, '1',
+                max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                httponly=True, samesite='Lax',
+            )
+        return response
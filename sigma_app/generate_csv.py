@@ -2,16 +2,28 @@
 """
 Generate CSV files for seeding Django with multiple sport preferences per user.
 Source dataset: https://www.kaggle.com/datasets/andradaolteanu/socialmedia-profiles
+
+Semua kolom acak dibuat secara vectorized dengan NumPy (np.random.Generator) dan
+ditulis ke CSV per chunk, sehingga file seed berukuran jutaan baris bisa dibuat
+tanpa menampung semua baris di memori.
+
+Script ini berdiri sendiri (tidak dijalankan oleh Django), butuh numpy dan pandas.
+
+Usage:
+    python generate_csv.py                      # jumlah baris = jumlah baris dataset Kaggle
+    python generate_csv.py --rows 2000000       # username dataset diulang dengan suffix _1, _2, ...
+    python generate_csv.py --rows 100000 --chunk-size 50000 --seed 7
 """
 
+import argparse
+import base64
 import os
-import pandas as pd
-import random
 import secrets
-from constants import CITY_CHOICES, SPORT_CHOICES, SKILL_CHOICES
+import time
 
-# Set random seed for reproducibility
-random.seed(42)
+import numpy as np
+import pandas as pd
+from constants import CITY_CHOICES, SPORT_CHOICES, SKILL_CHOICES
 
 # Define paths (auto-resolve to where this script lives)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -24,81 +36,146 @@ SOURCE_PATH = os.path.join(DATA_DIR, "users.csv")
 USERS_CSV_PATH = os.path.join(DATA_DIR, "users_seeding.csv")
 SPORT_PREFS_CSV_PATH = os.path.join(DATA_DIR, "sport_preferences_seeding.csv")
 
-# Ensure data folder exists
-os.makedirs(DATA_DIR, exist_ok=True)
-
-# Check source CSV
-if not os.path.exists(SOURCE_PATH):
-    print(f"Source file not found: {SOURCE_PATH}")
-    print("Please download the Kaggle CSV and place it there.")
-    exit(1)
-
-print(f"Reading source data from: {SOURCE_PATH}")
-df_old = pd.read_csv(SOURCE_PATH)
-
-# ========== GENERATE USERS CSV ==========
-users_data = []
-
-for _, row in df_old.iterrows():
-    username = row["screen_name"]
-    full_name = row["name"]
-
-    email = f"{username}@example.com"
-    password = secrets.token_urlsafe(10)  # Secure random password
-    bio = f"Halo, saya {full_name}"
-    city = random.choice(CITY_CHOICES)[0]
-    profile_image_url = (
-        "https://images.unsplash.com/photo-1759354001829-233b2025c6b2?q=80&w=687&auto=format&fit=crop"
-        )
-    total_points = 0
-    total_events = 0
-
-    users_data.append(
-        {
-            "username": username,
-            "full_name": full_name,
-            "email": email,
-            "password": password,
-            "bio": bio,
-            "city": city,
-            "profile_image_url": profile_image_url,
-            "total_points": total_points,
-            "total_events": total_events,
-        }
+PROFILE_IMAGE_URL = (
+    "https://images.unsplash.com/photo-1759354001829-233b2025c6b2?q=80&w=687&auto=format&fit=crop"
+)
+
+# Maksimal jumlah sport preference per user (minimal 1)
+MAX_PREFERENCES = 3
+
+# 12 byte acak -> 16 karakter base64 urlsafe (tanpa padding)
+PASSWORD_BYTES = 12
+
+CITIES = np.array([code for code, _ in CITY_CHOICES])
+SPORTS = np.array([code for code, _ in SPORT_CHOICES])
+SKILLS = np.array([code for code, _ in SKILL_CHOICES])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Jumlah user yang dibuat (default: jumlah baris dataset sumber)")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Jumlah user per chunk CSV")
+    parser.add_argument("--seed", type=int, default=42, help="Seed NumPy untuk reproducibility")
+    parser.add_argument("--source", default=SOURCE_PATH, help="Path dataset Kaggle")
+    parser.add_argument("--users-out", default=USERS_CSV_PATH)
+    parser.add_argument("--sports-out", default=SPORT_PREFS_CSV_PATH)
+    return parser.parse_args()
+
+
+def load_source(path, rows):
+    """
+    Ambil (screen_name, name) dari dataset sumber sebagai array NumPy.
+    Jika file tidak ada tapi --rows diberikan, nama dibuat sintetis.
+    """
+    if os.path.exists(path):
+        print(f"Reading source data from: {path}")
+        df_old = pd.read_csv(path, usecols=["screen_name", "name"]).dropna()
+        return df_old["screen_name"].to_numpy(dtype=str), df_old["name"].to_numpy(dtype=str)
+
+    if rows is None:
+        print(f"Source file not found: {path}")
+        print("Please download the Kaggle CSV and place it there, or pass --rows for synthetic names.")
+        exit(1)
+
+    print(f"Source file not found, generating {rows} synthetic names")
+    return np.array(["user"]), np.array(["Sigma User"])
+
+
+def generate_passwords(count):
+    """Password acak (secure, dari os.urandom) untuk `count` user sekaligus."""
+    encoded = base64.urlsafe_b64encode(secrets.token_bytes(PASSWORD_BYTES * count))
+    width = PASSWORD_BYTES * 4 // 3
+    return np.frombuffer(encoded, dtype=f"S{width}").astype(str)
+
+
+def build_user_chunk(rng, start, stop, screen_names, names):
+    """DataFrame users untuk index [start, stop) beserta array username-nya."""
+    index = np.arange(start, stop)
+    source_count = len(screen_names)
+
+    # Dataset sumber diulang; putaran kedua dst diberi suffix _<putaran> supaya username unik
+    base_usernames = screen_names[index % source_count]
+    rounds = index // source_count
+    usernames = np.where(
+        rounds == 0,
+        base_usernames,
+        np.char.add(np.char.add(base_usernames, "_"), rounds.astype(str)),
     )
-
-df_users = pd.DataFrame(users_data)
-df_users.to_csv(USERS_CSV_PATH, index=False)
-print(f"Users CSV created: {USERS_CSV_PATH}")
-
-# ========== GENERATE SPORT PREFERENCES CSV ==========
-sport_preferences_data = []
-
-for _, row in df_old.iterrows():
-    username = row["screen_name"]
-
-    # Each user has 1–3 unique sport preferences
-    num_preferences = random.randint(1, 3)
-    selected_sports = random.sample(SPORT_CHOICES, num_preferences)
-
-    for sport_type, _ in selected_sports:  # Unpack (value, label)
-        skill_level = random.choice(SKILL_CHOICES)[0]
-
-        sport_preferences_data.append(
-            {
-                "username": username,
-                "sport_type": sport_type,
-                "skill_level": skill_level,
-            }
-        )
-
-df_sport_prefs = pd.DataFrame(sport_preferences_data)
-df_sport_prefs.to_csv(SPORT_PREFS_CSV_PATH, index=False)
-print(f"Sport preferences CSV created: {SPORT_PREFS_CSV_PATH}")
-
-# ========== SUMMARY ==========
-print("\n=== SUMMARY ===")
-print(f"Total users: {len(df_users)}")
-print(f"Total sport preferences: {len(df_sport_prefs)}")
-print(f"Average preferences per user: {len(df_sport_prefs)/len(df_users):.2f}")
-print(f"\nAll files saved to: {DATA_DIR}")
\ No newline at end of file
+    full_names = names[index % source_count]
+
+    df_users = pd.DataFrame({
+        "username": usernames,
+        "full_name": full_names,
+        "email": np.char.add(usernames, "@example.com"),
+        "password": generate_passwords(len(index)),
+        "bio": np.char.add("Halo, saya ", full_names),
+        "city": CITIES[rng.integers(0, len(CITIES), len(index))],
+        "profile_image_url": PROFILE_IMAGE_URL,
+        "total_points": 0,
+        "total_events": 0,
+    })
+    return df_users, usernames
+
+
+def build_sport_preferences_chunk(rng, usernames):
+    """DataFrame sport preferences: 1-3 sport unik per user, skill acak."""
+    count = len(usernames)
+    num_preferences = rng.integers(1, MAX_PREFERENCES + 1, count)
+
+    # argsort dari angka acak = permutasi acak per baris; ambil kolom pertama sebanyak num_preferences
+    sport_order = rng.random((count, len(SPORTS))).argsort(axis=1)[:, :MAX_PREFERENCES]
+    selected = np.arange(MAX_PREFERENCES) < num_preferences[:, None]
+
+    sport_index = sport_order[selected]
+    return pd.DataFrame({
+        "username": np.repeat(usernames, num_preferences),
+        "sport_type": SPORTS[sport_index],
+        "skill_level": SKILLS[rng.integers(0, len(SKILLS), len(sport_index))],
+    })
+
+
+def main():
+    args = parse_args()
+    started = time.perf_counter()
+
+    # Ensure data folder exists
+    os.makedirs(DATA_DIR, exist_ok=True)
+
+    screen_names, names = load_source(args.source, args.rows)
+    total_rows = args.rows if args.rows is not None else len(screen_names)
+    rng = np.random.default_rng(args.seed)
+
+    total_users = 0
+    total_preferences = 0
+
+    # ========== GENERATE USERS + SPORT PREFERENCES CSV (per chunk) ==========
+    for start in range(0, total_rows, args.chunk_size):
+        stop = min(start + args.chunk_size, total_rows)
+        first_chunk = start == 0
+
+        df_users, usernames = build_user_chunk(rng, start, stop, screen_names, names)
+        df_users.to_csv(args.users_out, index=False, mode="w" if first_chunk else "a", header=first_chunk)
+
+        df_sport_prefs = build_sport_preferences_chunk(rng, usernames)
+        df_sport_prefs.to_csv(args.sports_out, index=False, mode="w" if first_chunk else "a", header=first_chunk)
+
+        total_users += len(df_users)
+        total_preferences += len(df_sport_prefs)
+        print(f"Written {total_users}/{total_rows} users")
+
+    elapsed = time.perf_counter() - started
+
+    # ========== SUMMARY ==========
+    print("\n=== SUMMARY ===")
+    print(f"Users CSV created: {args.users_out}")
+    print(f"Sport preferences CSV created: {args.sports_out}")
+    print(f"Total users: {total_users}")
+    print(f"Total sport preferences: {total_preferences}")
+    if total_users:
+        print(f"Average preferences per user: {total_preferences / total_users:.2f}")
+    print(f"Elapsed: {elapsed:.1f}s ({total_users / elapsed if elapsed else 0:.0f} users/s)")
+
+
+if __name__ == "__main__":
+    main()
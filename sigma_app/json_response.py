@@ -0,0 +1,66 @@
+"""
+JsonResponse cepat, pengganti langsung django.http.JsonResponse untuk semua endpoint API.
+
+Jika orjson terpasang, data di-serialize dengan orjson (C/Rust, menghasilkan bytes langsung)
+yang menangani date, time, datetime dan UUID secara native. Tipe yang tidak dikenal orjson
+(Decimal, timedelta, lazy string) diteruskan ke DjangoJSONEncoder.default, sehingga tipe yang
+didukung sama dengan JsonResponse bawaan. Jika orjson tidak terpasang, atau view memakai
+encoder / json_dumps_params sendiri, serialisasi jatuh ke json.dumps seperti biasa.
+
+Perbedaan output dengan DjangoJSONEncoder (semuanya tetap JSON / ISO 8601 yang valid):
+- datetime dan time memakai presisi mikrodetik (DjangoJSONEncoder memotong ke milidetik)
+- karakter non-ASCII ditulis apa adanya dalam UTF-8, bukan escape \\uXXXX
+"""
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - tergantung environment
+    orjson = None
+
+# OPT_UTC_Z: "+00:00" ditulis "Z" seperti DjangoJSONEncoder
+# OPT_NON_STR_KEYS: key dict int/UUID diubah ke string seperti json.dumps
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _orjson_default(value):
+    return _django_encoder.default(value)
+
+
+def dumps_json(data, encoder=DjangoJSONEncoder, json_dumps_params=None):
+    """
+    Serialize data ke bytes JSON.
+
+    Jalur orjson hanya dipakai untuk encoder default tanpa json_dumps_params, supaya view
+    yang butuh format khusus (indent, encoder lain) tetap mendapat output json.dumps.
+    """
+    if orjson is not None and encoder is DjangoJSONEncoder and not json_dumps_params:
+        return orjson.dumps(data, default=_orjson_default, option=ORJSON_OPTIONS)
+    return json.dumps(data, cls=encoder, **(json_dumps_params or {})).encode()
+
+
+class JsonResponse(HttpResponse):
+    """
+    HttpResponse berisi data JSON, signature sama dengan django.http.JsonResponse.
+
+    Args:
+        data: Data yang di-serialize. Harus dict kecuali safe=False
+        encoder: Encoder untuk jalur json.dumps (default DjangoJSONEncoder)
+        safe: Jika True, hanya dict yang boleh di-serialize
+        json_dumps_params: Argumen tambahan untuk json.dumps (memaksa jalur json.dumps)
+    """
+
+    def __init__(self, data, encoder=DjangoJSONEncoder, safe=True, json_dumps_params=None, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps_json(data, encoder, json_dumps_params), **kwargs)
@@ -0,0 +1,247 @@
+"""
+Generator dataset sintetis untuk load test / benchmark.
+
+Semua data dibuat deterministik dari satu seed (random.Random(seed)), sehingga dua run
+dengan parameter yang sama menghasilkan dataset yang identik dan hasil benchmark bisa
+dibandingkan antar run. Insert memakai bulk_create per chunk; karena bulk_create tidak
+memicu signal, data turunan (total_points, total_events, UserRating, counter profil)
+dihitung ulang secara grouped di akhir.
+"""
+
+import random
+from dataclasses import dataclass, asdict
+from datetime import date, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count
+
+from authentication.counters import reconcile_profile_counters
+from authentication.models import SportPreference, UserProfile, normalize_search_text
+from event_discovery.models import Event, EventParticipant
+from leaderboard.models import PointTransaction, refresh_total_points
+from leaderboard.signals import POINTS_CONFIG
+from partner_matching.models import Connection
+from reviews.models import Review, UserRating
+from reviews.views import fill_user_rating, rating_stats_by_user
+from sigma_app.constants import CITY_CHOICES, SKILL_CHOICES, SPORT_CHOICES
+from sigma_app.response_cache import invalidate_tags
+
+
+# Prefix username untuk semua user sintetis (dipakai juga untuk flush)
+LOAD_USER_PREFIX = 'load_user_'
+
+# Password semua user sintetis (di-hash sekali saja)
+LOAD_USER_PASSWORD = 'loadtest123'
+
+FIRST_NAMES = ['Andi', 'Budi', 'Citra', 'Dewi', 'Eka', 'Fajar', 'Gita', 'Hadi', 'Intan', 'Joko',
+               'Kartika', 'Lestari', 'Made', 'Nadia', 'Oki', 'Putri', 'Rizky', 'Sari', 'Tono', 'Wulan']
+LAST_NAMES = ['Pratama', 'Saputra', 'Wijaya', 'Siregar', 'Nasution', 'Hidayat', 'Kusuma',
+              'Santoso', 'Harahap', 'Lubis', 'Gunawan', 'Putra', 'Halim', 'Rahman']
+
+
+@dataclass
+class LoadDataConfig:
+    users: int = 1000
+    events_per_user: float = 0.2
+    participants_per_event: int = 8
+    reviews_per_event: int = 6
+    connections_per_user: int = 10
+    transactions_per_user: int = 5
+    seed: int = 42
+    chunk_size: int = 2000
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def flush_load_data():
+    """Hapus semua user sintetis beserta data yang ter-cascade."""
+    deleted, _ = User.objects.filter(username__startswith=LOAD_USER_PREFIX).delete()
+    return deleted
+
+
+def _load_username(index):
+    return f"{LOAD_USER_PREFIX}{index:06d}"
+
+
+def generate_load_data(config, log=None):
+    """
+    Buat dataset sintetis sesuai config.
+
+    Args:
+        config: LoadDataConfig
+        log: callable(str) opsional untuk progress
+
+    Returns:
+        Dict jumlah baris yang dibuat per model
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(config.seed)
+    chunk = config.chunk_size
+    counts = {}
+
+    cities = [code for code, _ in CITY_CHOICES]
+    sports = [code for code, _ in SPORT_CHOICES]
+    skills = [code for code, _ in SKILL_CHOICES]
+
+    with transaction.atomic():
+        # ===== USERS + PROFILES =====
+        password_hash = make_password(LOAD_USER_PASSWORD)
+        users = []
+        for index in range(config.users):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            users.append(User(
+                username=_load_username(index),
+                email=f"{_load_username(index)}@example.com",
+                first_name=first,
+                last_name=last,
+                password=password_hash,
+            ))
+        User.objects.bulk_create(users, batch_size=chunk)
+        user_ids = list(
+            User.objects.filter(username__startswith=LOAD_USER_PREFIX)
+            .order_by('username').values_list('id', flat=True)
+        )
+        counts['users'] = len(user_ids)
+        log(f"Created {len(user_ids)} users")
+
+        profiles = []
+        for user, user_id in zip(users, user_ids):
+            full_name = f"{user.first_name} {user.last_name}"
+            profiles.append(UserProfile(
+                user_id=user_id,
+                full_name=full_name,
+                bio=f"{rng.choice(sports).title()} enthusiast",
+                city=rng.choice(cities),
+                search_key=normalize_search_text(f"{user.username} {full_name}")[:255],
+            ))
+        UserProfile.objects.bulk_create(profiles, batch_size=chunk)
+
+        preferences = []
+        for user_id in user_ids:
+            for sport in rng.sample(sports, rng.randint(1, 3)):
+                preferences.append(SportPreference(user_id=user_id, sport_type=sport, skill_level=rng.choice(skills)))
+        SportPreference.objects.bulk_create(preferences, batch_size=chunk)
+        counts['sport_preferences'] = len(preferences)
+
+        # ===== CONNECTIONS =====
+        connections = []
+        seen_pairs = set()
+        for user_id in user_ids:
+            for other_id in rng.sample(user_ids, min(config.connections_per_user, len(user_ids))):
+                pair = (min(user_id, other_id), max(user_id, other_id))
+                if user_id == other_id or pair in seen_pairs:
+                    continue
+                seen_pairs.add(pair)
+                status = rng.choices(['accepted', 'pending', 'rejected'], weights=[7, 2, 1])[0]
+                connections.append(Connection(from_user_id=user_id, to_user_id=other_id, status=status))
+        Connection.objects.bulk_create(connections, batch_size=chunk)
+        counts['connections'] = len(connections)
+        log(f"Created {len(connections)} connections")
+
+        # ===== EVENTS + PARTICIPANTS =====
+        today = date.today()
+        event_count = int(config.users * config.events_per_user)
+        events = []
+        for index in range(event_count):
+            sport = rng.choice(sports)
+            days_offset = rng.randint(-120, 60)
+            start_hour = rng.randint(6, 20)
+            events.append(Event(
+                organizer_id=rng.choice(user_ids),
+                title=f"{sport.title()} Session #{index + 1}",
+                description=f"Synthetic {sport} event for load testing",
+                sport_type=sport,
+                event_date=today + timedelta(days=days_offset),
+                start_time=time(start_hour, 0),
+                end_time=time(min(start_hour + 2, 23), 0),
+                city=rng.choice(cities),
+                location_name=f"Lapangan {index + 1}",
+                max_participants=config.participants_per_event + 2,
+                status='completed' if days_offset < 0 else 'open',
+            ))
+        Event.objects.bulk_create(events, batch_size=chunk)
+        counts['events'] = len(events)
+
+        participants = []
+        attended = {}
+        for event in events:
+            members = rng.sample(user_ids, min(config.participants_per_event, len(user_ids)))
+            status = 'attended' if event.status == 'completed' else 'joined'
+            for user_id in members:
+                participants.append(EventParticipant(event_id=event.id, user_id=user_id, status=status))
+            event.current_participants = len(members)
+            if status == 'attended':
+                attended[event.id] = members
+        Event.objects.bulk_update(events, ['current_participants'], batch_size=chunk)
+        EventParticipant.objects.bulk_create(participants, batch_size=chunk)
+        counts['participants'] = len(participants)
+        log(f"Created {len(events)} events and {len(participants)} participants")
+
+        # ===== REVIEWS =====
+        reviews = []
+        for event_id, members in attended.items():
+            if len(members) < 2:
+                continue
+            pairs = set()
+            for _ in range(config.reviews_per_event):
+                from_id, to_id = rng.sample(members, 2)
+                if (from_id, to_id) in pairs:
+                    continue
+                pairs.add((from_id, to_id))
+                reviews.append(Review(
+                    event_id=event_id,
+                    from_user_id=from_id,
+                    to_user_id=to_id,
+                    rating=rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 5, 6])[0],
+                    comment="Synthetic review",
+                ))
+        Review.objects.bulk_create(reviews, batch_size=chunk)
+        counts['reviews'] = len(reviews)
+
+        # ===== POINT TRANSACTIONS =====
+        activity_types = [code for code, _ in PointTransaction.ACTIVITY_CHOICES]
+        event_ids = [event.id for event in events] or [None]
+        transactions = []
+        for user_id in user_ids:
+            for _ in range(config.transactions_per_user):
+                activity = rng.choice(activity_types)
+                transactions.append(PointTransaction(
+                    user_id=user_id,
+                    activity_type=activity,
+                    points=POINTS_CONFIG[activity],
+                    description=f"Synthetic {activity}",
+                    related_event_id=rng.choice(event_ids),
+                ))
+        PointTransaction.objects.bulk_create(transactions, batch_size=chunk)
+        counts['point_transactions'] = len(transactions)
+        log(f"Created {len(reviews)} reviews and {len(transactions)} point transactions")
+
+        # ===== DATA TURUNAN =====
+        refresh_total_points(user_ids)
+
+        total_events = dict(
+            EventParticipant.objects.filter(user_id__in=user_ids, status__in=['joined', 'attended'])
+            .values('user_id').annotate(total=Count('id')).values_list('user_id', 'total')
+        )
+        profiles = list(UserProfile.objects.filter(user_id__in=user_ids).only('id', 'user_id'))
+        for profile in profiles:
+            profile.total_events = total_events.get(profile.user_id, 0)
+        UserProfile.objects.bulk_update(profiles, ['total_events'], batch_size=chunk)
+
+        stats = rating_stats_by_user(Review.objects.filter(to_user_id__in=user_ids))
+        ratings = []
+        for user_id in user_ids:
+            user_rating = UserRating(user_id=user_id)
+            fill_user_rating(user_rating, stats.get(user_id, {}))
+            ratings.append(user_rating)
+        UserRating.objects.bulk_create(ratings, batch_size=chunk)
+
+        reconcile_profile_counters(user_ids, batch_size=chunk)
+
+    # bulk_create tidak memicu signal invalidasi response cache
+    invalidate_tags('events', 'points', 'connections')
+
+    return counts
@@ -0,0 +1,35 @@
+# sigma_app/management/commands/benchmark_db_connections.py
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from sigma_app.benchmarks import run_connection_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Bandingkan latency per request dengan koneksi database baru setiap request, "
+        "koneksi persisten (CONN_MAX_AGE), dan connection pool psycopg (jika tersedia)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help="Alias database (default: default)")
+        parser.add_argument('--requests', type=int, default=200, help="Jumlah request yang disimulasikan")
+        parser.add_argument('--queries', type=int, default=3, help="Jumlah query per request")
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        settings_dict = connections[alias].settings_dict
+        self.stdout.write(self.style.SUCCESS(
+            f"Database: {connections[alias].vendor} {settings_dict.get('HOST') or settings_dict['NAME']}"
+        ))
+
+        results = run_connection_benchmarks(alias, requests=options['requests'], queries=options['queries'])
+
+        baseline = results['new_connection']['median_ms']
+        for mode, result in results.items():
+            speedup = baseline / result['median_ms'] if result['median_ms'] else 0.0
+            self.stdout.write(
+                f"  {mode:<15} median={result['median_ms']}ms p95={result['p95_ms']}ms "
+                f"connects={result['connects']} ({speedup:.1f}x)"
+            )
@@ -0,0 +1,40 @@
+# sigma_app/management/commands/benchmark_json.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sigma_app.benchmarks import DEFAULT_JSON_ROWS, json_backend_name, run_json_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark serialisasi JSON: django.http.JsonResponse (json + DjangoJSONEncoder) "
+        "dibandingkan sigma_app.json_response.JsonResponse pada payload leaderboard, events, "
+        "dan connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            default=','.join(str(rows) for rows in DEFAULT_JSON_ROWS),
+            help="Jumlah baris per payload, dipisah koma (default: %(default)s)",
+        )
+        parser.add_argument('--repeat', type=int, default=20, help="Jumlah serialisasi per payload")
+
+    def handle(self, *args, **options):
+        try:
+            rows = [int(value) for value in options['rows'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError("--rows harus berupa angka dipisah koma, contoh: 100,1000")
+
+        self.stdout.write(self.style.SUCCESS(f"JSON backend: {json_backend_name()}"))
+        results = run_json_benchmarks(rows, repeat=options['repeat'])
+
+        for count, payloads in results.items():
+            self.stdout.write(self.style.SUCCESS(f"\n=== {count} rows ==="))
+            for name, result in payloads.items():
+                django, fast = result['django'], result['fast']
+                self.stdout.write(
+                    f"  {name:<12} django={django['median_ms']}ms ({django['mb_per_s']} MB/s)  "
+                    f"fast={fast['median_ms']}ms ({fast['mb_per_s']} MB/s)  "
+                    f"speedup={result['speedup']}x  size={fast['bytes']}B"
+                )
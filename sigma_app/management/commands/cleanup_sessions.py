@@ -0,0 +1,60 @@
+# sigma_app/management/commands/cleanup_sessions.py
+
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+DB_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Hapus session yang sudah kedaluwarsa secara bertahap (per batch) supaya tabel "
+        "django_session tidak terkunci lama. Untuk engine non-database, memanggil "
+        "SessionStore.clear_expired() seperti clearsessions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="Jumlah session per DELETE")
+        parser.add_argument('--dry-run', action='store_true', help="Hanya hitung session kedaluwarsa")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError("--batch-size harus lebih dari 0")
+
+        if settings.SESSION_ENGINE not in DB_SESSION_ENGINES:
+            engine = import_module(settings.SESSION_ENGINE)
+            try:
+                engine.SessionStore.clear_expired()
+            except NotImplementedError:
+                self.stdout.write(
+                    f"Engine {settings.SESSION_ENGINE} membersihkan session sendiri, tidak ada yang dihapus."
+                )
+                return
+            self.stdout.write(self.style.SUCCESS(f"clear_expired() dijalankan untuk {settings.SESSION_ENGINE}."))
+            return
+
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+        if options['dry_run']:
+            self.stdout.write(f"{expired.count()} session kedaluwarsa akan dihapus.")
+            return
+
+        total = 0
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)[:batch_size])
+            if not keys:
+                break
+            # Session tidak punya relasi / signal, jadi delete() langsung menjadi satu DELETE
+            deleted, _ = Session.objects.filter(session_key__in=keys).delete()
+            total += deleted
+            if options['verbosity'] >= 2:
+                self.stdout.write(f"  {total} session dihapus...")
+
+        self.stdout.write(self.style.SUCCESS(f"{total} session kedaluwarsa dihapus."))
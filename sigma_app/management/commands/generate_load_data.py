@@ -0,0 +1,58 @@
+# sigma_app/management/commands/generate_load_data.py
+
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from sigma_app.loadgen import LOAD_USER_PREFIX, LoadDataConfig, flush_load_data, generate_load_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic dataset (users, events, participants, reviews, "
+        "connections, point transactions) for load testing and benchmarks"
+    )
+
+    def add_arguments(self, parser):
+        defaults = LoadDataConfig()
+        parser.add_argument('--users', type=int, default=defaults.users, help="Jumlah user sintetis")
+        parser.add_argument('--events-per-user', type=float, default=defaults.events_per_user,
+                            help="Rasio event terhadap user (0.2 = 1 event per 5 user)")
+        parser.add_argument('--participants-per-event', type=int, default=defaults.participants_per_event)
+        parser.add_argument('--reviews-per-event', type=int, default=defaults.reviews_per_event)
+        parser.add_argument('--connections-per-user', type=int, default=defaults.connections_per_user)
+        parser.add_argument('--transactions-per-user', type=int, default=defaults.transactions_per_user)
+        parser.add_argument('--seed', type=int, default=defaults.seed, help="Seed random (dataset deterministik)")
+        parser.add_argument('--chunk-size', type=int, default=defaults.chunk_size, help="Batch size bulk_create")
+        parser.add_argument('--flush', action='store_true',
+                            help=f"Hapus user '{LOAD_USER_PREFIX}*' yang sudah ada sebelum generate")
+
+    def handle(self, *args, **options):
+        config = LoadDataConfig(
+            users=options['users'],
+            events_per_user=options['events_per_user'],
+            participants_per_event=options['participants_per_event'],
+            reviews_per_event=options['reviews_per_event'],
+            connections_per_user=options['connections_per_user'],
+            transactions_per_user=options['transactions_per_user'],
+            seed=options['seed'],
+            chunk_size=options['chunk_size'],
+        )
+
+        if User.objects.filter(username__startswith=LOAD_USER_PREFIX).exists():
+            if not options['flush']:
+                raise CommandError(
+                    f"Synthetic users ('{LOAD_USER_PREFIX}*') already exist. Use --flush to regenerate."
+                )
+            deleted = flush_load_data()
+            self.stdout.write(self.style.WARNING(f"Flushed {deleted} existing synthetic rows"))
+
+        self.stdout.write(self.style.SUCCESS(f"Generating synthetic dataset: {config.as_dict()}"))
+        start = time.perf_counter()
+        counts = generate_load_data(config, log=self.stdout.write)
+        elapsed = time.perf_counter() - start
+
+        for name, count in counts.items():
+            self.stdout.write(f"  {name}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"\nDone! Generated dataset in {elapsed:.1f}s."))
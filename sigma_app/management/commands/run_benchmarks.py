@@ -0,0 +1,110 @@
+# sigma_app/management/commands/run_benchmarks.py
+
+import json
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from sigma_app.benchmarks import (
+    DEFAULT_SCALES, build_report, compare_reports, latest_report,
+    run_endpoint_benchmarks, save_report,
+)
+from sigma_app.loadgen import LOAD_USER_PREFIX, LoadDataConfig, generate_load_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark key endpoints (leaderboard, show_json, connections_api, points dashboard, profile) "
+        "against synthetic datasets of several sizes. Runs on a throwaway test database and stores "
+        "results as JSON for comparison between runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales',
+            default=','.join(str(scale) for scale in DEFAULT_SCALES),
+            help="Daftar jumlah user sintetis, dipisah koma (default: %(default)s)",
+        )
+        parser.add_argument('--repeat', type=int, default=5, help="Jumlah request per endpoint")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--label', default='run', help="Label untuk nama file hasil")
+        parser.add_argument(
+            '--output-dir',
+            default=str(settings.BASE_DIR / 'benchmark_results'),
+            help="Folder penyimpanan hasil JSON",
+        )
+        parser.add_argument(
+            '--compare',
+            help="File hasil sebelumnya untuk dibandingkan (default: hasil terbaru di output dir)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(value) for value in options['scales'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError("--scales harus berupa angka dipisah koma, contoh: 100,1000")
+
+        # Log per request dari QueryInstrumentationMiddleware terlalu ramai untuk benchmark
+        perf_logger = logging.getLogger('sigma_app.performance')
+        if options['verbosity'] < 2:
+            perf_logger.setLevel(logging.ERROR)
+
+        results = {}
+        setup_test_environment()
+        try:
+            for scale in scales:
+                results[str(scale)] = self.run_scale(scale, options)
+        finally:
+            teardown_test_environment()
+
+        report = build_report(options['label'], results, options['repeat'])
+        path = save_report(report, options['output_dir'])
+        self.stdout.write(self.style.SUCCESS(f"\nSaved results to {path}"))
+
+        previous_path = options['compare'] or latest_report(options['output_dir'], exclude=path)
+        if previous_path:
+            with open(previous_path) as handle:
+                previous = json.load(handle)
+            self.print_comparison(previous_path, compare_reports(previous, report))
+
+    def run_scale(self, scale, options):
+        """Buat test database baru, isi dataset sintetis, lalu jalankan benchmark."""
+        self.stdout.write(self.style.SUCCESS(f"\n=== Scale: {scale} users ==="))
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            counts = generate_load_data(LoadDataConfig(users=scale, seed=options['seed']))
+
+            client = Client()
+            client.force_login(User.objects.get(username=f"{LOAD_USER_PREFIX}{0:06d}"))
+            endpoints = run_endpoint_benchmarks(client, repeat=options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        for name, result in endpoints.items():
+            saved = 100 - result['wire_bytes'] / result['bytes'] * 100 if result['bytes'] else 0.0
+            self.stdout.write(
+                f"  {name:<18} status={result['status']} queries={result['queries']:<4} "
+                f"median={result['median_ms']}ms p95={result['p95_ms']}ms "
+                f"size={result['bytes']}B wire={result['wire_bytes']}B "
+                f"({result['encoding'] or 'identity'}, -{saved:.0f}%)"
+            )
+        return {'dataset': counts, 'endpoints': endpoints}
+
+    def print_comparison(self, previous_path, rows):
+        self.stdout.write(self.style.SUCCESS(f"\nComparison with {previous_path}:"))
+        if not rows:
+            self.stdout.write("  No matching scales/endpoints to compare.")
+            return
+        for scale, name, old_ms, new_ms, change, old_queries, new_queries in rows:
+            line = (
+                f"  [{scale}] {name:<18} {old_ms}ms -> {new_ms}ms ({change:+.1f}%), "
+                f"queries {old_queries} -> {new_queries}"
+            )
+            style = self.style.WARNING if change > 10 or new_queries > old_queries else self.style.SUCCESS
+            self.stdout.write(style(line))
@@ -1,70 +1,163 @@
 # sigma_app/management/commands/seed_users.py
 
+import csv
 import os
-import pandas as pd
+import time
+from itertools import islice
+
 from django.conf import settings
 from django.db import transaction
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
-from authentication.models import UserProfile, SportPreference
+from authentication.models import UserProfile, SportPreference, normalize_search_text
+from sigma_app.password_hashing import hash_passwords, password_hash_pool
+from sigma_app.response_cache import invalidate_tags
+
+
+def read_csv_chunks(path, chunk_size):
+    """Baca CSV sebagai list dict per chunk (streaming, tidak load seluruh file ke memori)."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        reader = csv.DictReader(handle)
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+
+def _to_int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
 
 
 class Command(BaseCommand):
     help = "Seed users, profiles, and sport preferences from generated CSV files"
 
-    def handle(self, *args, **kwargs):
-        users_path = os.path.join(settings.BASE_DIR, "sigma_app", "data", "users_seeding.csv")
-        sports_path = os.path.join(settings.BASE_DIR, "sigma_app", "data", "sport_preferences_seeding.csv")
+    def add_arguments(self, parser):
+        data_dir = os.path.join(settings.BASE_DIR, "sigma_app", "data")
+        parser.add_argument('--users-csv', default=os.path.join(data_dir, "users_seeding.csv"))
+        parser.add_argument('--sports-csv', default=os.path.join(data_dir, "sport_preferences_seeding.csv"))
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Jumlah baris per chunk baca CSV / bulk_create (default: 1000)")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Jumlah proses untuk hashing password (default: jumlah CPU, 1 = tanpa pool)")
 
-        users_df = pd.read_csv(users_path)
-        sports_df = pd.read_csv(sports_path)
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        workers = options['workers']
+        started = time.perf_counter()
 
         self.stdout.write(self.style.SUCCESS("Seeding users..."))
+        created_users = 0
+        skipped_users = 0
+        hash_seconds = 0.0
 
-        with transaction.atomic():
-            for _, row in users_df.iterrows():
-                if pd.isna(row["username"]) or pd.isna(row["email"]):
-                    self.stdout.write(self.style.WARNING(f"Skipping invalid row: {row}"))
-                    continue
+        # Pool dibuat sekali untuk semua chunk (setiap worker menjalankan django.setup())
+        with password_hash_pool(workers) as pool:
+            for rows in read_csv_chunks(options['users_csv'], batch_size):
+                valid_rows = {}
+                for row in rows:
+                    if not row.get("username") or not row.get("email"):
+                        self.stdout.write(self.style.WARNING(f"Skipping invalid row: {row}"))
+                        skipped_users += 1
+                        continue
+                    valid_rows.setdefault(row["username"], row)
 
-                user, created = User.objects.get_or_create(
-                    username=row["username"],
-                    defaults={
-                        "email": row["email"],
-                        "first_name": row["full_name"].split()[0],
-                        "last_name": " ".join(row["full_name"].split()[1:]),
-                    },
+                # Satu query untuk cek username yang sudah ada di chunk ini
+                existing = set(
+                    User.objects.filter(username__in=valid_rows).values_list('username', flat=True)
                 )
+                skipped_users += len(existing)
+                new_rows = [row for username, row in valid_rows.items() if username not in existing]
+                if not new_rows:
+                    continue
 
-                if created:
-                    user.set_password(row["password"])
-                    user.save()
+                hash_start = time.perf_counter()
+                password_hashes = hash_passwords([row["password"] for row in new_rows], pool=pool)
+                hash_seconds += time.perf_counter() - hash_start
 
-                    profile, _ = UserProfile.objects.get_or_create(user=user)
-                    profile.full_name = row["full_name"]
-                    profile.bio = row["bio"]
-                    profile.city = row["city"]
-                    profile.profile_image_url = row.get("profile_image_url", "")
-                    profile.total_points = int(row["total_points"])
-                    profile.total_events = int(row["total_events"])
-                    profile.save()
+                with transaction.atomic():
+                    users = []
+                    for row, password_hash in zip(new_rows, password_hashes):
+                        name_parts = row["full_name"].split()
+                        users.append(User(
+                            username=row["username"],
+                            email=row["email"],
+                            first_name=name_parts[0] if name_parts else "",
+                            last_name=" ".join(name_parts[1:]),
+                            password=password_hash,
+                        ))
+                    User.objects.bulk_create(users, batch_size=batch_size)
 
-                    self.stdout.write(f"Created: {row['username']}")
-                else:
-                    self.stdout.write(f"Skipped existing user: {row['username']}")
+                    # bulk_create tidak memicu signal create_user_profile, jadi profile dibuat di sini
+                    user_ids = dict(
+                        User.objects.filter(username__in=[row["username"] for row in new_rows])
+                        .values_list('username', 'id')
+                    )
+                    profiles = [
+                        UserProfile(
+                            user_id=user_ids[row["username"]],
+                            full_name=row["full_name"],
+                            bio=row["bio"],
+                            city=row["city"],
+                            profile_image_url=row.get("profile_image_url", ""),
+                            total_points=_to_int(row["total_points"]),
+                            total_events=_to_int(row["total_events"]),
+                            search_key=normalize_search_text(f"{row['username']} {row['full_name']}")[:255],
+                        )
+                        for row in new_rows
+                    ]
+                    UserProfile.objects.bulk_create(profiles, batch_size=batch_size)
 
-            self.stdout.write(self.style.SUCCESS("\nSeeding sport preferences..."))
+                created_users += len(new_rows)
+                self.stdout.write(f"Created {created_users} users so far...")
 
-            for _, row in sports_df.iterrows():
-                user = User.objects.filter(username=row["username"]).first()
-                if not user:
+        users_seconds = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS("\nSeeding sport preferences..."))
+        sports_started = time.perf_counter()
+        created_preferences = 0
+        skipped_preferences = 0
+
+        for rows in read_csv_chunks(options['sports_csv'], batch_size):
+            # Satu query mapping username -> id untuk seluruh chunk
+            user_ids = dict(
+                User.objects.filter(username__in={row["username"] for row in rows})
+                .values_list('username', 'id')
+            )
+
+            preferences = []
+            for row in rows:
+                user_id = user_ids.get(row["username"])
+                if not user_id:
                     self.stdout.write(self.style.WARNING(f"User {row['username']} not found, skipping."))
+                    skipped_preferences += 1
                     continue
-
-                SportPreference.objects.get_or_create(
-                    user=user,
+                preferences.append(SportPreference(
+                    user_id=user_id,
                     sport_type=row["sport_type"],
-                    defaults={"skill_level": row["skill_level"]},
-                )
+                    skill_level=row["skill_level"],
+                ))
+
+            # ignore_conflicts: preferensi (user, sport_type) yang sudah ada tidak ditimpa
+            SportPreference.objects.bulk_create(preferences, batch_size=batch_size, ignore_conflicts=True)
+            created_preferences += len(preferences)
+
+        # bulk_create tidak memicu signal invalidasi response cache
+        invalidate_tags('points', 'connections')
+
+        sports_seconds = time.perf_counter() - sports_started
+        total_seconds = time.perf_counter() - started
 
-        self.stdout.write(self.style.SUCCESS("Done seeding all users and sport preferences."))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS("Done seeding all users and sport preferences."))
+        self.stdout.write(
+            f"Users: {created_users} created, {skipped_users} skipped in {users_seconds:.1f}s "
+            f"({created_users / users_seconds if users_seconds else 0:.1f} users/s, "
+            f"password hashing {hash_seconds:.1f}s)"
+        )
+        self.stdout.write(
+            f"Sport preferences: {created_preferences} processed, {skipped_preferences} skipped in "
+            f"{sports_seconds:.1f}s ({created_preferences / sports_seconds if sports_seconds else 0:.1f} rows/s)"
+        )
+        self.stdout.write(f"Total: {total_seconds:.1f}s")
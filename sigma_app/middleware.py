@@ -0,0 +1,149 @@
+"""
+Middleware untuk instrumentasi performa request.
+
+QueryInstrumentationMiddleware mencatat jumlah query, total waktu DB, dan waktu view
+untuk setiap request (dikelompokkan berdasarkan nama URL), lalu:
+- mengirimkannya sebagai header Server-Timing (terlihat di tab Network browser),
+- menulis satu baris log terstruktur (JSON) ke logger 'sigma_app.performance',
+- mengecek budget query per view (settings.QUERY_BUDGETS).
+
+Jika settings.QUERY_BUDGET_ENFORCE aktif (default saat menjalankan test), request yang
+melebihi budget akan raise QueryBudgetExceeded sehingga test langsung gagal.
+"""
+
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger('sigma_app.performance')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Dilempar saat sebuah view menjalankan query lebih banyak dari budget-nya."""
+
+
+class QueryStats:
+    """
+    Execute wrapper (lihat connection.execute_wrapper) yang menghitung jumlah
+    query dan total waktu eksekusinya.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def install_query_wrappers(stack, stats):
+    """Pasang stats sebagai execute wrapper di semua koneksi database thread ini."""
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(stats))
+
+
+def get_query_budget(view_name):
+    """Budget query untuk nama URL (format 'namespace:name'), None jika tidak diatur."""
+    if not view_name:
+        return None
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(view_name)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Mendukung request sync (WSGI) dan async (ASGI). Pada request async, wrapper dipasang
+    di thread tempat ORM berjalan (thread sync_to_async milik request), sehingga query
+    dari view async tetap terhitung. Query yang dijalankan paralel di thread lain
+    (run_queries dengan ASYNC_PARALLEL_QUERIES) tidak ikut terhitung.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not getattr(settings, 'QUERY_INSTRUMENTATION_ENABLED', True):
+            return self.get_response(request)
+
+        stats = QueryStats()
+        start = time.perf_counter()
+
+        # Pasang wrapper ke semua koneksi database (default + replica jika ada)
+        with ExitStack() as stack:
+            install_query_wrappers(stack, stats)
+            response = self.get_response(request)
+
+        return self.process_metrics(request, response, stats, start)
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'QUERY_INSTRUMENTATION_ENABLED', True):
+            return await self.get_response(request)
+
+        stats = QueryStats()
+        start = time.perf_counter()
+
+        stack = ExitStack()
+        await sync_to_async(install_query_wrappers)(stack, stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+
+        return self.process_metrics(request, response, stats, start)
+
+    def process_metrics(self, request, response, stats, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = stats.duration * 1000
+        view_ms = max(total_ms - db_ms, 0.0)
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        budget = get_query_budget(view_name)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.1f};desc="{stats.count} queries"',
+            f'view;dur={view_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+
+        record = {
+            'event': 'request_metrics',
+            'view': view_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': round(db_ms, 2),
+            'view_ms': round(view_ms, 2),
+            'total_ms': round(total_ms, 2),
+            'query_budget': budget,
+        }
+
+        if budget is not None and stats.count > budget:
+            logger.warning(json.dumps({**record, 'event': 'query_budget_exceeded'}))
+            if getattr(settings, 'QUERY_BUDGET_ENFORCE', False):
+                raise QueryBudgetExceeded(
+                    f"{view_name} executed {stats.count} queries (budget: {budget})"
+                )
+        else:
+            logger.info(json.dumps(record))
+
+        return response
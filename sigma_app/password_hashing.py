@@ -0,0 +1,56 @@
+"""
+Hash password secara paralel memakai process pool.
+
+PBKDF2 (hasher default Django) sengaja lambat dan CPU-bound, sehingga untuk seeding
+ribuan user hashing dibagi ke beberapa proses. Modul ini sengaja tidak meng-import
+model supaya aman di-import oleh worker process (start method spawn maupun fork).
+
+Membuat process pool mahal (setiap worker menjalankan django.setup()), jadi pemanggil
+yang hashing per chunk membuat pool sekali lewat password_hash_pool dan meneruskannya
+ke hash_passwords.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+
+
+def _init_worker():
+    # Worker dengan start method 'spawn' mulai dari interpreter kosong
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sigma_app.settings')
+    django.setup()
+
+
+@contextmanager
+def password_hash_pool(workers=None):
+    """
+    Process pool untuk hash_passwords, ditutup saat keluar dari blok with.
+
+    Args:
+        workers: Jumlah proses (default: os.cpu_count()); 1 = tanpa process pool (yield None)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        yield None
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        yield pool
+
+
+def hash_passwords(passwords, pool=None, chunksize=32):
+    """
+    Hash list password mentah, urutan hasil sama dengan input.
+
+    Args:
+        passwords: List password mentah
+        pool: Process pool dari password_hash_pool; None = hashing di proses ini
+        chunksize: Jumlah password yang dikirim ke worker sekaligus
+    """
+    passwords = list(passwords)
+    if pool is None or len(passwords) <= chunksize:
+        return [make_password(password) for password in passwords]
+    return list(pool.map(make_password, passwords, chunksize=chunksize))
@@ -0,0 +1,156 @@
+"""
+Cache response server-side untuk endpoint publik / anonim yang isinya sama untuk banyak user
+(leaderboard, daftar event, opsi filter, daftar teman publik).
+
+Key cache = path URL + query param yang relevan (param lain diabaikan supaya tidak memecah
+cache) + versi setiap tag yang dipakai endpoint. Invalidasi dilakukan dengan menaikkan versi
+tag (lihat invalidate_tags), bukan menghapus key satu per satu: key lama otomatis tidak
+terpakai lagi dan habis sendiri oleh timeout / eviction backend.
+
+Tag yang dipakai:
+    'events'      : Event, EventParticipant
+    'points'      : PointTransaction, UserProfile (total_points, nama, kota, foto)
+    'connections' : Connection, UserProfile, SportPreference
+
+Signal di sigma_app/signals.py menaikkan versi tag setiap ada penulisan model terkait.
+Jalur bulk yang melewati signal (bulk_create / queryset.update) harus memanggil
+invalidate_tags sendiri.
+
+Backend cache diatur lewat CACHES di settings.py (CACHE_BACKEND): locmem / file cukup
+untuk satu server, redis / memcached dipakai jika ada beberapa server supaya versi tag
+ikut ter-share.
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+# Default umur cache (detik) jika decorator tidak memberi timeout
+DEFAULT_RESPONSE_CACHE_TIMEOUT = 60 * 5
+
+TAG_KEY = 'response_cache:tag:{tag}'
+RESPONSE_KEY = 'response_cache:v1:{digest}'
+
+
+def get_response_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def response_cache_enabled():
+    return getattr(settings, 'RESPONSE_CACHE_ENABLED', True)
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def tag_key(tag):
+    return TAG_KEY.format(tag=tag)
+
+
+def get_tag_versions(tags, cache=None):
+    """
+    Versi terkini setiap tag (satu get_many). Tag yang belum punya versi diberi versi
+    baru dan disimpan tanpa timeout.
+
+    Returns:
+        Tuple versi, urutannya sama dengan tags
+    """
+    cache = cache or get_response_cache()
+    keys = [tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def invalidate_tags(*tags):
+    """
+    Naikkan versi tags sehingga semua response yang di-cache dengan tag tersebut basi.
+
+    Dinaikkan langsung dan sekali lagi setelah transaksi commit, supaya request lain yang
+    sempat meng-cache data sebelum commit tidak meninggalkan response basi.
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return
+
+    def bump():
+        version = _new_version()
+        get_response_cache().set_many({tag_key(tag): version for tag in tags}, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def response_cache_key(request, query_params, tag_versions):
+    """Key cache dari path, query param yang dipilih (urut nama) dan versi tag."""
+    params = [(name, request.GET.getlist(name)) for name in sorted(query_params)]
+    raw = repr((request.path, params, tag_versions))
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return RESPONSE_KEY.format(digest=digest)
+
+
+def _serialize(response):
+    return {
+        'content': response.content,
+        'status': response.status_code,
+        'headers': list(response.items()),
+    }
+
+
+def _deserialize(data):
+    response = HttpResponse(data['content'], status=data['status'])
+    for header, value in data['headers']:
+        response[header] = value
+    return response
+
+
+def cache_response(tags=(), timeout=DEFAULT_RESPONSE_CACHE_TIMEOUT, query_params=(), anonymous_only=False):
+    """
+    Decorator cache response untuk view GET/HEAD.
+
+    Args:
+        tags: Tag data yang dipakai view (lihat docstring modul)
+        timeout: Umur cache (detik), batas atas untuk data yang berubah karena waktu
+        query_params: Nama query param yang mempengaruhi isi response
+        anonymous_only: True jika response berbeda untuk user yang login
+            (misalnya menampilkan ranking user tersebut); user login selalu bypass cache
+
+    Hanya response 200 non-streaming tanpa cookie yang disimpan. Header X-Cache berisi
+    HIT / MISS.
+    """
+    tags = tuple(tags)
+    query_params = tuple(query_params)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not response_cache_enabled() or request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+            if anonymous_only and request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+
+            cache = get_response_cache()
+            key = response_cache_key(request, query_params, get_tag_versions(tags, cache))
+
+            cached = cache.get(key)
+            if cached is not None:
+                response = _deserialize(cached)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(key, _serialize(response), timeout)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
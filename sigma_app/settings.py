@@ -12,7 +12,12 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
+
+from sigma_app.db_config import database_config, replica_database_config
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -60,11 +65,15 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Add WhiteNoise right after SecurityMiddleware
+    'sigma_app.compression.CompressionMiddleware',  # gzip/brotli untuk response dinamis (static sudah precompressed)
+    'sigma_app.middleware.QueryInstrumentationMiddleware',  # Query count & latency per view (Server-Timing + log)
+    'sigma_app.db_router.ReplicaPinningMiddleware',  # Baca dari replica, pin ke primary setelah menulis
     'corsheaders.middleware.CorsMiddleware',  # Add CORS middleware (must be before CommonMiddleware)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'sigma_app.api_tokens.ApiTokenMiddleware',  # Authorization: Bearer untuk API Flutter (tanpa query session)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -87,35 +96,91 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'sigma_app.wsgi.application'
+# ASGI (uvicorn worker) untuk view async: proxy_image dan endpoint Flutter read-only
+ASGI_APPLICATION = 'sigma_app.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# Database configuration
-if PRODUCTION:
-    # Production: gunakan PostgreSQL dengan kredensial dari environment variables
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.postgresql',
-            'NAME': os.getenv('DB_NAME'),
-            'USER': os.getenv('DB_USER'),
-            'PASSWORD': os.getenv('DB_PASSWORD'),
-            'HOST': os.getenv('DB_HOST'),
-            'PORT': os.getenv('DB_PORT'),
-            'OPTIONS': {
-                'options': f"-c search_path={os.getenv('SCHEMA', 'public')}"
-            }
-        }
-    }
-else:
-    # Development: gunakan SQLite
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
-        }
+# Database configuration (lihat sigma_app/db_config.py untuk daftar environment variable)
+# Production: PostgreSQL dengan koneksi persisten / pool, development: SQLite
+DATABASES = {
+    'default': database_config(BASE_DIR, production=PRODUCTION),
+}
+
+# Read replica opsional (DB_REPLICA_HOST / SQLITE_REPLICA_PATH). Query baca dari request
+# GET diarahkan ke replica oleh ReadReplicaRouter, penulisan selalu ke primary.
+_replica_database = replica_database_config(DATABASES['default'])
+if _replica_database:
+    DATABASES['replica'] = _replica_database
+
+DATABASE_ROUTERS = ['sigma_app.db_router.ReadReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# CACHE_BACKEND: 'locmem' (default) atau 'file' untuk satu server,
+# 'redis' / 'memcached' (shared) jika aplikasi berjalan di beberapa server/worker.
+# redis butuh package redis, memcached butuh pymemcache.
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem').lower()
+# CACHE_LOCATION: nama cache (locmem), direktori (file), atau URL server (redis://..., host:port)
+CACHE_DEFAULT_LOCATIONS = {
+    'locmem': 'sigma-app',
+    'file': str(BASE_DIR / '.django_cache'),
+    'redis': 'redis://127.0.0.1:6379/1',
+    'memcached': '127.0.0.1:11211',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv('CACHE_LOCATION', CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'sigma'),
     }
+}
+
+# Template fragment cache ({% cache ... using="fragments" %}) untuk baris leaderboard, kartu
+# event dan item review. Alias terpisah supaya ribuan fragment tidak mengusir entry response
+# cache / session dari cache 'default'. Key fragment memuat versi datanya (updated_at, points),
+# jadi fragment lama tidak pernah terpakai lagi dan cukup dibiarkan kedaluwarsa / di-cull.
+FRAGMENT_CACHE_ENABLED = os.getenv('FRAGMENT_CACHE', 'True').lower() == 'true'
+FRAGMENT_CACHE_LOCATIONS = {
+    'locmem': 'sigma-app-fragments',
+    'file': str(BASE_DIR / '.django_cache' / 'fragments'),
+}
+CACHES['fragments'] = {
+    'BACKEND': CACHES['default']['BACKEND'],
+    'LOCATION': FRAGMENT_CACHE_LOCATIONS.get(CACHE_BACKEND, CACHES['default']['LOCATION']),
+    'KEY_PREFIX': CACHES['default']['KEY_PREFIX'] + '_fragments',
+}
+if CACHE_BACKEND in FRAGMENT_CACHE_LOCATIONS:
+    # MAX_ENTRIES hanya dikenal backend locmem / file (default 300 terlalu kecil untuk per-baris)
+    CACHES['fragments']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('FRAGMENT_CACHE_MAX_ENTRIES', '10000'))}
+if not FRAGMENT_CACHE_ENABLED:
+    CACHES['fragments'] = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+
+# Cache session (SESSION_STRATEGY cached_db / cache) juga alias terpisah, supaya session
+# tidak di-cull bersama entry response cache / fragment dan clear() cache 'default' tidak
+# me-logout semua user.
+SESSION_CACHE_LOCATIONS = {
+    'locmem': 'sigma-app-sessions',
+    'file': str(BASE_DIR / '.django_cache' / 'sessions'),
+}
+CACHES['sessions'] = {
+    'BACKEND': CACHES['default']['BACKEND'],
+    'LOCATION': SESSION_CACHE_LOCATIONS.get(CACHE_BACKEND, CACHES['default']['LOCATION']),
+    'KEY_PREFIX': CACHES['default']['KEY_PREFIX'] + '_sessions',
+}
+if CACHE_BACKEND in SESSION_CACHE_LOCATIONS:
+    CACHES['sessions']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('SESSION_CACHE_MAX_ENTRIES', '10000'))}
 
 
 # Password validation
@@ -220,3 +285,121 @@ SESSION_COOKIE_SAMESITE = 'None' if PRODUCTION else 'Lax'
 # Make cookies accessible to JavaScript (needed for mobile apps)
 CSRF_COOKIE_HTTPONLY = False
 SESSION_COOKIE_HTTPONLY = False
+
+# ===== Session Strategy =====
+# SESSION_STRATEGY:
+#   db             setiap request terautentikasi membaca tabel django_session (default Django)
+#   cached_db      baca dari cache (SESSION_CACHE_ALIAS), DB hanya saat cache miss / menulis
+#   cache          hanya cache, session hilang jika cache di-restart / penuh; butuh backend
+#                  cache bersama (bukan locmem, yang per proses)
+#   signed_cookies data session disimpan di cookie yang ditandatangani, tanpa storage server
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_STRATEGY = os.getenv('SESSION_STRATEGY', 'db').lower()
+if SESSION_STRATEGY not in SESSION_ENGINES:
+    raise ImproperlyConfigured(
+        f"SESSION_STRATEGY tidak dikenal: {SESSION_STRATEGY!r} (pilih {', '.join(SESSION_ENGINES)})"
+    )
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STRATEGY]
+SESSION_CACHE_ALIAS = os.getenv('SESSION_CACHE_ALIAS', 'sessions')
+if SESSION_CACHE_ALIAS not in CACHES:
+    raise ImproperlyConfigured(f"SESSION_CACHE_ALIAS tidak ada di CACHES: {SESSION_CACHE_ALIAS!r}")
+if SESSION_STRATEGY == 'cache' and CACHES[SESSION_CACHE_ALIAS]['BACKEND'] == CACHE_BACKENDS['locmem']:
+    # locmem per proses: user yang login di satu worker dianggap logout di worker lain
+    raise ImproperlyConfigured(
+        "SESSION_STRATEGY=cache butuh cache bersama (CACHE_BACKEND=redis / memcached / file), bukan locmem"
+    )
+
+# Token API Flutter (sigma_app/api_tokens.py): masa berlaku dalam detik (default 30 hari)
+API_TOKEN_MAX_AGE = int(os.getenv('API_TOKEN_MAX_AGE', str(60 * 60 * 24 * 30)))
+
+# ===== Performance Instrumentation =====
+# True saat menjalankan `python manage.py test`
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
+# QueryInstrumentationMiddleware: catat jumlah query, waktu DB dan waktu view per request
+QUERY_INSTRUMENTATION_ENABLED = os.getenv('QUERY_INSTRUMENTATION', 'True').lower() == 'true'
+
+# Budget jumlah query per view (key: nama URL 'namespace:name').
+# Angka sudah termasuk query session + user dari AuthenticationMiddleware.
+QUERY_BUDGETS = {
+    # Leaderboard
+    'leaderboard:leaderboard': 4,
+    'leaderboard:leaderboard_api': 4,
+    'leaderboard:points_history': 4,
+    'leaderboard:points_dashboard': 7,
+    'leaderboard:achievements': 4,
+    'leaderboard:flutter_points_dashboard': 6,
+    'leaderboard:flutter_leaderboard': 4,
+    'leaderboard:flutter_points_history': 5,
+    # Partner matching
+    'partner_matching:browse_user_api': 6,
+    'partner_matching:people_you_may_know_api': 7,
+    'partner_matching:connection_statuses_api': 4,
+    'partner_matching:user_profile_detail_api': 7,
+    # Event discovery
+    'event_discovery:show_json': 3,
+    'event_discovery:event_detail': 4,
+    # Reviews (submit massal memakai bulk_create, tidak tergantung jumlah peserta)
+    'reviews:event-reviews': 18,
+    'reviews:ajax-create-event-reviews': 19,
+    'reviews:get_my_reviews_json': 4,
+    'reviews:get_user_reviews_json': 4,
+}
+
+# Saat test, request yang melebihi budget langsung gagal (raise QueryBudgetExceeded).
+# Di luar test hanya dicatat sebagai warning di log.
+QUERY_BUDGET_ENFORCE = TESTING or os.getenv('QUERY_BUDGET_ENFORCE', 'False').lower() == 'true'
+
+# View async (ASGI): query independen di run_queries dijalankan paralel di thread dan koneksi
+# database masing-masing. Hanya aktifkan untuk PostgreSQL (SQLite mengunci seluruh file,
+# dan test memakai transaksi yang tidak terlihat dari koneksi lain).
+ASYNC_PARALLEL_QUERIES = (
+    not TESTING
+    and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+    and os.getenv('ASYNC_PARALLEL_QUERIES', 'False').lower() == 'true'
+)
+
+# CompressionMiddleware: response lebih kecil dari ini (byte) tidak dikompres
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+# Quality brotli untuk response dinamis (0-11, makin tinggi makin kecil tapi lambat)
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '4'))
+
+# Response cache untuk endpoint publik (lihat sigma_app/response_cache.py).
+# Dimatikan saat test supaya response tidak terbawa antar test (cache tidak ikut rollback).
+RESPONSE_CACHE_ENABLED = not TESTING and os.getenv('RESPONSE_CACHE', 'True').lower() == 'true'
+RESPONSE_CACHE_ALIAS = 'default'
+
+# ReadReplicaRouter: alias database replica. Saat test tidak dipakai (replica adalah
+# mirror dari test database, dan TestCase hanya mengizinkan query ke 'default').
+READ_REPLICA_ALIAS = None if TESTING else 'replica'
+# Lama (detik) klien tetap membaca dari primary setelah menulis, menutup replication lag
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {
+            'format': '%(levelname)s %(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'plain',
+        },
+    },
+    'loggers': {
+        # Satu baris JSON per request, set PERFORMANCE_LOG_LEVEL=WARNING untuk hanya log pelanggaran budget
+        'sigma_app.performance': {
+            'handlers': ['console'],
+            'level': os.getenv('PERFORMANCE_LOG_LEVEL', 'WARNING' if TESTING else 'INFO'),
+            'propagate': False,
+        },
+    },
+}
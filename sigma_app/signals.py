@@ -0,0 +1,49 @@
+"""
+Signals untuk invalidasi response cache (lihat response_cache.py).
+
+Setiap penulisan model menaikkan versi tag yang datanya dipakai endpoint ter-cache.
+Jalur bulk_create / queryset.update() tidak memicu signal ini dan harus memanggil
+invalidate_tags sendiri (lihat refresh_total_points dan loadgen).
+"""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from authentication.models import UserProfile, SportPreference
+from event_discovery.models import Event, EventParticipant
+from leaderboard.models import PointTransaction
+from partner_matching.models import Connection
+from sigma_app.response_cache import invalidate_tags
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=EventParticipant)
+def invalidate_events_cache(sender, **kwargs):
+    invalidate_tags('events')
+
+
+@receiver([post_save, post_delete], sender=PointTransaction)
+def invalidate_points_cache(sender, **kwargs):
+    invalidate_tags('points')
+
+
+@receiver([post_save, post_delete], sender=Connection)
+@receiver([post_save, post_delete], sender=SportPreference)
+def invalidate_connections_cache(sender, **kwargs):
+    invalidate_tags('connections')
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_user_data_cache(sender, **kwargs):
+    """Nama, kota, foto, dan poin user tampil di leaderboard dan daftar teman."""
+    invalidate_tags('points', 'connections')
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_username_cache(sender, update_fields=None, **kwargs):
+    """Username tampil di leaderboard, daftar teman, dan organizer event."""
+    # Login hanya mengubah last_login (update_last_login), tidak perlu invalidasi
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_tags('points', 'connections', 'events')
@@ -14,8 +14,14 @@ With custom size and color:
 
 With CSS classes:
 {% icon 'plus' class='my-custom-class' %}
+
+Sprite sheet (list panjang, path icon hanya ditulis sekali per halaman):
+{% icon_sprite 'user' 'eye' %}
+{% icon_use 'user' size='sm' color='white' %}
 """
 
+from functools import lru_cache
+
 from django import template
 from django.utils.safestring import mark_safe
 
@@ -101,6 +107,60 @@ class IconRegistry:
     }
 
 
+# Jumlah kombinasi (name, size, color, class, attrs) yang disimpan hasil render-nya
+ICON_CACHE_SIZE = 512
+
+
+def _resolve_size(size):
+    if size in IconRegistry.SIZE_PRESETS:
+        return IconRegistry.SIZE_PRESETS[size]
+    try:
+        return int(size)
+    except (ValueError, TypeError):
+        return 24
+
+
+def _resolve_color(color):
+    return IconRegistry.COLOR_PRESETS.get(color, color)
+
+
+def _attrs_string(attrs):
+    return ''.join(f' {key.replace("_", "-")}="{value}"' for key, value, *_ in attrs)
+
+
+@lru_cache(maxsize=ICON_CACHE_SIZE, typed=True)
+def _render_icon(name, size, color, css_class, attrs):
+    """Render SVG lengkap; hasil (SafeString, immutable) di-memoize per kombinasi argumen."""
+    if name not in IconRegistry.ICONS:
+        return mark_safe(f'<!-- Icon "{name}" not found -->')
+
+    size_value = _resolve_size(size)
+    class_str = f' class="{css_class}"' if css_class else ''
+
+    # Get icon path and replace currentColor
+    icon_path = IconRegistry.ICONS[name].replace('currentColor', _resolve_color(color))
+
+    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" width="{size_value}" height="{size_value}" viewBox="0 0 24 24" fill="none"{class_str}{_attrs_string(attrs)}>
+  {icon_path}
+</svg>'''
+
+    return mark_safe(svg)
+
+
+def _cache_key_args(size, color, css_class, kwargs):
+    """
+    Argumen sebagai key lru_cache, atau None jika ada nilai yang tidak bisa di-hash
+    (misalnya list dari context template) sehingga render dilakukan tanpa cache.
+    Tipe nilai attribute ikut di key karena 1 == True tetapi dirender berbeda.
+    """
+    args = (size, color, css_class, tuple((key, value, type(value)) for key, value in kwargs.items()))
+    try:
+        hash(args)
+    except TypeError:
+        return None
+    return args
+
+
 @register.simple_tag
 def icon(name, size='md', color='primary', css_class='', **kwargs):
     """
@@ -116,41 +176,68 @@ def icon(name, size='md', color='primary', css_class='', **kwargs):
     Returns:
         Safe HTML string containing the SVG icon
     """
+    args = _cache_key_args(size, color, css_class, kwargs)
+    if args is None:
+        return _render_icon.__wrapped__(name, size, color, css_class, tuple(kwargs.items()))
+    return _render_icon(name, *args)
+
+
+# ===== Sprite sheet =====
+# Untuk halaman dengan banyak icon berulang (baris leaderboard, kartu event): path setiap icon
+# ditulis sekali di {% icon_sprite %}, lalu setiap icon hanya <svg><use href="#icon-..."></svg>.
+# Warna diturunkan lewat CSS `color` karena path memakai fill="currentColor".
+#
+#   {% icon_sprite 'user' 'eye' %}      (sekali per halaman, sebelum / sesudah list)
+#   {% icon_use 'user' size='sm' color='white' %}
+
+SPRITE_ID_PREFIX = 'icon-'
+
+
+@lru_cache(maxsize=None)
+def _render_sprite(names):
+    symbols = ''.join(
+        f'<symbol id="{SPRITE_ID_PREFIX}{name}" viewBox="0 0 24 24">{IconRegistry.ICONS[name]}</symbol>'
+        for name in names if name in IconRegistry.ICONS
+    )
+    return mark_safe(
+        '<svg xmlns="http://www.w3.org/2000/svg" aria-hidden="true" style="display:none">'
+        f'{symbols}</svg>'
+    )
+
+
+@register.simple_tag
+def icon_sprite(*names):
+    """
+    Render sprite sheet berisi <symbol> untuk icon yang disebut (semua icon jika kosong).
+    Pasang sekali per halaman; icon_use di halaman yang sama mereferensikannya.
+    """
+    return _render_sprite(tuple(dict.fromkeys(names)) or tuple(IconRegistry.ICONS))
+
+
+@lru_cache(maxsize=ICON_CACHE_SIZE, typed=True)
+def _render_icon_use(name, size, color, css_class, attrs):
     if name not in IconRegistry.ICONS:
         return mark_safe(f'<!-- Icon "{name}" not found -->')
-    
-    # Resolve size
-    if size in IconRegistry.SIZE_PRESETS:
-        size_value = IconRegistry.SIZE_PRESETS[size]
-    else:
-        try:
-            size_value = int(size)
-        except (ValueError, TypeError):
-            size_value = 24
-    
-    # Resolve color
-    if color in IconRegistry.COLOR_PRESETS:
-        color_value = IconRegistry.COLOR_PRESETS[color]
-    else:
-        color_value = color
-    
-    # Build additional attributes
-    attrs = []
-    for key, value in kwargs.items():
-        attr_name = key.replace('_', '-')
-        attrs.append(f'{attr_name}="{value}"')
-    
-    attrs_str = ' ' + ' '.join(attrs) if attrs else ''
+
+    size_value = _resolve_size(size)
     class_str = f' class="{css_class}"' if css_class else ''
-    
-    # Get icon path and replace currentColor
-    icon_path = IconRegistry.ICONS[name].replace('currentColor', color_value)
-    
-    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" width="{size_value}" height="{size_value}" viewBox="0 0 24 24" fill="none"{class_str}{attrs_str}>
-  {icon_path}
-</svg>'''
-    
-    return mark_safe(svg)
+    return mark_safe(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size_value}" height="{size_value}" '
+        f'viewBox="0 0 24 24" style="color:{_resolve_color(color)}"{class_str}{_attrs_string(attrs)}>'
+        f'<use href="#{SPRITE_ID_PREFIX}{name}"/></svg>'
+    )
+
+
+@register.simple_tag
+def icon_use(name, size='md', color='primary', css_class='', **kwargs):
+    """
+    Render icon sebagai referensi ke sprite sheet ({% icon_sprite %} harus ada di halaman).
+    Argumen sama dengan icon.
+    """
+    args = _cache_key_args(size, color, css_class, kwargs)
+    if args is None:
+        return _render_icon_use.__wrapped__(name, size, color, css_class, tuple(kwargs.items()))
+    return _render_icon_use(name, *args)
 
 
 @register.simple_tag
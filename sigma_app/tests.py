@@ -0,0 +1,908 @@
+import json
+
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from sigma_app.benchmarks import compare_reports, run_endpoint_benchmarks
+from sigma_app.loadgen import LOAD_USER_PREFIX, LoadDataConfig, flush_load_data, generate_load_data
+from sigma_app.middleware import QueryBudgetExceeded
+
+
+class QueryInstrumentationMiddlewareTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="perf", password="123")
+        self.url = reverse('leaderboard:leaderboard_api')
+
+    def test_server_timing_header(self):
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, 200)
+        header = res['Server-Timing']
+        self.assertIn('db;dur=', header)
+        self.assertIn('queries"', header)
+        self.assertIn('view;dur=', header)
+        self.assertIn('total;dur=', header)
+
+    def test_structured_log_line(self):
+        with self.assertLogs('sigma_app.performance', level='INFO') as logs:
+            self.client.get(self.url)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['event'], 'request_metrics')
+        self.assertEqual(record['view'], 'leaderboard:leaderboard_api')
+        self.assertEqual(record['status'], 200)
+        self.assertGreaterEqual(record['queries'], 1)
+
+    @override_settings(QUERY_BUDGETS={'leaderboard:leaderboard_api': 0}, QUERY_BUDGET_ENFORCE=True)
+    def test_budget_exceeded_fails_when_enforced(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(self.url)
+
+    @override_settings(QUERY_BUDGETS={'leaderboard:leaderboard_api': 0}, QUERY_BUDGET_ENFORCE=False)
+    def test_budget_exceeded_only_warns_when_not_enforced(self):
+        with self.assertLogs('sigma_app.performance', level='WARNING') as logs:
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, 200)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['event'], 'query_budget_exceeded')
+        self.assertEqual(record['query_budget'], 0)
+
+    @override_settings(QUERY_INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self):
+        res = self.client.get(self.url)
+        self.assertFalse(res.has_header('Server-Timing'))
+
+
+class LoadDataGeneratorTest(TestCase):
+    config = LoadDataConfig(users=30, participants_per_event=5, connections_per_user=4, transactions_per_user=2)
+
+    def test_generates_consistent_dataset(self):
+        from authentication.models import UserProfile
+        from leaderboard.models import PointTransaction
+        from reviews.models import Review, UserRating
+        from django.db.models import Sum
+
+        counts = generate_load_data(self.config)
+
+        self.assertEqual(counts['users'], 30)
+        self.assertEqual(UserProfile.objects.filter(user__username__startswith=LOAD_USER_PREFIX).count(), 30)
+        self.assertEqual(Review.objects.count(), counts['reviews'])
+        self.assertEqual(UserRating.objects.count(), 30)
+
+        # total_points hasil generate harus sama dengan jumlah transaksi
+        profile = UserProfile.objects.get(user__username=f"{LOAD_USER_PREFIX}000000")
+        expected = PointTransaction.objects.filter(user=profile.user).aggregate(total=Sum('points'))['total']
+        self.assertEqual(profile.total_points, expected)
+
+    def test_same_seed_is_deterministic(self):
+        from partner_matching.models import Connection
+
+        first = generate_load_data(self.config)
+        first_pairs = sorted(
+            Connection.objects.values_list('from_user__username', 'to_user__username', 'status')
+        )
+        flush_load_data()
+        second = generate_load_data(self.config)
+        second_pairs = sorted(
+            Connection.objects.values_list('from_user__username', 'to_user__username', 'status')
+        )
+
+        self.assertEqual(first, second)
+        self.assertEqual(first_pairs, second_pairs)
+
+
+class BenchmarkSuiteTest(TestCase):
+    def test_run_endpoint_benchmarks(self):
+        generate_load_data(LoadDataConfig(users=10, connections_per_user=3, transactions_per_user=1))
+        self.client.force_login(User.objects.get(username=f"{LOAD_USER_PREFIX}000000"))
+
+        results = run_endpoint_benchmarks(
+            self.client, endpoints=[('leaderboard_api', 'leaderboard:leaderboard_api')], repeat=2
+        )
+
+        result = results['leaderboard_api']
+        self.assertEqual(result['status'], 200)
+        self.assertGreater(result['queries'], 0)
+        self.assertLessEqual(result['min_ms'], result['median_ms'])
+        # Bytes on wire diukur dengan Accept-Encoding
+        self.assertIsNotNone(result['encoding'])
+        self.assertLess(result['wire_bytes'], result['bytes'])
+
+    def test_compare_reports(self):
+        previous = {'scales': {'100': {'endpoints': {'show_json': {'median_ms': 10.0, 'queries': 5}}}}}
+        current = {'scales': {
+            '100': {'endpoints': {'show_json': {'median_ms': 12.0, 'queries': 1}}},
+            '1000': {'endpoints': {'show_json': {'median_ms': 30.0, 'queries': 1}}},
+        }}
+
+        rows = compare_reports(previous, current)
+
+        self.assertEqual(rows, [('100', 'show_json', 10.0, 12.0, 20.0, 5, 1)])
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SeedUsersCommandTest(TestCase):
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.users_csv = Path(self.tmp.name) / "users.csv"
+        self.sports_csv = Path(self.tmp.name) / "sports.csv"
+        self.users_csv.write_text(
+            "username,full_name,email,password,bio,city,profile_image_url,total_points,total_events\n"
+            "alice,Alice Wijaya,alice@example.com,pass-a,Halo,depok,,10,2\n"
+            "bob,Bob Santoso,bob@example.com,pass-b,Halo,bogor,,0,0\n"
+            ",No Name,,pass,Halo,depok,,0,0\n"
+        )
+        self.sports_csv.write_text(
+            "username,sport_type,skill_level\n"
+            "alice,running,advanced\n"
+            "alice,cycling,beginner\n"
+            "bob,football,intermediate\n"
+            "ghost,football,beginner\n"
+        )
+
+    def seed(self, **options):
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command(
+            'seed_users', users_csv=str(self.users_csv), sports_csv=str(self.sports_csv),
+            workers=1, stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_bulk_seed(self):
+        from authentication.models import SportPreference
+
+        output = self.seed(batch_size=1)
+
+        alice = User.objects.get(username='alice')
+        self.assertTrue(alice.check_password('pass-a'))
+        self.assertEqual(alice.first_name, 'Alice')
+        self.assertEqual(alice.profile.total_points, 10)
+        self.assertEqual(alice.profile.search_key, 'alice alice wijaya')
+        self.assertEqual(SportPreference.objects.filter(user=alice).count(), 2)
+        self.assertEqual(SportPreference.objects.count(), 3)
+        self.assertIn('users/s', output)
+
+    def test_hash_pool_created_once_for_all_chunks(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from io import StringIO
+        from unittest.mock import patch
+        from django.core.management import call_command
+
+        with patch('sigma_app.password_hashing.ProcessPoolExecutor',
+                   side_effect=lambda max_workers, initializer: ThreadPoolExecutor(max_workers)) as executor:
+            call_command(
+                'seed_users', users_csv=str(self.users_csv), sports_csv=str(self.sports_csv),
+                workers=2, batch_size=1, stdout=StringIO()
+            )
+        executor.assert_called_once()
+        self.assertTrue(User.objects.get(username='bob').check_password('pass-b'))
+
+    def test_rerun_skips_existing(self):
+        from authentication.models import SportPreference
+
+        self.seed()
+        output = self.seed()
+
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(SportPreference.objects.count(), 3)
+        self.assertIn('0 created', output)
+
+
+class QueryIndexUsageTest(TestCase):
+    """
+    Query utama harus memakai index komposit dari Meta.indexes (dicek lewat EXPLAIN).
+    Di PostgreSQL seq scan dimatikan dulu, karena tabel test terlalu kecil sehingga
+    planner selalu memilih seq scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='indexed', password='x')
+
+    def setUp(self):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest('EXPLAIN format hanya dicek untuk SQLite dan PostgreSQL')
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_point_transaction_indexes(self):
+        from leaderboard.models import PointTransaction
+
+        self.assertUsesIndex(
+            PointTransaction.objects.filter(user=self.user).order_by('-created_at'), 'pt_user_created_idx'
+        )
+        # Halaman history (cursor pagination) dengan dan tanpa filter activity
+        history = PointTransaction.objects.filter(user=self.user, activity_type='event_join')
+        self.assertUsesIndex(history.order_by('-created_at', '-id')[:21], 'pt_user_created_idx')
+        # Tanpa ordering, seperti query count()/aggregate() per activity_type
+        self.assertUsesIndex(
+            PointTransaction.objects.filter(user=self.user, activity_type='event_complete').order_by(),
+            'pt_user_activity_event_idx'
+        )
+        self.assertUsesIndex(
+            PointTransaction.objects.filter(
+                user=self.user, activity_type='event_join', related_event_id=1
+            ).order_by(),
+            'pt_user_activity_event_idx'
+        )
+
+    def test_event_participant_indexes(self):
+        from event_discovery.models import EventParticipant
+
+        self.assertUsesIndex(
+            EventParticipant.objects.filter(user=self.user, status='attended'), 'participant_user_status_idx'
+        )
+        self.assertUsesIndex(
+            EventParticipant.objects.filter(event_id=1, status='attended'), 'participant_event_status_idx'
+        )
+
+    def test_event_indexes(self):
+        from event_discovery.models import Event
+
+        self.assertUsesIndex(
+            Event.objects.filter(event_date__gte=date.today()).order_by('event_date', 'start_time'),
+            'event_date_start_idx'
+        )
+        self.assertUsesIndex(
+            Event.objects.filter(organizer=self.user, event_date__gte=date.today()), 'event_organizer_date_idx'
+        )
+
+    def test_connection_and_profile_indexes(self):
+        from authentication.models import UserProfile
+        from partner_matching.models import Connection
+
+        self.assertUsesIndex(
+            Connection.objects.filter(to_user=self.user, status='pending'), 'connection_to_status_idx'
+        )
+        self.assertUsesIndex(UserProfile.objects.order_by('-total_points')[:10], 'profile_total_points_idx')
+
+
+class ConditionalResponseTest(TestCase):
+    """ETag / Last-Modified untuk endpoint JSON yang di-poll aplikasi Flutter"""
+
+    def setUp(self):
+        from django.utils import timezone
+        from datetime import timedelta
+        from event_discovery.models import Event
+
+        self.user = User.objects.create_user(username='poller', password='x')
+        self.client.force_login(self.user)
+        self.event = Event.objects.create(
+            organizer=self.user, title='Futsal Malam', description='Futsal', sport_type='football',
+            event_date=timezone.now().date() + timedelta(days=3), start_time='19:00', end_time='21:00',
+            city='depok', location_name='GOR', max_participants=10
+        )
+
+    def _revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_show_json_not_modified_until_event_changes(self):
+        url = reverse('event_discovery:show_json')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('public', first['Cache-Control'])
+        self.assertIn('Last-Modified', first)
+
+        # 304 dijawab hanya dengan query stamp, tanpa query daftar event
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            cached = self._revalidate(url, first)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], first['ETag'])
+        self.assertEqual(sum('event_discovery_event' in query['sql'] for query in ctx.captured_queries), 1)
+
+        self.event.title = 'Futsal Pagi'
+        self.event.save()
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+    def test_show_json_detects_deleted_event(self):
+        url = reverse('event_discovery:show_json')
+        first = self.client.get(url)
+        self.event.delete()
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+    def test_if_modified_since_alone_never_returns_stale_304(self):
+        # MAX(updated_at) tidak berubah setelah penghapusan, jadi If-Modified-Since diabaikan
+        url = reverse('event_discovery:show_json')
+        first = self.client.get(url)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, 200
+        )
+        self.event.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_leaderboard_etag_changes_with_points(self):
+        from leaderboard.models import PointTransaction
+
+        url = reverse('leaderboard:flutter_leaderboard')
+        first = self.client.get(url)
+        self.assertIn('private', first['Cache-Control'])
+        self.assertEqual(self._revalidate(url, first).status_code, 304)
+
+        PointTransaction.objects.create(user=self.user, activity_type='review_given', points=5, description='x')
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+    def test_connections_etag_changes_with_connection(self):
+        from partner_matching.models import Connection
+
+        url = reverse('partner_matching:connections_api')
+        first = self.client.get(url)
+        self.assertEqual(self._revalidate(url, first).status_code, 304)
+
+        other = User.objects.create_user(username='other', password='x')
+        Connection.objects.create(from_user=other, to_user=self.user)
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+    def test_flutter_profile_etag_changes_with_sport_preference(self):
+        from authentication.models import SportPreference
+
+        url = reverse('authentication:flutter_profile')
+        first = self.client.get(url)
+        self.assertEqual(self._revalidate(url, first).status_code, 304)
+
+        SportPreference.objects.create(user=self.user, sport_type='tennis', skill_level='beginner')
+        self.assertEqual(self._revalidate(url, first).status_code, 200)
+
+    def test_unauthenticated_profile_skips_conditional(self):
+        self.client.logout()
+        response = self.client.get(reverse('authentication:flutter_profile'))
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn('ETag', response)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTest(TestCase):
+    """Response cache endpoint publik dengan invalidasi per tag"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = User.objects.create_user(username='pelari', password='x')
+
+    def test_anonymous_leaderboard_is_cached_per_period(self):
+        url = reverse('leaderboard:leaderboard_api')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        # Param lain (yang tidak relevan) tidak memecah cache, param periode memecah cache
+        self.assertEqual(self.client.get(url, {'utm': 'x'})['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(url, {'period': 'weekly'})['X-Cache'], 'MISS')
+
+    def test_points_write_invalidates_leaderboard(self):
+        from leaderboard.models import PointTransaction
+
+        url = reverse('leaderboard:leaderboard_api')
+        self.client.get(url)
+        PointTransaction.objects.create(user=self.user, activity_type='event_join', points=10)
+
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.user.profile.refresh_from_db()
+        self.assertEqual(response.json()['users'][0]['total_points'], self.user.profile.total_points)
+        self.assertGreater(self.user.profile.total_points, 0)
+
+    def test_authenticated_user_bypasses_anonymous_only_cache(self):
+        url = reverse('leaderboard:leaderboard')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual(response.context['current_user_rank'], 1)
+
+    def test_show_json_invalidated_by_event_write(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from event_discovery.models import Event
+
+        url = reverse('event_discovery:show_json')
+        self.assertEqual(self.client.get(url).json(), [])
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        Event.objects.create(
+            organizer=self.user, title='Lari Pagi', description='Lari', sport_type='running',
+            event_date=timezone.now().date() + timedelta(days=2), start_time='06:00', end_time='08:00',
+            city='jakarta', location_name='GBK', max_participants=20
+        )
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json()), 1)
+
+    def test_public_connections_invalidated_by_connection_write(self):
+        from partner_matching.models import Connection
+
+        friend = User.objects.create_user(username='teman', password='x')
+        viewer = User.objects.create_user(username='tamu', password='x')
+        url = reverse('partner_matching:public_connections_api', args=[self.user.id])
+
+        self.client.force_login(viewer)
+        self.assertEqual(self.client.get(url).json()['my_friends'], [])
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        Connection.objects.create(from_user=self.user, to_user=friend, status='accepted')
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([item['username'] for item in response.json()['my_friends']], ['teman'])
+
+    def test_filter_options_cached_without_queries(self):
+        url = reverse('partner_matching:filter_options_api')
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Content-Type'], 'application/json')
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_disabled_cache_passes_through(self):
+        response = self.client.get(reverse('leaderboard:leaderboard_api'))
+        self.assertNotIn('X-Cache', response)
+
+
+class FastJsonResponseTest(TestCase):
+    """sigma_app.json_response.JsonResponse sebagai pengganti django.http.JsonResponse"""
+
+    def test_serializes_same_types_as_django_encoder(self):
+        import uuid
+        from datetime import datetime, timezone as dt_timezone
+        from decimal import Decimal
+        from sigma_app.json_response import JsonResponse
+
+        data = {
+            'when': datetime(2025, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+            'day': date(2025, 1, 2),
+            'id': uuid.UUID(int=1),
+            'rating': Decimal('4.50'),
+            'statuses': {7: 'accepted'},
+            'name': 'Sepak Bola Ceria ⚽',
+        }
+        response = JsonResponse(data)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), {
+            'when': '2025-01-02T03:04:05Z',
+            'day': '2025-01-02',
+            'id': '00000000-0000-0000-0000-000000000001',
+            'rating': '4.50',
+            'statuses': {'7': 'accepted'},
+            'name': 'Sepak Bola Ceria ⚽',
+        })
+
+    def test_safe_rejects_non_dict(self):
+        from sigma_app.json_response import JsonResponse
+
+        with self.assertRaises(TypeError):
+            JsonResponse([1, 2])
+        self.assertEqual(json.loads(JsonResponse([1, 2], safe=False).content), [1, 2])
+
+    def test_json_dumps_params_use_stdlib_path(self):
+        from sigma_app.json_response import JsonResponse
+
+        response = JsonResponse({'a': 1}, json_dumps_params={'indent': 2})
+        self.assertEqual(response.content, b'{\n  "a": 1\n}')
+
+    def test_json_micro_benchmark(self):
+        from sigma_app.benchmarks import run_json_benchmarks
+
+        results = run_json_benchmarks(rows=[10], repeat=2)
+        self.assertEqual(set(results['10']), {'leaderboard', 'events', 'connections'})
+        for result in results['10'].values():
+            self.assertGreater(result['fast']['bytes'], 0)
+            self.assertIn('speedup', result)
+
+
+class CompressionMiddlewareTest(TestCase):
+    """Kompresi gzip/brotli untuk response dinamis"""
+
+    def _get(self, response, accept_encoding='gzip'):
+        from django.test import RequestFactory
+        from sigma_app.compression import CompressionMiddleware
+
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_choose_encoding_respects_quality(self):
+        from sigma_app import compression
+
+        self.assertEqual(compression.choose_encoding('gzip, deflate'), 'gzip')
+        self.assertIsNone(compression.choose_encoding('gzip;q=0, identity'))
+        self.assertIsNone(compression.choose_encoding(''))
+        expected = 'br' if compression.brotli is not None else 'gzip'
+        self.assertEqual(compression.choose_encoding('gzip;q=0.5, br'), expected)
+
+    def test_large_json_is_gzipped(self):
+        import gzip
+        from sigma_app.json_response import JsonResponse
+
+        data = {'users': [{'username': f'user_{index}', 'points': index} for index in range(200)]}
+        response = self._get(JsonResponse(data))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), data)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+    def test_small_or_binary_response_not_compressed(self):
+        from django.http import HttpResponse
+
+        small = self._get(HttpResponse('{"ok": true}', content_type='application/json'))
+        self.assertNotIn('Content-Encoding', small)
+
+        image = self._get(HttpResponse(b'x' * 5000, content_type='image/jpeg'))
+        self.assertNotIn('Content-Encoding', image)
+
+    def test_streaming_response_compressed_incrementally(self):
+        import gzip
+        from django.http import StreamingHttpResponse
+
+        chunks = [b'{"row": %d}\n' % index * 50 for index in range(20)]
+        response = self._get(StreamingHttpResponse(iter(chunks), content_type='application/json'))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(chunks))
+
+    def test_strong_etag_becomes_weak_and_still_revalidates(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from event_discovery.models import Event
+
+        user = User.objects.create_user(username='kompres', password='x')
+        for index in range(10):
+            Event.objects.create(
+                organizer=user, title=f'Badminton {index}', description='Main badminton ' * 10,
+                sport_type='badminton', event_date=timezone.now().date() + timedelta(days=2),
+                start_time='19:00', end_time='21:00', city='jakarta', location_name='GOR',
+                max_participants=8
+            )
+        url = reverse('event_discovery:show_json')
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+        revalidated = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+
+class AsyncViewTest(TestCase):
+    """Endpoint Flutter async lewat ASGI handler (AsyncClient)"""
+
+    def setUp(self):
+        from leaderboard.models import PointTransaction
+
+        self.user = User.objects.create_user(username='async_user', password='x')
+        PointTransaction.objects.create(user=self.user, activity_type='event_join', points=10)
+
+    async def test_points_dashboard_via_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('leaderboard:flutter_points_dashboard'))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['current_rank'], 1)
+        self.assertGreaterEqual(data['breakdown']['event_join']['count'], 1)
+        # Query dari view async tetap terhitung oleh QueryInstrumentationMiddleware
+        self.assertNotIn('desc="0 queries"', response['Server-Timing'])
+
+    async def test_flutter_profile_via_asgi_requires_login(self):
+        response = await self.async_client.get(reverse('authentication:flutter_profile'))
+        self.assertEqual(response.status_code, 401)
+
+    async def test_run_queries_keeps_order(self):
+        from sigma_app.async_utils import run_queries
+
+        self.assertEqual(await run_queries(lambda: 1, lambda: 2), [1, 2])
+        with self.settings(ASYNC_PARALLEL_QUERIES=True):
+            self.assertEqual(list(await run_queries(lambda: 'a', lambda: 'b')), ['a', 'b'])
+
+    async def test_fetch_url_uses_thread_pool_session_outside_asgi_server(self):
+        # Tanpa sigma_app/asgi.py (WSGI, test) tidak ada httpx.AsyncClient per loop yang bocor
+        from unittest.mock import patch
+        from sigma_app import async_utils
+
+        result = async_utils.FetchResult(200, b'ok', 'text/plain')
+        with patch.object(async_utils, '_async_client_enabled', False), \
+                patch.object(async_utils, '_fetch_sync', return_value=result) as fetch_sync:
+            self.assertEqual(await async_utils.fetch_url('https://example.com/a.png', timeout=3), result)
+        fetch_sync.assert_called_once_with('https://example.com/a.png', 3)
+        self.assertEqual(len(async_utils._async_clients), 0)
+
+
+class DatabaseConfigTest(TestCase):
+    """DATABASES dari environment (sigma_app/db_config.py)"""
+
+    def _config(self, production=False, **env):
+        import os
+        from pathlib import Path
+        from unittest.mock import patch
+        from sigma_app.db_config import database_config
+
+        with patch.dict(os.environ, env, clear=False):
+            return database_config(Path('/tmp'), production=production)
+
+    def test_postgres_connection_age_and_statement_timeout(self):
+        config = self._config(production=True, DB_STATEMENT_TIMEOUT='5000', SCHEMA='sigma', DB_CONN_MAX_AGE='')
+
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        # Koneksi persisten tidak aman di ASGI, jadi harus diaktifkan eksplisit
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertEqual(self._config(production=True, DB_CONN_MAX_AGE='60')['CONN_MAX_AGE'], 60)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertEqual(config['OPTIONS']['options'], '-c search_path=sigma -c statement_timeout=5000')
+        self.assertNotIn('pool', config['OPTIONS'])
+
+    def test_pool_disables_persistent_connections(self):
+        from django.core.exceptions import ImproperlyConfigured
+        from sigma_app.db_config import psycopg3_available
+
+        if not psycopg3_available():
+            with self.assertRaises(ImproperlyConfigured):
+                self._config(production=True, DB_POOL='true')
+            return
+
+        config = self._config(production=True, DB_POOL='true', DB_POOL_MAX_SIZE='20')
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertEqual(config['OPTIONS']['pool']['max_size'], 20)
+
+    def test_sqlite_default_and_invalid_values(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        config = self._config(DB_ENGINE='', DB_CONN_MAX_AGE='')
+        self.assertEqual(config['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+
+        with self.assertRaises(ImproperlyConfigured):
+            self._config(DB_CONN_MAX_AGE='lama')
+        with self.assertRaises(ImproperlyConfigured):
+            self._config(DB_ENGINE='oracle')
+
+    def test_connection_benchmark_counts_connects(self):
+        from sigma_app.benchmarks import run_connection_benchmarks
+
+        results = run_connection_benchmarks(requests=5, queries=1)
+        self.assertEqual(results['persistent']['connects'], 1)
+        # SQLite in-memory (test database) tidak pernah benar-benar menutup koneksi
+        if connection.vendor != 'sqlite' or not connection.is_in_memory_db():
+            self.assertEqual(results['new_connection']['connects'], 5)
+
+    def test_replica_config_from_environment(self):
+        import os
+        from unittest.mock import patch
+        from sigma_app.db_config import replica_database_config
+
+        primary = self._config(production=True, DB_HOST='primary.db', DB_NAME='sigma')
+        with patch.dict(os.environ, {'DB_REPLICA_HOST': ''}):
+            self.assertIsNone(replica_database_config(primary))
+        with patch.dict(os.environ, {'DB_REPLICA_HOST': 'replica.db', 'DB_REPLICA_PORT': '6432'}):
+            replica = replica_database_config(primary)
+
+        self.assertEqual(replica['HOST'], 'replica.db')
+        self.assertEqual(replica['PORT'], '6432')
+        self.assertEqual(replica['NAME'], 'sigma')
+        self.assertEqual(replica['TEST'], {'MIRROR': 'default'})
+        self.assertEqual(primary['HOST'], 'primary.db')
+
+        sqlite_primary = self._config(DB_ENGINE='sqlite3')
+        with patch.dict(os.environ, {'SQLITE_REPLICA_PATH': '/tmp/replica.sqlite3'}):
+            self.assertEqual(replica_database_config(sqlite_primary)['NAME'], '/tmp/replica.sqlite3')
+
+
+class ReadReplicaRouterTest(TestCase):
+    """Routing baca ke replica dan pinning ke primary (sigma_app/db_router.py)"""
+
+    def setUp(self):
+        from unittest.mock import patch
+        from django.test import RequestFactory
+
+        patcher = patch('sigma_app.db_router.get_replica_alias', return_value='replica')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+
+    def _run(self, request, write=False):
+        """Jalankan middleware dengan view palsu, kembalikan (alias baca sebelum/sesudah tulis, response)."""
+        from django.http import HttpResponse
+        from sigma_app.db_router import ReadReplicaRouter, ReplicaPinningMiddleware
+
+        router = ReadReplicaRouter()
+        reads = []
+
+        def view(request):
+            reads.append(router.db_for_read(User))
+            if write:
+                self.assertEqual(router.db_for_write(User), 'default')
+                reads.append(router.db_for_read(User))
+            return HttpResponse('ok')
+
+        response = ReplicaPinningMiddleware(view)(request)
+        return reads, response
+
+    def test_outside_request_reads_primary(self):
+        from sigma_app.db_router import ReadReplicaRouter
+
+        self.assertEqual(ReadReplicaRouter().db_for_read(User), 'default')
+
+    def test_get_reads_replica(self):
+        from sigma_app.db_router import REPLICA_PIN_COOKIE
+
+        reads, response = self._run(self.factory.get('/'))
+        self.assertEqual(reads, ['replica'])
+        self.assertNotIn(REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_read_after_write_pinned_and_cookie_set(self):
+        from sigma_app.db_router import REPLICA_PIN_COOKIE
+
+        reads, response = self._run(self.factory.get('/'), write=True)
+        self.assertEqual(reads, ['replica', 'default'])
+        self.assertEqual(response.cookies[REPLICA_PIN_COOKIE]['max-age'], 5)
+
+    def test_post_and_pin_cookie_read_primary(self):
+        from sigma_app.db_router import REPLICA_PIN_COOKIE
+
+        reads, _ = self._run(self.factory.post('/'))
+        self.assertEqual(reads, ['default'])
+
+        request = self.factory.get('/')
+        request.COOKIES[REPLICA_PIN_COOKIE] = '1'
+        reads, _ = self._run(request)
+        self.assertEqual(reads, ['default'])
+
+    def test_use_primary_block(self):
+        from sigma_app.db_router import ReadReplicaRouter, routing_state, use_primary
+
+        router = ReadReplicaRouter()
+        with routing_state():
+            with use_primary():
+                self.assertEqual(router.db_for_read(User), 'default')
+            self.assertEqual(router.db_for_read(User), 'replica')
+
+    def test_replica_never_migrated(self):
+        from sigma_app.db_router import ReadReplicaRouter
+
+        router = ReadReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'leaderboard'))
+        self.assertFalse(router.allow_migrate('replica', 'leaderboard'))
+
+
+class SessionSettingsTest(SimpleTestCase):
+    """SESSION_STRATEGY / cache session di sigma_app/settings.py"""
+
+    def _load_settings(self, **env):
+        import os
+        import runpy
+        from unittest.mock import patch
+
+        with patch.dict(os.environ, env, clear=False):
+            os.environ.pop('SESSION_CACHE_ALIAS', None)
+            return runpy.run_path(os.path.join(os.path.dirname(__file__), 'settings.py'))
+
+    def test_sessions_use_own_cache_alias(self):
+        config = self._load_settings(SESSION_STRATEGY='cached_db', CACHE_BACKEND='locmem')
+        self.assertEqual(config['SESSION_CACHE_ALIAS'], 'sessions')
+        self.assertNotEqual(config['CACHES']['sessions']['LOCATION'], config['CACHES']['default']['LOCATION'])
+
+    def test_cache_strategy_rejects_locmem(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        with self.assertRaises(ImproperlyConfigured):
+            self._load_settings(SESSION_STRATEGY='cache', CACHE_BACKEND='locmem')
+        config = self._load_settings(SESSION_STRATEGY='cache', CACHE_BACKEND='file')
+        self.assertEqual(config['SESSION_ENGINE'], 'django.contrib.sessions.backends.cache')
+
+
+class CleanupSessionsCommandTest(TestCase):
+    def test_deletes_only_expired_sessions_in_batches(self):
+        from datetime import timedelta
+        from io import StringIO
+
+        from django.contrib.sessions.models import Session
+        from django.core.management import call_command
+        from django.utils import timezone
+
+        now = timezone.now()
+        for index in range(5):
+            Session.objects.create(session_key=f'expired{index}', session_data='', expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key='active', session_data='', expire_date=now + timedelta(days=1))
+
+        out = StringIO()
+        call_command('cleanup_sessions', '--dry-run', stdout=out)
+        self.assertIn('5 session', out.getvalue())
+        self.assertEqual(Session.objects.count(), 6)
+
+        out = StringIO()
+        call_command('cleanup_sessions', '--batch-size', '2', stdout=out)
+        self.assertIn('5 session kedaluwarsa dihapus', out.getvalue())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['active'])
+
+
+class IconTagsTest(TestCase):
+    """Render icon ter-memoize dan mode sprite (sigma_app/templatetags/icon_tags.py)"""
+
+    def test_icon_render_is_memoized(self):
+        from sigma_app.templatetags.icon_tags import _render_icon, icon
+
+        _render_icon.cache_clear()
+        first = icon('star', size='sm', color='white', aria_label='Rating')
+        second = icon('star', size='sm', color='white', aria_label='Rating')
+
+        self.assertIs(first, second)
+        self.assertEqual(_render_icon.cache_info().hits, 1)
+        self.assertIn('width="20"', first)
+        self.assertIn('fill="#FFFFFF"', first)
+        self.assertIn('aria-label="Rating"', first)
+        self.assertIn('not found', icon('tidak-ada'))
+
+    def test_unhashable_attribute_rendered_without_cache(self):
+        from sigma_app.templatetags.icon_tags import _render_icon, icon
+
+        _render_icon.cache_clear()
+        self.assertIn('data-ids="[1, 2]"', icon('user', data_ids=[1, 2]))
+        self.assertEqual(_render_icon.cache_info().currsize, 0)
+
+        # Nilai yang sama (1 == True) dengan tipe berbeda tidak berbagi hasil cache
+        self.assertIn('data-x="1"', icon('user', data_x=1))
+        self.assertIn('data-x="True"', icon('user', data_x=True))
+
+    def test_sprite_and_use(self):
+        from django.template import Context, Template
+
+        html = Template(
+            "{% load icon_tags %}{% icon_sprite 'eye' 'user' 'eye' %}"
+            "{% for i in rows %}{% icon_use 'user' size='sm' color='white' %}{% endfor %}"
+        ).render(Context({'rows': range(3)}))
+
+        self.assertEqual(html.count('<symbol id="icon-user"'), 1)
+        self.assertEqual(html.count('<symbol id="icon-eye"'), 1)
+        self.assertEqual(html.count('<use href="#icon-user"/>'), 3)
+        self.assertIn('style="color:#FFFFFF"', html)
+
+
+class TemplateFragmentCacheTest(TestCase):
+    """Fragment cache baris leaderboard (key memuat versi data, jadi tidak perlu invalidasi)"""
+
+    def setUp(self):
+        from django.core.cache import caches
+
+        self.fragments = caches['fragments']
+        self.fragments.clear()
+        self.user = User.objects.create_user(username='fragment_user', password='x')
+        self.profile = self.user.profile
+        self.profile.full_name = 'Nama Lama'
+        self.profile.save()
+
+    def _row_key(self, profile):
+        from django.core.cache.utils import make_template_fragment_key
+
+        return make_template_fragment_key(
+            'leaderboard_row', [self.user.id, 1, profile.total_points, profile.updated_at, self.user.username]
+        )
+
+    def test_row_cached_and_new_version_rendered_after_update(self):
+        response = self.client.get(reverse('leaderboard:leaderboard'))
+        self.assertContains(response, 'Nama Lama')
+        self.assertIn('Nama Lama', self.fragments.get(self._row_key(self.profile)))
+
+        self.profile.full_name = 'Nama Baru'
+        self.profile.save()
+        self.profile.refresh_from_db()
+
+        response = self.client.get(reverse('leaderboard:leaderboard'))
+        self.assertContains(response, 'Nama Baru')
+        self.assertNotContains(response, 'Nama Lama')
+        self.assertIsNotNone(self.fragments.get(self._row_key(self.profile)))